@@ -20,9 +20,15 @@ def generate_juba_codebase():
         "scripts": {
             "dev": "concurrently \"npm run server\" \"npm run client\"",
             "server": "nodemon server/index.js",
+            "start": "node server/index.js",
+            "start:cluster": "node server/cluster.js",
             "client": "cd client && npm start",
             "build": "cd client && npm run build",
-            "install-all": "npm install && cd client && npm install"
+            "install-all": "npm install && cd client && npm install",
+            "test": "node --test server/tests/",
+            "bench:messages": "node bench/messageWriter.js",
+            "bench:cluster": "node bench/cluster.js",
+            "bench:load": "node bench/loadtest.js"
         },
         "dependencies": {
             "express": "^4.18.2",
@@ -33,12 +39,17 @@ def generate_juba_codebase():
             "google-auth-library": "^8.8.0",
             "@supabase/supabase-js": "^2.33.1",
             "socket.io": "^4.7.2",
+            "@socket.io/sticky": "^1.0.4",
+            "@socket.io/cluster-adapter": "^0.2.2",
             "rate-limiter-flexible": "^3.0.8",
             "express-validator": "^7.0.1",
-            "nodemailer": "^6.9.7"
+            "nodemailer": "^6.9.7",
+            "prom-client": "^15.1.0",
+            "compression": "^1.7.4"
         },
         "devDependencies": {
             "nodemon": "^3.0.1",
+            "socket.io-client": "^4.7.2",
             "concurrently": "^8.2.0"
         }
     }
@@ -70,22 +81,681 @@ ADMIN_EMAIL_DOMAIN=@jubaadmin.com
 
 # JWT Secret
 JWT_SECRET=your_jwt_secret_here_change_in_production
+
+# Chat message batching (flush window in ms, max messages per insert)
+MESSAGE_BATCH_WINDOW_MS=5
+MESSAGE_BATCH_MAX=50
+
+# Socket flood control (rates are messages/second, sizes are bytes)
+SOCKET_MESSAGE_RATE=5
+SOCKET_MESSAGE_BURST=10
+ROOM_MESSAGE_RATE=20
+ROOM_MESSAGE_BURST=40
+SOCKET_MAX_MESSAGE_BYTES=4096
+SOCKET_MAX_QUEUED_BYTES=262144
+# drop: skip deliveries to slow sockets, disconnect: drop the slow socket
+SOCKET_OVERFLOW_POLICY=drop
+
+# Cluster mode (npm run start:cluster): workers default to one per CPU;
+# SIGHUP to the primary does a rolling restart, SIGTERM drains and stops
+CLUSTER_WORKERS=
+SHUTDOWN_TIMEOUT_MS=10000
+
+# Job read cache (GET /api/jobs and /api/jobs/:id)
+JOBS_CACHE_MAX_ENTRIES=500
+JOBS_CACHE_TTL_MS=30000
+# Job title search results (GET /api/jobs/search), keyed by (status, search, cursor)
+JOB_SEARCH_CACHE_MAX_ENTRIES=1000
+JOB_SEARCH_CACHE_TTL_MS=10000
+
+# Requests slower than this are logged with a per-span breakdown
+SLOW_REQUEST_MS=1000
+
+# /metrics (Prometheus). Set a token to require "Authorization: Bearer <token>".
+# In cluster mode scrape the primary on METRICS_PORT for totals across workers.
+METRICS_TOKEN=
+METRICS_PORT=9464
+
+# Local load testing without Supabase: DB_BACKEND=memory uses an in-memory
+# store (per process, so per worker in cluster mode). Each query waits
+# LATENCY + an exponential tail with mean JITTER, at most POOL_SIZE at once.
+# MEMORY_DB_SEED may point at a JSON file of { "table": [rows] }.
+DB_BACKEND=supabase
+MEMORY_DB_LATENCY_MS=2
+MEMORY_DB_JITTER_MS=1
+MEMORY_DB_POOL_SIZE=10
+MEMORY_DB_SEED=
+
+# Requests per client IP: general per minute, auth per 5 minutes
+RATE_LIMIT_POINTS=100
+AUTH_RATE_LIMIT_POINTS=10
+# json: build emails without sending them (local runs, npm run bench:load)
+EMAIL_TRANSPORT=
+
+# SERVE_CLIENT=true serves the production client (npm run build) from
+# CLIENT_BUILD_DIR, default client/build, using its precompressed .br/.gz files.
+# JSON responses larger than COMPRESSION_THRESHOLD_BYTES are gzipped.
+SERVE_CLIENT=false
+CLIENT_BUILD_DIR=
+COMPRESSION_THRESHOLD_BYTES=1024
 """
     create_file(".env", env_content)
     
     # Create server directory and files
     # Database initialization
     db_init = """const { createClient } = require('@supabase/supabase-js');
+const { instrumentSupabase } = require('../services/requestTiming');
 require('dotenv').config();
 
 const supabaseUrl = process.env.SUPABASE_URL;
 const supabaseKey = process.env.SUPABASE_ANON_KEY;
-const supabase = createClient(supabaseUrl, supabaseKey);
 
-module.exports = supabase;
+// DB_BACKEND=memory swaps in the in-memory stand-in (see memory.js) so the
+// server can be run and load tested without a Supabase project
+const supabase = process.env.DB_BACKEND === 'memory'
+    ? require('./memory').createMemoryClient()
+    : createClient(supabaseUrl, supabaseKey);
+
+// Queries are timed per request (Server-Timing, slow request log)
+module.exports = instrumentSupabase(supabase);
 """
     create_file("server/db/index.js", db_init)
     
+    # In-memory Supabase stand-in (DB_BACKEND=memory) for local load testing
+    memory_db = """const crypto = require('crypto');
+const fs = require('fs');
+
+// In-memory stand-in for the Supabase client, selected with
+// DB_BACKEND=memory. It implements the subset of the PostgREST query
+// builder the routes use (select with embedded and !inner relations, eq/neq/gt/gte/
+// lt/lte/in/ilike/or filters, order, range, limit, single, insert, update,
+// delete, exact counts) so the server can be load tested without a
+// Supabase project. Triggers are not emulated: platform_stats stays at its
+// seeded values and unread_message_counts is only what the seed provides.
+
+// Foreign keys used to resolve embedded selects and ON DELETE CASCADE,
+// as { table: { referencedTable: column } }
+const FOREIGN_KEYS = {
+    freelancer_profiles: { users: 'user_id' },
+    jobs: { users: 'client_id' },
+    job_applications: { jobs: 'job_id', users: 'freelancer_id' },
+    transactions: { jobs: 'job_id' },
+    messages: { jobs: 'job_id' },
+    reviews: { jobs: 'job_id' },
+    unread_message_counts: { jobs: 'job_id', users: 'user_id' }
+};
+
+const PRIMARY_KEYS = {
+    unread_message_counts: ['user_id', 'job_id'],
+    platform_stats_daily: ['day']
+};
+
+const UNIQUE_COLUMNS = {
+    users: ['email', 'google_id']
+};
+
+// Column defaults from the migration; timestamps are filled per insert
+const now = () => new Date().toISOString();
+const COLUMN_DEFAULTS = {
+    users: { role: 'client', admin_status: false, profile_completion_status: false, verification_status: false, created_at: now, updated_at: now },
+    freelancer_profiles: { approval_status: 'pending', created_at: now, updated_at: now },
+    jobs: { status: 'posted', created_at: now },
+    job_applications: { status: 'pending', application_timestamp: now },
+    transactions: { payment_status: 'pending' },
+    messages: { timestamp: now, read_status: false },
+    reports: { admin_approval: false, status: 'open', timestamp: now },
+    reviews: { timestamp: now },
+    unread_message_counts: { unread_count: 0, updated_at: now }
+};
+
+const TIMESTAMP_LIKE = /^[0-9]{4}-[0-9]{2}-[0-9]{2}T/;
+
+const compareValues = (a, b) => {
+    if (typeof a === 'number' || typeof b === 'number') {
+        return Number(a) - Number(b);
+    }
+    const left = String(a);
+    const right = String(b);
+    if (TIMESTAMP_LIKE.test(left) && TIMESTAMP_LIKE.test(right)) {
+        return Date.parse(left) - Date.parse(right);
+    }
+    return left < right ? -1 : left > right ? 1 : 0;
+};
+
+// SQL LIKE with % and _ wildcards (no regex, so patterns need no escaping)
+const likeMatch = (value, pattern) => {
+    let v = 0;
+    let p = 0;
+    let starP = -1;
+    let starV = 0;
+    while (v < value.length) {
+        if (p < pattern.length && (pattern[p] === '_' || pattern[p] === value[v])) {
+            v += 1;
+            p += 1;
+        } else if (p < pattern.length && pattern[p] === '%') {
+            starP = p;
+            starV = v;
+            p += 1;
+        } else if (starP !== -1) {
+            p = starP + 1;
+            starV += 1;
+            v = starV;
+        } else {
+            return false;
+        }
+    }
+    while (p < pattern.length && pattern[p] === '%') {
+        p += 1;
+    }
+    return p === pattern.length;
+};
+
+// Comparison operators; SQL semantics, so NULL never matches
+const OPERATORS = {
+    eq: (a, b) => a != null && compareValues(a, b) === 0,
+    neq: (a, b) => a != null && compareValues(a, b) !== 0,
+    gt: (a, b) => a != null && compareValues(a, b) > 0,
+    gte: (a, b) => a != null && compareValues(a, b) >= 0,
+    lt: (a, b) => a != null && compareValues(a, b) < 0,
+    lte: (a, b) => a != null && compareValues(a, b) <= 0,
+    like: (a, b) => a != null && likeMatch(String(a), String(b)),
+    ilike: (a, b) => a != null && likeMatch(String(a).toLowerCase(), String(b).toLowerCase()),
+    in: (a, b) => a != null && b.some(item => compareValues(a, item) === 0),
+    is: (a, b) => (b === null ? a == null : a === b)
+};
+
+// Split on commas that are not inside parentheses or double quotes
+const splitTopLevel = (text) => {
+    const parts = [];
+    let depth = 0;
+    let quoted = false;
+    let current = '';
+    for (const char of text) {
+        if (char === '"') {
+            quoted = !quoted;
+        } else if (!quoted && char === '(') {
+            depth += 1;
+        } else if (!quoted && char === ')') {
+            depth -= 1;
+        } else if (!quoted && depth === 0 && char === ',') {
+            parts.push(current.trim());
+            current = '';
+            continue;
+        }
+        current += char;
+    }
+    if (current.trim()) {
+        parts.push(current.trim());
+    }
+    return parts;
+};
+
+const unquote = (value) => {
+    return value.length >= 2 && value.startsWith('"') && value.endsWith('"') ? value.slice(1, -1) : value;
+};
+
+const parseFilterValue = (operator, raw) => {
+    if (operator === 'in') {
+        return splitTopLevel(raw.slice(1, -1)).map(unquote);
+    }
+    if (operator === 'is') {
+        return { null: null, true: true, false: false }[raw];
+    }
+    return unquote(raw);
+};
+
+// Parse a PostgREST logic tree such as
+// created_at.lt."2024-01-01",and(created_at.eq."2024-01-01",id.lt.abc)
+const parseLogic = (expression, combinator = 'or') => {
+    const predicates = splitTopLevel(expression).map((part) => {
+        const group = part.match(/^(and|or)[(](.*)[)]$/);
+        if (group) {
+            return parseLogic(group[2], group[1]);
+        }
+
+        const [column, operator, ...rest] = part.split('.');
+        if (!OPERATORS[operator]) {
+            throw new Error(`Unsupported operator "${operator}" in or() filter`);
+        }
+        const value = parseFilterValue(operator, rest.join('.'));
+        return row => OPERATORS[operator](row[column], value);
+    });
+
+    return combinator === 'and'
+        ? row => predicates.every(predicate => predicate(row))
+        : row => predicates.some(predicate => predicate(row));
+};
+
+// Parse a select list: *, columns, alias:column, and embedded relations
+// like client:users(*), job:jobs!inner(*) or applications:job_applications(count)
+const parseSelect = (columns) => {
+    return splitTopLevel(columns || '*').map((item) => {
+        const embed = item.match(/^(?:([a-z_]+):)?([a-z_]+)(?:!([a-z_]+))?[(](.*)[)]$/);
+        if (embed) {
+            const [, alias, table, hint, inner] = embed;
+            return {
+                type: 'embed',
+                alias: alias || table,
+                table,
+                inner: hint === 'inner',
+                count: inner.trim() === 'count',
+                children: parseSelect(inner)
+            };
+        }
+        if (item === '*') {
+            return { type: 'star' };
+        }
+        const [alias, name] = item.includes(':') ? item.split(':') : [item, item];
+        return { type: 'column', alias, name };
+    });
+};
+
+class ConnectionPool {
+    constructor(size) {
+        this.size = size;
+        this.active = 0;
+        this.waiting = [];
+    }
+
+    async acquire() {
+        if (this.active < this.size) {
+            this.active += 1;
+            return;
+        }
+        await new Promise(resolve => this.waiting.push(resolve));
+    }
+
+    // Hand the slot straight to the next waiter, if any
+    release() {
+        const next = this.waiting.shift();
+        if (next) {
+            next();
+        } else {
+            this.active -= 1;
+        }
+    }
+}
+
+class MemoryStore {
+    // latencyMs is the fixed part of every query; jitterMs is the mean of an
+    // exponential tail added on top, which gives the long p99 of a real
+    // network round trip. poolSize caps concurrent queries like a
+    // connection pool, so saturation shows up as queueing.
+    constructor({ latencyMs = 0, jitterMs = 0, poolSize = 10, seed = {} } = {}) {
+        this.latencyMs = latencyMs;
+        this.jitterMs = jitterMs;
+        this.pool = new ConnectionPool(poolSize);
+        this.tables = new Map();
+
+        this.insertRows('platform_stats', [{ id: true }]);
+        for (const [table, rows] of Object.entries(seed)) {
+            this.insertRows(table, rows);
+        }
+    }
+
+    // Rows are kept in a Map keyed by primary key, so eq() on the key is a
+    // lookup rather than a scan
+    table(name) {
+        if (!this.tables.has(name)) {
+            this.tables.set(name, new Map());
+        }
+        return this.tables.get(name);
+    }
+
+    keyOf(table, row) {
+        return (PRIMARY_KEYS[table] || ['id']).map(column => String(row[column])).join('|');
+    }
+
+    insertRows(table, rows) {
+        const stored = this.table(table);
+        const defaults = COLUMN_DEFAULTS[table] || {};
+        const uniqueColumns = UNIQUE_COLUMNS[table] || [];
+        const taken = uniqueColumns.map(column => new Set([...stored.values()].map(row => row[column])));
+        const keys = new Set();
+        const inserted = [];
+
+        for (const input of rows) {
+            const row = { ...input };
+            if (!PRIMARY_KEYS[table] && row.id == null) {
+                row.id = crypto.randomUUID();
+            }
+            for (const [column, value] of Object.entries(defaults)) {
+                if (row[column] === undefined) {
+                    row[column] = typeof value === 'function' ? value() : value;
+                }
+            }
+
+            // The whole statement fails on any duplicate, as in Postgres;
+            // NULLs never conflict under a unique constraint
+            const key = this.keyOf(table, row);
+            if (stored.has(key) || keys.has(key) || uniqueColumns.some((column, i) => row[column] != null && taken[i].has(row[column]))) {
+                const error = new Error(`duplicate key value violates unique constraint on "${table}"`);
+                error.code = '23505';
+                throw error;
+            }
+            keys.add(key);
+            uniqueColumns.forEach((column, i) => taken[i].add(row[column]));
+            inserted.push(row);
+        }
+
+        for (const row of inserted) {
+            stored.set(this.keyOf(table, row), row);
+        }
+        return inserted;
+    }
+
+    deleteRows(table, rows) {
+        const stored = this.table(table);
+        for (const row of rows) {
+            stored.delete(this.keyOf(table, row));
+        }
+
+        // ON DELETE CASCADE for every table that references this one
+        for (const [child, references] of Object.entries(FOREIGN_KEYS)) {
+            const column = references[table];
+            if (!column || !this.tables.has(child)) {
+                continue;
+            }
+            const ids = new Set(rows.map(row => String(row.id)));
+            const orphans = [...this.table(child).values()].filter(row => ids.has(String(row[column])));
+            if (orphans.length > 0) {
+                this.deleteRows(child, orphans);
+            }
+        }
+    }
+
+    latency() {
+        const tail = this.jitterMs > 0 ? -Math.log(1 - Math.random()) * this.jitterMs : 0;
+        return this.latencyMs + tail;
+    }
+
+    // Shape a row for a parsed select list, resolving embedded relations
+    // through FOREIGN_KEYS in either direction. embedFilters holds filters
+    // on embedded columns (eq('applications.status', ...)), which narrow
+    // the embedded rows rather than the parent rows, as in PostgREST.
+    project(table, row, selection, embedFilters = {}) {
+        const result = {};
+        for (const node of selection) {
+            if (node.type === 'star') {
+                Object.assign(result, row);
+            } else if (node.type === 'column') {
+                result[node.alias] = row[node.name];
+            } else {
+                result[node.alias] = this.embed(table, row, node, embedFilters[node.alias] || []);
+            }
+        }
+        return result;
+    }
+
+    embed(table, row, node, filters) {
+        const matches = candidate => filters.every(predicate => predicate(candidate));
+
+        const parentColumn = FOREIGN_KEYS[table]?.[node.table];
+        if (parentColumn) {
+            const target = this.table(node.table).get(String(row[parentColumn]));
+            return target && matches(target) ? this.project(node.table, target, node.children) : null;
+        }
+
+        const childColumn = FOREIGN_KEYS[node.table]?.[table];
+        if (!childColumn) {
+            throw new Error(`Could not find a relationship between "${table}" and "${node.table}"`);
+        }
+        const children = [...this.table(node.table).values()]
+            .filter(child => String(child[childColumn]) === String(row.id) && matches(child));
+        return node.count
+            ? [{ count: children.length }]
+            : children.map(child => this.project(node.table, child, node.children));
+    }
+}
+
+class MemoryQuery {
+    constructor(store, table) {
+        this.store = store;
+        this.tableName = table;
+        this.action = 'select';
+        this.columns = '*';
+        this.returning = false;
+        this.payload = null;
+        this.filters = [];
+        this.embedFilters = {};
+        this.keyLookup = null;
+        this.orders = [];
+        this.offset = 0;
+        this.maxRows = null;
+        this.countMode = null;
+        this.headOnly = false;
+        this.singleMode = null;
+    }
+
+    select(columns = '*', { count, head } = {}) {
+        if (this.action === 'select') {
+            this.countMode = count || null;
+            this.headOnly = Boolean(head);
+        } else {
+            this.returning = true;
+        }
+        this.columns = columns;
+        return this;
+    }
+
+    insert(rows) {
+        this.action = 'insert';
+        this.payload = Array.isArray(rows) ? rows : [rows];
+        return this;
+    }
+
+    update(values, { count } = {}) {
+        this.action = 'update';
+        this.payload = values;
+        this.countMode = count || null;
+        return this;
+    }
+
+    delete({ count } = {}) {
+        this.action = 'delete';
+        this.countMode = count || null;
+        return this;
+    }
+
+    filter(column, operator, value) {
+        if (column.includes('.')) {
+            const [alias, embeddedColumn] = column.split('.');
+            this.embedFilters[alias] = this.embedFilters[alias] || [];
+            this.embedFilters[alias].push(row => OPERATORS[operator](row[embeddedColumn], value));
+            return this;
+        }
+
+        const keyColumns = PRIMARY_KEYS[this.tableName] || ['id'];
+        if (operator === 'eq' && keyColumns.length === 1 && keyColumns[0] === column && this.keyLookup === null) {
+            this.keyLookup = String(value);
+        }
+        this.filters.push(row => OPERATORS[operator](row[column], value));
+        return this;
+    }
+
+    eq(column, value) { return this.filter(column, 'eq', value); }
+    neq(column, value) { return this.filter(column, 'neq', value); }
+    gt(column, value) { return this.filter(column, 'gt', value); }
+    gte(column, value) { return this.filter(column, 'gte', value); }
+    lt(column, value) { return this.filter(column, 'lt', value); }
+    lte(column, value) { return this.filter(column, 'lte', value); }
+    like(column, pattern) { return this.filter(column, 'like', pattern); }
+    ilike(column, pattern) { return this.filter(column, 'ilike', pattern); }
+    in(column, values) { return this.filter(column, 'in', values); }
+    is(column, value) { return this.filter(column, 'is', value); }
+
+    or(expression) {
+        this.filters.push(parseLogic(expression));
+        return this;
+    }
+
+    order(column, { ascending = true, nullsFirst = !ascending } = {}) {
+        this.orders.push({ column, ascending, nullsFirst });
+        return this;
+    }
+
+    range(from, to) {
+        this.offset = from;
+        this.maxRows = to - from + 1;
+        return this;
+    }
+
+    limit(count) {
+        this.maxRows = count;
+        return this;
+    }
+
+    single() {
+        this.singleMode = 'single';
+        return this;
+    }
+
+    maybeSingle() {
+        this.singleMode = 'maybe';
+        return this;
+    }
+
+    then(onFulfilled, onRejected) {
+        return this.execute().then(onFulfilled, onRejected);
+    }
+
+    async execute() {
+        await this.store.pool.acquire();
+        try {
+            await new Promise(resolve => setTimeout(resolve, this.store.latency()));
+            return this.run();
+        } catch (error) {
+            return { data: null, error: { message: error.message, code: error.code || 'MEMDB', details: null, hint: null }, count: null, status: 400 };
+        } finally {
+            this.store.pool.release();
+        }
+    }
+
+    matchingRows() {
+        const table = this.store.table(this.tableName);
+        let rows;
+        if (this.keyLookup !== null) {
+            const row = table.get(this.keyLookup);
+            rows = row ? [row] : [];
+        } else {
+            rows = [...table.values()];
+        }
+        return rows.filter(row => this.filters.every(predicate => predicate(row)));
+    }
+
+    // !inner embeds drop parent rows whose embedded relation comes back empty
+    withInnerEmbeds(rows) {
+        const innerEmbeds = parseSelect(this.columns).filter(node => node.type === 'embed' && node.inner);
+        if (innerEmbeds.length === 0) {
+            return rows;
+        }
+        return rows.filter(row => innerEmbeds.every((node) => {
+            const embedded = this.store.embed(this.tableName, row, node, this.embedFilters[node.alias] || []);
+            return Array.isArray(embedded) ? embedded.length > 0 : embedded !== null;
+        }));
+    }
+
+    sortRows(rows) {
+        if (this.orders.length === 0) {
+            return rows;
+        }
+        return rows.sort((a, b) => {
+            for (const { column, ascending, nullsFirst } of this.orders) {
+                const left = a[column];
+                const right = b[column];
+                if (left == null || right == null) {
+                    if (left == null && right == null) {
+                        continue;
+                    }
+                    return (left == null) === nullsFirst ? -1 : 1;
+                }
+                const difference = compareValues(left, right);
+                if (difference !== 0) {
+                    return ascending ? difference : -difference;
+                }
+            }
+            return 0;
+        });
+    }
+
+    run() {
+        let rows;
+        let status = 200;
+        const count = () => (this.countMode ? rows.length : null);
+
+        if (this.action === 'insert') {
+            rows = this.store.insertRows(this.tableName, this.payload);
+            status = 201;
+        } else if (this.action === 'update') {
+            rows = this.matchingRows();
+            for (const row of rows) {
+                Object.assign(row, this.payload);
+            }
+        } else if (this.action === 'delete') {
+            rows = this.matchingRows();
+            this.store.deleteRows(this.tableName, rows);
+        } else {
+            rows = this.sortRows(this.withInnerEmbeds(this.matchingRows()));
+        }
+
+        const total = count();
+        if (this.action === 'select') {
+            const end = this.maxRows === null ? undefined : this.offset + this.maxRows;
+            rows = rows.slice(this.offset, end);
+        } else if (!this.returning) {
+            return { data: null, error: null, count: total, status: 204 };
+        }
+        if (this.headOnly) {
+            return { data: null, error: null, count: total, status };
+        }
+
+        // Copies, so callers cannot mutate stored rows
+        const selection = parseSelect(this.columns);
+        const data = rows.map(row => structuredClone(this.store.project(this.tableName, row, selection, this.embedFilters)));
+
+        if (this.singleMode) {
+            if (data.length > 1 || (data.length === 0 && this.singleMode === 'single')) {
+                return {
+                    data: null,
+                    error: { message: 'JSON object requested, multiple (or no) rows returned', code: 'PGRST116', details: `The result contains ${data.length} rows`, hint: null },
+                    count: total,
+                    status: 406
+                };
+            }
+            return { data: data[0] || null, error: null, count: total, status };
+        }
+        return { data, error: null, count: total, status };
+    }
+}
+
+const readNumber = (name, fallback) => {
+    const value = parseFloat(process.env[name]);
+    return Number.isFinite(value) ? value : fallback;
+};
+
+// seed: { table: [rows] }, or a JSON file path in MEMORY_DB_SEED
+const createMemoryClient = (options = {}) => {
+    const seedPath = process.env.MEMORY_DB_SEED;
+    const store = new MemoryStore({
+        latencyMs: options.latencyMs ?? readNumber('MEMORY_DB_LATENCY_MS', 2),
+        jitterMs: options.jitterMs ?? readNumber('MEMORY_DB_JITTER_MS', 1),
+        poolSize: options.poolSize ?? readNumber('MEMORY_DB_POOL_SIZE', 10),
+        seed: options.seed ?? (seedPath ? JSON.parse(fs.readFileSync(seedPath, 'utf8')) : {})
+    });
+
+    return {
+        store,
+        from: table => new MemoryQuery(store, table),
+        rpc: async name => ({ data: null, error: { message: `rpc("${name}") is not available in the memory backend`, code: 'MEMDB' }, count: null, status: 400 })
+    };
+};
+
+module.exports = {
+    createMemoryClient
+};
+"""
+    create_file("server/db/memory.js", memory_db)
+    
     # Database migrations
     migrations = """-- Database Schema for Juba Platform
 
@@ -191,15 +861,511 @@ CREATE TABLE IF NOT EXISTS reviews (
     timestamp TIMESTAMP WITH TIME ZONE DEFAULT NOW()
 );
 
+-- Unread message counters per (receiver, job), maintained by triggers on
+-- messages so unread badges are a primary-key lookup instead of a count
+CREATE TABLE IF NOT EXISTS unread_message_counts (
+    user_id UUID REFERENCES users(id) ON DELETE CASCADE,
+    job_id UUID REFERENCES jobs(id) ON DELETE CASCADE,
+    unread_count INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    PRIMARY KEY (user_id, job_id)
+);
+
+-- Statement-level triggers see a whole batch insert or ranged mark-read
+-- update at once and apply one aggregated delta per counter row. The
+-- function runs as its owner: callers have no write policy on the counters.
+CREATE OR REPLACE FUNCTION apply_unread_message_deltas()
+RETURNS TRIGGER
+SECURITY DEFINER SET search_path = public
+AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO unread_message_counts (user_id, job_id, unread_count)
+        SELECT receiver_id, job_id, COUNT(*)
+        FROM new_messages
+        WHERE NOT read_status AND receiver_id IS NOT NULL
+        GROUP BY receiver_id, job_id
+        ON CONFLICT (user_id, job_id) DO UPDATE
+        SET unread_count = unread_message_counts.unread_count + EXCLUDED.unread_count,
+            updated_at = NOW();
+    ELSIF TG_OP = 'UPDATE' THEN
+        INSERT INTO unread_message_counts (user_id, job_id, unread_count)
+        SELECT receiver_id, job_id, SUM(delta)
+        FROM (
+            SELECT receiver_id, job_id, -1 AS delta FROM old_messages WHERE NOT read_status
+            UNION ALL
+            SELECT receiver_id, job_id, 1 AS delta FROM new_messages WHERE NOT read_status
+        ) changes
+        WHERE receiver_id IS NOT NULL
+        GROUP BY receiver_id, job_id
+        HAVING SUM(delta) <> 0
+        ON CONFLICT (user_id, job_id) DO UPDATE
+        SET unread_count = GREATEST(unread_message_counts.unread_count + EXCLUDED.unread_count, 0),
+            updated_at = NOW();
+    ELSIF TG_OP = 'DELETE' THEN
+        UPDATE unread_message_counts counts
+        SET unread_count = GREATEST(counts.unread_count - removed.total, 0),
+            updated_at = NOW()
+        FROM (
+            SELECT receiver_id, job_id, COUNT(*) AS total
+            FROM old_messages
+            WHERE NOT read_status AND receiver_id IS NOT NULL
+            GROUP BY receiver_id, job_id
+        ) removed
+        WHERE counts.user_id = removed.receiver_id AND counts.job_id = removed.job_id;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS messages_unread_insert ON messages;
+CREATE TRIGGER messages_unread_insert
+    AFTER INSERT ON messages
+    REFERENCING NEW TABLE AS new_messages
+    FOR EACH STATEMENT EXECUTE FUNCTION apply_unread_message_deltas();
+
+DROP TRIGGER IF EXISTS messages_unread_update ON messages;
+CREATE TRIGGER messages_unread_update
+    AFTER UPDATE ON messages
+    REFERENCING OLD TABLE AS old_messages NEW TABLE AS new_messages
+    FOR EACH STATEMENT EXECUTE FUNCTION apply_unread_message_deltas();
+
+DROP TRIGGER IF EXISTS messages_unread_delete ON messages;
+CREATE TRIGGER messages_unread_delete
+    AFTER DELETE ON messages
+    REFERENCING OLD TABLE AS old_messages
+    FOR EACH STATEMENT EXECUTE FUNCTION apply_unread_message_deltas();
+
+-- Backfill counters for messages that predate the triggers
+INSERT INTO unread_message_counts (user_id, job_id, unread_count)
+SELECT receiver_id, job_id, COUNT(*)
+FROM messages
+WHERE NOT read_status AND receiver_id IS NOT NULL
+GROUP BY receiver_id, job_id
+ON CONFLICT (user_id, job_id) DO NOTHING;
+
+-- Platform statistics, maintained incrementally by triggers so the admin
+-- dashboard reads one row instead of counting whole tables
+CREATE TABLE IF NOT EXISTS platform_stats (
+    id BOOLEAN PRIMARY KEY DEFAULT TRUE CHECK (id),
+    total_users BIGINT NOT NULL DEFAULT 0,
+    freelancers BIGINT NOT NULL DEFAULT 0,
+    admins BIGINT NOT NULL DEFAULT 0,
+    pending_freelancer_profiles BIGINT NOT NULL DEFAULT 0,
+    total_jobs BIGINT NOT NULL DEFAULT 0,
+    posted_jobs BIGINT NOT NULL DEFAULT 0,
+    in_progress_jobs BIGINT NOT NULL DEFAULT 0,
+    completed_jobs BIGINT NOT NULL DEFAULT 0,
+    cancelled_jobs BIGINT NOT NULL DEFAULT 0,
+    total_applications BIGINT NOT NULL DEFAULT 0,
+    pending_applications BIGINT NOT NULL DEFAULT 0,
+    accepted_applications BIGINT NOT NULL DEFAULT 0,
+    total_transactions BIGINT NOT NULL DEFAULT 0,
+    completed_payments BIGINT NOT NULL DEFAULT 0,
+    payment_volume DECIMAL(14, 2) NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+-- Daily activity rollups. New rows count on their own date (created_at,
+-- application_timestamp, payment_date), so bulk loads keep their history;
+-- job completions count on the day the status changed.
+CREATE TABLE IF NOT EXISTS platform_stats_daily (
+    day DATE PRIMARY KEY,
+    new_users BIGINT NOT NULL DEFAULT 0,
+    new_jobs BIGINT NOT NULL DEFAULT 0,
+    new_applications BIGINT NOT NULL DEFAULT 0,
+    completed_jobs BIGINT NOT NULL DEFAULT 0,
+    completed_payments BIGINT NOT NULL DEFAULT 0,
+    payment_volume DECIMAL(14, 2) NOT NULL DEFAULT 0
+);
+
+-- Add to one day's rollup; a no-op when every delta is zero
+DROP FUNCTION IF EXISTS bump_daily_stats(BIGINT, BIGINT, BIGINT, BIGINT, BIGINT, DECIMAL);
+CREATE OR REPLACE FUNCTION bump_daily_stats(
+    p_day DATE,
+    p_new_users BIGINT DEFAULT 0,
+    p_new_jobs BIGINT DEFAULT 0,
+    p_new_applications BIGINT DEFAULT 0,
+    p_completed_jobs BIGINT DEFAULT 0,
+    p_completed_payments BIGINT DEFAULT 0,
+    p_payment_volume DECIMAL DEFAULT 0
+)
+RETURNS VOID
+SECURITY DEFINER SET search_path = public
+AS $$
+BEGIN
+    IF p_new_users = 0 AND p_new_jobs = 0 AND p_new_applications = 0
+        AND p_completed_jobs = 0 AND p_completed_payments = 0 AND p_payment_volume = 0 THEN
+        RETURN;
+    END IF;
+
+    INSERT INTO platform_stats_daily AS daily
+        (day, new_users, new_jobs, new_applications, completed_jobs, completed_payments, payment_volume)
+    VALUES
+        (p_day, p_new_users, p_new_jobs, p_new_applications, p_completed_jobs, p_completed_payments, p_payment_volume)
+    ON CONFLICT (day) DO UPDATE SET
+        new_users = daily.new_users + EXCLUDED.new_users,
+        new_jobs = daily.new_jobs + EXCLUDED.new_jobs,
+        new_applications = daily.new_applications + EXCLUDED.new_applications,
+        completed_jobs = daily.completed_jobs + EXCLUDED.completed_jobs,
+        completed_payments = daily.completed_payments + EXCLUDED.completed_payments,
+        payment_volume = daily.payment_volume + EXCLUDED.payment_volume;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Each tracker is a statement-level trigger: it counts the affected rows in
+-- the transition tables (new_rows / old_rows) and applies one delta. The
+-- trackers run as their owner, since callers have no write policy on the
+-- stats tables.
+CREATE OR REPLACE FUNCTION track_user_stats()
+RETURNS TRIGGER
+SECURITY DEFINER SET search_path = public
+AS $$
+DECLARE
+    added RECORD;
+    removed RECORD;
+BEGIN
+    SELECT 0::BIGINT AS total, 0::BIGINT AS freelancers, 0::BIGINT AS admins INTO added;
+    removed := added;
+
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        SELECT COUNT(*) AS total,
+               COUNT(*) FILTER (WHERE role = 'freelancer') AS freelancers,
+               COUNT(*) FILTER (WHERE admin_status) AS admins
+        INTO added FROM new_rows;
+    END IF;
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        SELECT COUNT(*) AS total,
+               COUNT(*) FILTER (WHERE role = 'freelancer') AS freelancers,
+               COUNT(*) FILTER (WHERE admin_status) AS admins
+        INTO removed FROM old_rows;
+    END IF;
+
+    -- Updates that touch no counted column leave the shared row alone
+    IF added IS DISTINCT FROM removed THEN
+        UPDATE platform_stats SET
+            total_users = total_users + added.total - removed.total,
+            freelancers = freelancers + added.freelancers - removed.freelancers,
+            admins = admins + added.admins - removed.admins,
+            updated_at = NOW()
+        WHERE id;
+    END IF;
+
+    IF TG_OP = 'INSERT' THEN
+        PERFORM bump_daily_stats(p_day => per_day.day, p_new_users => per_day.total)
+        FROM (
+            SELECT COALESCE(created_at, NOW())::DATE AS day, COUNT(*) AS total
+            FROM new_rows
+            GROUP BY 1
+        ) per_day;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION track_freelancer_profile_stats()
+RETURNS TRIGGER
+SECURITY DEFINER SET search_path = public
+AS $$
+DECLARE
+    added BIGINT := 0;
+    removed BIGINT := 0;
+BEGIN
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        SELECT COUNT(*) INTO added FROM new_rows WHERE approval_status = 'pending';
+    END IF;
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        SELECT COUNT(*) INTO removed FROM old_rows WHERE approval_status = 'pending';
+    END IF;
+
+    IF added <> removed THEN
+        UPDATE platform_stats SET
+            pending_freelancer_profiles = pending_freelancer_profiles + added - removed,
+            updated_at = NOW()
+        WHERE id;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION track_job_stats()
+RETURNS TRIGGER
+SECURITY DEFINER SET search_path = public
+AS $$
+DECLARE
+    added RECORD;
+    removed RECORD;
+BEGIN
+    SELECT 0::BIGINT AS total, 0::BIGINT AS posted, 0::BIGINT AS in_progress,
+           0::BIGINT AS completed, 0::BIGINT AS cancelled INTO added;
+    removed := added;
+
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        SELECT COUNT(*) AS total,
+               COUNT(*) FILTER (WHERE status = 'posted') AS posted,
+               COUNT(*) FILTER (WHERE status = 'in_progress') AS in_progress,
+               COUNT(*) FILTER (WHERE status = 'completed') AS completed,
+               COUNT(*) FILTER (WHERE status = 'cancelled') AS cancelled
+        INTO added FROM new_rows;
+    END IF;
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        SELECT COUNT(*) AS total,
+               COUNT(*) FILTER (WHERE status = 'posted') AS posted,
+               COUNT(*) FILTER (WHERE status = 'in_progress') AS in_progress,
+               COUNT(*) FILTER (WHERE status = 'completed') AS completed,
+               COUNT(*) FILTER (WHERE status = 'cancelled') AS cancelled
+        INTO removed FROM old_rows;
+    END IF;
+
+    -- Updates that touch no counted column leave the shared row alone
+    IF added IS DISTINCT FROM removed THEN
+        UPDATE platform_stats SET
+            total_jobs = total_jobs + added.total - removed.total,
+            posted_jobs = posted_jobs + added.posted - removed.posted,
+            in_progress_jobs = in_progress_jobs + added.in_progress - removed.in_progress,
+            completed_jobs = completed_jobs + added.completed - removed.completed,
+            cancelled_jobs = cancelled_jobs + added.cancelled - removed.cancelled,
+            updated_at = NOW()
+        WHERE id;
+    END IF;
+
+    IF TG_OP = 'INSERT' THEN
+        PERFORM bump_daily_stats(p_day => per_day.day, p_new_jobs => per_day.total)
+        FROM (
+            SELECT COALESCE(created_at, NOW())::DATE AS day, COUNT(*) AS total
+            FROM new_rows
+            GROUP BY 1
+        ) per_day;
+    ELSIF TG_OP = 'UPDATE' THEN
+        -- jobs has no completion timestamp: completions count on the day of the change
+        PERFORM bump_daily_stats(
+            p_day => CURRENT_DATE,
+            p_completed_jobs => GREATEST(added.completed - removed.completed, 0)
+        );
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION track_application_stats()
+RETURNS TRIGGER
+SECURITY DEFINER SET search_path = public
+AS $$
+DECLARE
+    added RECORD;
+    removed RECORD;
+BEGIN
+    SELECT 0::BIGINT AS total, 0::BIGINT AS pending, 0::BIGINT AS accepted INTO added;
+    removed := added;
+
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        SELECT COUNT(*) AS total,
+               COUNT(*) FILTER (WHERE status = 'pending') AS pending,
+               COUNT(*) FILTER (WHERE status = 'accepted') AS accepted
+        INTO added FROM new_rows;
+    END IF;
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        SELECT COUNT(*) AS total,
+               COUNT(*) FILTER (WHERE status = 'pending') AS pending,
+               COUNT(*) FILTER (WHERE status = 'accepted') AS accepted
+        INTO removed FROM old_rows;
+    END IF;
+
+    -- Updates that touch no counted column leave the shared row alone
+    IF added IS DISTINCT FROM removed THEN
+        UPDATE platform_stats SET
+            total_applications = total_applications + added.total - removed.total,
+            pending_applications = pending_applications + added.pending - removed.pending,
+            accepted_applications = accepted_applications + added.accepted - removed.accepted,
+            updated_at = NOW()
+        WHERE id;
+    END IF;
+
+    IF TG_OP = 'INSERT' THEN
+        PERFORM bump_daily_stats(p_day => per_day.day, p_new_applications => per_day.total)
+        FROM (
+            SELECT COALESCE(application_timestamp, NOW())::DATE AS day, COUNT(*) AS total
+            FROM new_rows
+            GROUP BY 1
+        ) per_day;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION track_transaction_stats()
+RETURNS TRIGGER
+SECURITY DEFINER SET search_path = public
+AS $$
+DECLARE
+    added RECORD;
+    removed RECORD;
+BEGIN
+    SELECT 0::BIGINT AS total, 0::BIGINT AS completed, 0::DECIMAL AS volume INTO added;
+    removed := added;
+
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        SELECT COUNT(*) AS total,
+               COUNT(*) FILTER (WHERE payment_status = 'completed') AS completed,
+               COALESCE(SUM(amount) FILTER (WHERE payment_status = 'completed'), 0) AS volume
+        INTO added FROM new_rows;
+    END IF;
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        SELECT COUNT(*) AS total,
+               COUNT(*) FILTER (WHERE payment_status = 'completed') AS completed,
+               COALESCE(SUM(amount) FILTER (WHERE payment_status = 'completed'), 0) AS volume
+        INTO removed FROM old_rows;
+    END IF;
+
+    -- Updates that touch no counted column leave the shared row alone
+    IF added IS DISTINCT FROM removed THEN
+        UPDATE platform_stats SET
+            total_transactions = total_transactions + added.total - removed.total,
+            completed_payments = completed_payments + added.completed - removed.completed,
+            payment_volume = payment_volume + added.volume - removed.volume,
+            updated_at = NOW()
+        WHERE id;
+    END IF;
+
+    -- Completed payments count on their payment_date, net of rows that
+    -- were already completed before an update
+    IF TG_OP = 'INSERT' THEN
+        PERFORM bump_daily_stats(
+            p_day => per_day.day,
+            p_completed_payments => per_day.completed,
+            p_payment_volume => per_day.volume
+        )
+        FROM (
+            SELECT COALESCE(payment_date, NOW())::DATE AS day, COUNT(*) AS completed, SUM(amount) AS volume
+            FROM new_rows
+            WHERE payment_status = 'completed'
+            GROUP BY 1
+        ) per_day;
+    ELSIF TG_OP = 'UPDATE' THEN
+        PERFORM bump_daily_stats(
+            p_day => per_day.day,
+            p_completed_payments => GREATEST(per_day.completed, 0),
+            p_payment_volume => GREATEST(per_day.volume, 0)
+        )
+        FROM (
+            SELECT day, SUM(completed) AS completed, SUM(volume) AS volume
+            FROM (
+                SELECT COALESCE(payment_date, NOW())::DATE AS day, 1 AS completed, amount AS volume
+                FROM new_rows WHERE payment_status = 'completed'
+                UNION ALL
+                SELECT COALESCE(payment_date, NOW())::DATE, -1, -amount
+                FROM old_rows WHERE payment_status = 'completed'
+            ) changes
+            GROUP BY day
+        ) per_day;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- One trigger per table and operation (transition tables differ per operation)
+DO $$
+DECLARE
+    tracked RECORD;
+BEGIN
+    FOR tracked IN
+        SELECT * FROM (VALUES
+            ('users', 'track_user_stats'),
+            ('freelancer_profiles', 'track_freelancer_profile_stats'),
+            ('jobs', 'track_job_stats'),
+            ('job_applications', 'track_application_stats'),
+            ('transactions', 'track_transaction_stats')
+        ) AS t(table_name, function_name)
+    LOOP
+        EXECUTE format('DROP TRIGGER IF EXISTS %I ON %I', tracked.table_name || '_stats_insert', tracked.table_name);
+        EXECUTE format('DROP TRIGGER IF EXISTS %I ON %I', tracked.table_name || '_stats_update', tracked.table_name);
+        EXECUTE format('DROP TRIGGER IF EXISTS %I ON %I', tracked.table_name || '_stats_delete', tracked.table_name);
+        EXECUTE format(
+            'CREATE TRIGGER %I AFTER INSERT ON %I REFERENCING NEW TABLE AS new_rows FOR EACH STATEMENT EXECUTE FUNCTION %I()',
+            tracked.table_name || '_stats_insert', tracked.table_name, tracked.function_name
+        );
+        EXECUTE format(
+            'CREATE TRIGGER %I AFTER UPDATE ON %I REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows FOR EACH STATEMENT EXECUTE FUNCTION %I()',
+            tracked.table_name || '_stats_update', tracked.table_name, tracked.function_name
+        );
+        EXECUTE format(
+            'CREATE TRIGGER %I AFTER DELETE ON %I REFERENCING OLD TABLE AS old_rows FOR EACH STATEMENT EXECUTE FUNCTION %I()',
+            tracked.table_name || '_stats_delete', tracked.table_name, tracked.function_name
+        );
+    END LOOP;
+END;
+$$;
+
+-- Seed the counters from the current data (safe to re-run)
+INSERT INTO platform_stats (id) VALUES (TRUE) ON CONFLICT (id) DO NOTHING;
+UPDATE platform_stats SET
+    total_users = (SELECT COUNT(*) FROM users),
+    freelancers = (SELECT COUNT(*) FROM users WHERE role = 'freelancer'),
+    admins = (SELECT COUNT(*) FROM users WHERE admin_status),
+    pending_freelancer_profiles = (SELECT COUNT(*) FROM freelancer_profiles WHERE approval_status = 'pending'),
+    total_jobs = (SELECT COUNT(*) FROM jobs),
+    posted_jobs = (SELECT COUNT(*) FROM jobs WHERE status = 'posted'),
+    in_progress_jobs = (SELECT COUNT(*) FROM jobs WHERE status = 'in_progress'),
+    completed_jobs = (SELECT COUNT(*) FROM jobs WHERE status = 'completed'),
+    cancelled_jobs = (SELECT COUNT(*) FROM jobs WHERE status = 'cancelled'),
+    total_applications = (SELECT COUNT(*) FROM job_applications),
+    pending_applications = (SELECT COUNT(*) FROM job_applications WHERE status = 'pending'),
+    accepted_applications = (SELECT COUNT(*) FROM job_applications WHERE status = 'accepted'),
+    total_transactions = (SELECT COUNT(*) FROM transactions),
+    completed_payments = (SELECT COUNT(*) FROM transactions WHERE payment_status = 'completed'),
+    payment_volume = (SELECT COALESCE(SUM(amount), 0) FROM transactions WHERE payment_status = 'completed'),
+    updated_at = NOW()
+WHERE id;
+
+-- Rebuild the daily history from the rows' own dates (safe to re-run).
+-- Job completions have no timestamp and only accrue through the trigger.
+INSERT INTO platform_stats_daily AS daily
+    (day, new_users, new_jobs, new_applications, completed_payments, payment_volume)
+SELECT day, SUM(new_users), SUM(new_jobs), SUM(new_applications), SUM(completed_payments), SUM(payment_volume)
+FROM (
+    SELECT created_at::DATE AS day, 1 AS new_users, 0 AS new_jobs, 0 AS new_applications,
+           0 AS completed_payments, 0::DECIMAL AS payment_volume
+    FROM users
+    UNION ALL
+    SELECT created_at::DATE, 0, 1, 0, 0, 0 FROM jobs
+    UNION ALL
+    SELECT application_timestamp::DATE, 0, 0, 1, 0, 0 FROM job_applications
+    UNION ALL
+    SELECT payment_date::DATE, 0, 0, 0, 1, amount FROM transactions WHERE payment_status = 'completed'
+) activity
+WHERE day IS NOT NULL
+GROUP BY day
+ON CONFLICT (day) DO UPDATE SET
+    new_users = EXCLUDED.new_users,
+    new_jobs = EXCLUDED.new_jobs,
+    new_applications = EXCLUDED.new_applications,
+    completed_payments = EXCLUDED.completed_payments,
+    payment_volume = EXCLUDED.payment_volume;
+
 -- Indexes for better performance
 CREATE INDEX IF NOT EXISTS idx_users_email ON users(email);
 CREATE INDEX IF NOT EXISTS idx_users_role ON users(role);
-CREATE INDEX IF NOT EXISTS idx_jobs_client_id ON jobs(client_id);
+CREATE INDEX IF NOT EXISTS idx_users_created_at ON users(created_at DESC, id DESC);
+-- Per-owner lists page by (created_at, id); these replace the single-column
+-- indexes, which databases created from older schemas still carry
+DROP INDEX IF EXISTS idx_jobs_client_id;
+CREATE INDEX IF NOT EXISTS idx_jobs_client_id_created_at ON jobs(client_id, created_at DESC, id DESC);
 CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs(status);
+CREATE INDEX IF NOT EXISTS idx_jobs_created_at ON jobs(created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_jobs_status_created_at ON jobs(status, created_at DESC, id DESC);
+-- Title search is ILIKE '%term%'; trigrams let it use an index instead of a scan
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+CREATE INDEX IF NOT EXISTS idx_jobs_title_trgm ON jobs USING gin (title gin_trgm_ops);
 CREATE INDEX IF NOT EXISTS idx_job_applications_job_id ON job_applications(job_id);
-CREATE INDEX IF NOT EXISTS idx_job_applications_freelancer_id ON job_applications(freelancer_id);
-CREATE INDEX IF NOT EXISTS idx_messages_job_id ON messages(job_id);
+DROP INDEX IF EXISTS idx_job_applications_freelancer_id;
+CREATE INDEX IF NOT EXISTS idx_job_applications_freelancer_id_timestamp ON job_applications(freelancer_id, application_timestamp DESC, id DESC);
+-- Chat history is read per job, newest first: one range scan per page.
+-- The composite index also serves plain job_id lookups.
+DROP INDEX IF EXISTS idx_messages_job_id;
+CREATE INDEX IF NOT EXISTS idx_messages_job_id_timestamp ON messages(job_id, timestamp DESC, id DESC);
 CREATE INDEX IF NOT EXISTS idx_messages_timestamp ON messages(timestamp);
+-- Mark-read-up-to is one ranged update over a receiver's unread messages
+CREATE INDEX IF NOT EXISTS idx_messages_unread ON messages(receiver_id, job_id, timestamp) WHERE NOT read_status;
 CREATE INDEX IF NOT EXISTS idx_reports_reported_user_id ON reports(reported_user_id);
 
 -- Enable Row Level Security (RLS) on all tables
@@ -211,6 +1377,23 @@ ALTER TABLE transactions ENABLE ROW LEVEL SECURITY;
 ALTER TABLE messages ENABLE ROW LEVEL SECURITY;
 ALTER TABLE reports ENABLE ROW LEVEL SECURITY;
 ALTER TABLE reviews ENABLE ROW LEVEL SECURITY;
+
+-- Unread counters are written only by the definer trigger; users read their own
+ALTER TABLE unread_message_counts ENABLE ROW LEVEL SECURITY;
+DROP POLICY IF EXISTS "Users can view their unread counts" ON unread_message_counts;
+CREATE POLICY "Users can view their unread counts" ON unread_message_counts
+    FOR SELECT USING (user_id = auth.uid());
+
+-- Stats rows are platform-wide aggregates, written only by the definer
+-- triggers; the API serves them to admins only
+ALTER TABLE platform_stats ENABLE ROW LEVEL SECURITY;
+ALTER TABLE platform_stats_daily ENABLE ROW LEVEL SECURITY;
+DROP POLICY IF EXISTS "Stats are readable" ON platform_stats;
+CREATE POLICY "Stats are readable" ON platform_stats
+    FOR SELECT USING (true);
+DROP POLICY IF EXISTS "Daily stats are readable" ON platform_stats_daily;
+CREATE POLICY "Daily stats are readable" ON platform_stats_daily
+    FOR SELECT USING (true);
 """
     create_file("server/db/migrations/01_initial_schema.sql", migrations)
     
@@ -264,6 +1447,25 @@ const authenticateToken = (req, res, next) => {
     });
 };
 
+// Socket.io handshake middleware: verifies the same JWT once per connection
+// and caches the identity on socket.data for every later event
+const authenticateSocket = (socket, next) => {
+    const authHeader = socket.handshake.headers['authorization'];
+    const token = socket.handshake.auth?.token || (authHeader && authHeader.split(' ')[1]);
+
+    if (!token) {
+        return next(new Error('Access token required'));
+    }
+
+    jwt.verify(token, process.env.JWT_SECRET, (err, user) => {
+        if (err) {
+            return next(new Error('Invalid or expired token'));
+        }
+        socket.data.user = user;
+        next();
+    });
+};
+
 // Admin authorization middleware
 const requireAdmin = (req, res, next) => {
     if (!req.user.admin_status) {
@@ -276,6 +1478,7 @@ module.exports = {
     verifyGoogleToken,
     generateToken,
     authenticateToken,
+    authenticateSocket,
     requireAdmin
 };
 """
@@ -345,28 +1548,40 @@ module.exports = {
     create_file("server/middleware/validation.js", validation_middleware)
     
     # Rate limiting middleware
-    rate_limit = """const { RateLimiterMemory } = require('rate-limiter-flexible');
+    rate_limit = """const cluster = require('cluster');
+const { RateLimiterMemory, RateLimiterCluster } = require('rate-limiter-flexible');
+const { timeSpan } = require('../services/requestTiming');
+const { rateLimitRejections } = require('../services/metrics');
+
+// Cluster workers share counters through the primary (see cluster.js), so
+// limits stay per client rather than per client per worker
+const createRateLimiter = (options) => {
+    return cluster.isWorker ? new RateLimiterCluster(options) : new RateLimiterMemory(options);
+};
 
 // General rate limiter
-const generalRateLimiter = new RateLimiterMemory({
-    points: 100, // 100 requests
+const generalRateLimiter = createRateLimiter({
+    keyPrefix: 'general',
+    points: parseInt(process.env.RATE_LIMIT_POINTS) || 100, // 100 requests
     duration: 60, // per 60 seconds
 });
 
 // Auth rate limiter (stricter for auth endpoints)
-const authRateLimiter = new RateLimiterMemory({
-    points: 10, // 10 requests
+const authRateLimiter = createRateLimiter({
+    keyPrefix: 'auth',
+    points: parseInt(process.env.AUTH_RATE_LIMIT_POINTS) || 10, // 10 requests
     duration: 300, // per 5 minutes
 });
 
 // Apply rate limiting middleware
 const rateLimitMiddleware = (limiter) => {
     return (req, res, next) => {
-        limiter.consume(req.ip)
+        timeSpan('ratelimit', () => limiter.consume(req.ip))
             .then(() => {
                 next();
             })
             .catch(() => {
+                rateLimitRejections.inc({ limiter: limiter.keyPrefix });
                 res.status(429).json({ error: 'Too many requests' });
             });
     };
@@ -380,75 +1595,294 @@ module.exports = {
 """
     create_file("server/middleware/rateLimit.js", rate_limit)
     
-    # Email service
-    email_service = """const nodemailer = require('nodemailer');
-
-// Create transporter
-const transporter = nodemailer.createTransporter({
-    service: 'gmail',
-    auth: {
-        user: process.env.EMAIL_USER,
-        pass: process.env.EMAIL_PASSWORD,
-    },
-});
-
-// Send email function
-const sendEmail = async (to, subject, text, html = null) => {
-    try {
-        const mailOptions = {
-            from: process.env.EMAIL_USER,
-            to,
-            subject,
-            text,
-            html: html || text,
-        };
-
-        const result = await transporter.sendMail(mailOptions);
-        return { success: true, messageId: result.messageId };
-    } catch (error) {
-        console.error('Email sending error:', error);
-        return { success: false, error: error.message };
+    # Response caching middleware (ETag / 304 on top of ResponseCache)
+    cache_middleware = """// Serve a cached entry, answering conditional requests with 304
+const sendCachedEntry = (cache, req, res, entry) => {
+    res.set('ETag', entry.etag);
+    res.set('Cache-Control', 'no-cache');
+
+    if (req.headers['if-none-match'] === entry.etag) {
+        cache.counters.notModified += 1;
+        return res.status(304).end();
     }
+
+    res.type('application/json').send(entry.body);
 };
 
-// Email templates
-const emailTemplates = {
-    welcome: (name) => ({
-        subject: 'Welcome to Juba!',
-        text: `Hi ${name}, welcome to Juba! We're excited to have you on board.`,
-        html: `<h1>Welcome to Juba!</h1><p>Hi ${name}, we're excited to have you on board.</p>`
-    }),
-    jobPosted: (name, jobTitle) => ({
-        subject: 'Your job has been posted',
-        text: `Hi ${name}, your job "${jobTitle}" has been successfully posted.`,
-        html: `<h1>Job Posted</h1><p>Hi ${name}, your job "${jobTitle}" has been successfully posted.</p>`
-    }),
-    freelancerApplied: (clientName, freelancerName, jobTitle) => ({
-        subject: 'New application for your job',
-        text: `Hi ${clientName}, ${freelancerName} has applied for your job "${jobTitle}".`,
-        html: `<h1>New Application</h1><p>Hi ${clientName}, ${freelancerName} has applied for your job "${jobTitle}".</p>`
-    }),
-    adminNotification: (title, message) => ({
-        subject: `Admin Notification: ${title}`,
-        text: message,
-        html: `<h1>${title}</h1><p>${message}</p>`
-    })
+// Cache successful JSON responses of a read route.
+// key(req) must normalize the request; tags(req) lists invalidation tags.
+const cacheResponse = (cache, { key, tags = () => [] }) => {
+    return (req, res, next) => {
+        const cacheKey = key(req);
+        const cached = cache.get(cacheKey);
+        if (cached) {
+            return sendCachedEntry(cache, req, res, cached);
+        }
+
+        const version = cache.version;
+        const json = res.json.bind(res);
+        res.json = (body) => {
+            if (res.statusCode !== 200) {
+                return json(body);
+            }
+            const entry = cache.set(cacheKey, body, tags(req), version);
+            return sendCachedEntry(cache, req, res, entry);
+        };
+        next();
+    };
 };
 
 module.exports = {
-    sendEmail,
-    emailTemplates
+    cacheResponse
 };
 """
-    create_file("server/services/emailService.js", email_service)
+    create_file("server/middleware/cache.js", cache_middleware)
     
-    # Payment service (placeholder for South African payment integration)
-    payment_service = """// Placeholder for South African payment gateway integration
-// This would be implemented with a specific payment provider's API
+    # Static client build serving
+    static_client_middleware = """const fs = require('fs');
+const path = require('path');
+
+const MIME_TYPES = {
+    '.html': 'text/html; charset=utf-8',
+    '.js': 'application/javascript; charset=utf-8',
+    '.css': 'text/css; charset=utf-8',
+    '.json': 'application/json; charset=utf-8',
+    '.map': 'application/json; charset=utf-8',
+    '.txt': 'text/plain; charset=utf-8',
+    '.svg': 'image/svg+xml',
+    '.png': 'image/png',
+    '.jpg': 'image/jpeg',
+    '.jpeg': 'image/jpeg',
+    '.gif': 'image/gif',
+    '.webp': 'image/webp',
+    '.ico': 'image/x-icon',
+    '.woff': 'font/woff',
+    '.woff2': 'font/woff2',
+    '.ttf': 'font/ttf'
+};
 
-const processPayment = async (paymentData) => {
-    try {
-        // In a real implementation, this would call the payment gateway API
+// Content-hashed build output never changes under its name: chunks carry
+// 8 hex digits (main.3f2a9c1e.js), static/media files 20 or more
+const HASHED_FILE = /[.][0-9a-f]{8,}[.]/;
+const IMMUTABLE = 'public, max-age=31536000, immutable';
+// index.html, service-worker.js, manifest.json and friends must be revalidated
+const REVALIDATE = 'no-cache';
+
+// Paths the API and socket.io own; they never fall back to index.html
+const SERVER_PATHS = ['/api/', '/socket.io/', '/metrics', '/health'];
+
+const ENCODINGS = [
+    { name: 'br', extension: '.br' },
+    { name: 'gzip', extension: '.gz' }
+];
+
+const walk = (dir) => fs.readdirSync(dir, { withFileTypes: true }).flatMap((entry) => {
+    const fullPath = path.join(dir, entry.name);
+    return entry.isDirectory() ? walk(fullPath) : [fullPath];
+});
+
+const variantOf = (file) => {
+    const stat = fs.statSync(file);
+    return { file, size: stat.size, etag: `"${stat.size.toString(16)}-${stat.mtimeMs.toString(16)}"` };
+};
+
+// The build is immutable while the server runs, so every file, its
+// precompressed siblings and its headers are resolved once at startup
+const indexBuild = (root) => {
+    const files = new Map();
+    const all = walk(root);
+    const present = new Set(all);
+
+    for (const file of all) {
+        if (ENCODINGS.some(({ extension }) => file.endsWith(extension))) {
+            continue;
+        }
+        const urlPath = '/' + path.relative(root, file).split(path.sep).join('/');
+        const variants = { identity: variantOf(file) };
+        for (const { name, extension } of ENCODINGS) {
+            if (present.has(file + extension)) {
+                variants[name] = variantOf(file + extension);
+            }
+        }
+        files.set(urlPath, {
+            type: MIME_TYPES[path.extname(file).toLowerCase()] || 'application/octet-stream',
+            cacheControl: HASHED_FILE.test(path.basename(file)) ? IMMUTABLE : REVALIDATE,
+            variants
+        });
+    }
+    return files;
+};
+
+// Encodings the client accepts (q=0 excluded)
+const acceptedEncodings = (header) => {
+    const accepted = new Set();
+    for (const part of String(header || '').split(',')) {
+        const [name, ...params] = part.trim().toLowerCase().split(';');
+        const q = params.map(param => param.trim()).find(param => param.startsWith('q='));
+        if (name && !(q && parseFloat(q.slice(2)) === 0)) {
+            accepted.add(name);
+        }
+    }
+    return accepted;
+};
+
+const pickVariant = (asset, acceptEncoding) => {
+    const accepted = acceptedEncodings(acceptEncoding);
+    for (const { name } of ENCODINGS) {
+        if (asset.variants[name] && (accepted.has(name) || accepted.has('*'))) {
+            return { encoding: name, variant: asset.variants[name] };
+        }
+    }
+    return { encoding: null, variant: asset.variants.identity };
+};
+
+const sendAsset = (req, res, asset) => {
+    const { encoding, variant } = pickVariant(asset, req.headers['accept-encoding']);
+
+    res.setHeader('Content-Type', asset.type);
+    res.setHeader('Cache-Control', asset.cacheControl);
+    res.setHeader('ETag', variant.etag);
+    if (Object.keys(asset.variants).length > 1) {
+        res.setHeader('Vary', 'Accept-Encoding');
+    }
+    if (encoding) {
+        res.setHeader('Content-Encoding', encoding);
+    }
+
+    if (req.headers['if-none-match'] === variant.etag) {
+        res.statusCode = 304;
+        return res.end();
+    }
+
+    res.setHeader('Content-Length', variant.size);
+    if (req.method === 'HEAD') {
+        return res.end();
+    }
+    fs.createReadStream(variant.file)
+        .on('error', (error) => {
+            console.error('Static file error:', error);
+            res.destroy(error);
+        })
+        .pipe(res);
+};
+
+// Serve a production client build (react-scripts output). Hashed assets are
+// cached for a year; .br/.gz files written by the build are preferred over
+// the originals; unknown non-API GETs that accept HTML get index.html so
+// client-side routes work on reload.
+const serveClientBuild = ({ root }) => {
+    const files = indexBuild(root);
+    const indexHtml = files.get('/index.html');
+
+    return (req, res, next) => {
+        if (req.method !== 'GET' && req.method !== 'HEAD') {
+            return next();
+        }
+
+        let pathname;
+        try {
+            pathname = decodeURIComponent(new URL(req.url, 'http://localhost').pathname);
+        } catch (error) {
+            return next();
+        }
+
+        // Lookups go through the startup index, so ../ can never escape root
+        const asset = files.get(pathname === '/' ? '/index.html' : pathname);
+        if (asset) {
+            return sendAsset(req, res, asset);
+        }
+
+        const wantsHtml = String(req.headers.accept || '').includes('text/html');
+        if (indexHtml && wantsHtml && !SERVER_PATHS.some(prefix => pathname.startsWith(prefix))) {
+            return sendAsset(req, res, indexHtml);
+        }
+        next();
+    };
+};
+
+module.exports = {
+    serveClientBuild
+};
+"""
+    create_file("server/middleware/staticClient.js", static_client_middleware)
+    
+    # Email service
+    email_service = """const nodemailer = require('nodemailer');
+const { instrument } = require('./requestTiming');
+const { trackExternalCall } = require('./metrics');
+
+// Create transporter. EMAIL_TRANSPORT=json builds each message without
+// sending it (local runs and load tests).
+const transporter = process.env.EMAIL_TRANSPORT === 'json'
+    ? nodemailer.createTransport({ jsonTransport: true })
+    : nodemailer.createTransport({
+        service: 'gmail',
+        auth: {
+            user: process.env.EMAIL_USER,
+            pass: process.env.EMAIL_PASSWORD,
+        },
+    });
+
+// Send email function
+const sendEmail = async (to, subject, text, html = null) => {
+    try {
+        const mailOptions = {
+            from: process.env.EMAIL_USER,
+            to,
+            subject,
+            text,
+            html: html || text,
+        };
+
+        const result = await transporter.sendMail(mailOptions);
+        return { success: true, messageId: result.messageId };
+    } catch (error) {
+        console.error('Email sending error:', error);
+        return { success: false, error: error.message };
+    }
+};
+
+// Email templates
+const emailTemplates = {
+    welcome: (name) => ({
+        subject: 'Welcome to Juba!',
+        text: `Hi ${name}, welcome to Juba! We're excited to have you on board.`,
+        html: `<h1>Welcome to Juba!</h1><p>Hi ${name}, we're excited to have you on board.</p>`
+    }),
+    jobPosted: (name, jobTitle) => ({
+        subject: 'Your job has been posted',
+        text: `Hi ${name}, your job "${jobTitle}" has been successfully posted.`,
+        html: `<h1>Job Posted</h1><p>Hi ${name}, your job "${jobTitle}" has been successfully posted.</p>`
+    }),
+    freelancerApplied: (clientName, freelancerName, jobTitle) => ({
+        subject: 'New application for your job',
+        text: `Hi ${clientName}, ${freelancerName} has applied for your job "${jobTitle}".`,
+        html: `<h1>New Application</h1><p>Hi ${clientName}, ${freelancerName} has applied for your job "${jobTitle}".</p>`
+    }),
+    adminNotification: (title, message) => ({
+        subject: `Admin Notification: ${title}`,
+        text: message,
+        html: `<h1>${title}</h1><p>${message}</p>`
+    })
+};
+
+module.exports = {
+    sendEmail: instrument('email', trackExternalCall('email', sendEmail)),
+    emailTemplates
+};
+"""
+    create_file("server/services/emailService.js", email_service)
+    
+    # Payment service (placeholder for South African payment integration)
+    payment_service = """const { instrument } = require('./requestTiming');
+const { trackExternalCall } = require('./metrics');
+
+// Placeholder for South African payment gateway integration
+// This would be implemented with a specific payment provider's API
+
+const processPayment = async (paymentData) => {
+    try {
+        // In a real implementation, this would call the payment gateway API
         const { amount, clientId, freelancerId, jobId } = paymentData;
         
         // Simulate payment processing
@@ -496,906 +1930,3793 @@ const refundPayment = async (paymentReference) => {
 };
 
 module.exports = {
-    processPayment,
-    refundPayment
+    processPayment: instrument('payment', trackExternalCall('payment', processPayment)),
+    refundPayment: instrument('payment', trackExternalCall('payment', refundPayment))
 };
 """
     create_file("server/services/paymentService.js", payment_service)
     
-    # User routes
-    user_routes = """const express = require('express');
-const router = express.Router();
-const supabase = require('../db/index');
-const { authenticateToken, requireAdmin } = require('../middleware/auth');
-const { validateUserRegistration, handleValidationErrors } = require('../middleware/validation');
-const { rateLimitMiddleware, authRateLimiter } = require('../middleware/rateLimit');
-const { sendEmail, emailTemplates } = require('../services/emailService');
+    # Cluster bus (keeps per-worker caches coherent in cluster mode)
+    cluster_bus = """const cluster = require('cluster');
 
-// Google Sign-In authentication
-router.post('/auth/google', rateLimitMiddleware(authRateLimiter), async (req, res) => {
-    try {
-        const { token, phone, address } = req.body;
-        
-        // Verify Google token
-        const verification = await verifyGoogleToken(token);
-        if (!verification.success) {
-            return res.status(401).json({ error: 'Invalid authentication token' });
+const MESSAGE_TYPE = 'juba:bus';
+const handlers = new Map();
+
+// Tell the other cluster workers about a local change. The primary relays
+// the message (see cluster.js); outside cluster mode this is a no-op.
+const publish = (topic, payload) => {
+    if (cluster.isWorker && process.connected) {
+        process.send({ type: MESSAGE_TYPE, topic, payload });
+    }
+};
+
+// Handle changes published by other workers
+const subscribe = (topic, handler) => {
+    if (!handlers.has(topic)) {
+        handlers.set(topic, []);
+    }
+    handlers.get(topic).push(handler);
+};
+
+if (cluster.isWorker) {
+    process.on('message', (message) => {
+        if (message?.type !== MESSAGE_TYPE) {
+            return;
         }
-        
-        const { email, name, sub: googleId } = verification.payload;
-        
-        // Check if user already exists
-        const { data: existingUser, error: userError } = await supabase
-            .from('users')
-            .select('*')
-            .eq('google_id', googleId)
-            .single();
-            
-        let user;
-        
-        if (userError || !existingUser) {
-            // Create new user
-            const { data: newUser, error: insertError } = await supabase
-                .from('users')
-                .insert([
-                    {
-                        google_id: googleId,
-                        email,
-                        phone,
-                        address,
-                        role: 'client',
-                        // Check if admin based on email domain
-                        admin_status: email.endsWith(process.env.ADMIN_EMAIL_DOMAIN)
-                    }
-                ])
-                .select()
-                .single();
-                
-            if (insertError) {
-                return res.status(400).json({ error: 'User creation failed' });
-            }
-            
-            user = newUser;
-            
-            // Send welcome email
-            await sendEmail(email, 
-                emailTemplates.welcome(name).subject,
-                emailTemplates.welcome(name).text,
-                emailTemplates.welcome(name).html
-            );
-        } else {
-            user = existingUser;
-            
-            // Update user information if provided
-            if (phone || address) {
-                const updates = {};
-                if (phone) updates.phone = phone;
-                if (address) updates.address = address;
-                
-                const { data: updatedUser, error: updateError } = await supabase
-                    .from('users')
-                    .update(updates)
-                    .eq('id', user.id)
-                    .select()
-                    .single();
-                    
-                if (!updateError) {
-                    user = updatedUser;
-                }
-            }
+        for (const handler of handlers.get(message.topic) || []) {
+            handler(message.payload);
         }
-        
-        // Generate JWT token
-        const jwtToken = generateToken(user);
-        
-        res.json({
-            token: jwtToken,
-            user: {
-                id: user.id,
-                email: user.email,
-                role: user.role,
-                admin_status: user.admin_status,
-                profile_completion_status: user.profile_completion_status
+    });
+}
+
+module.exports = {
+    MESSAGE_TYPE,
+    publish,
+    subscribe
+};
+"""
+    create_file("server/services/clusterBus.js", cluster_bus)
+    
+    # Message writer (group-commits chat messages into multi-row inserts)
+    message_writer = """const crypto = require('crypto');
+
+const UUID_PATTERN = /^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$/i;
+
+// Use the client-generated id when it is a valid UUID so the optimistic
+// broadcast and the stored row share the same id
+const resolveMessageId = (clientId) => {
+    if (typeof clientId === 'string' && UUID_PATTERN.test(clientId)) {
+        return clientId.toLowerCase();
+    }
+    return crypto.randomUUID();
+};
+
+class MessageWriter {
+    constructor(options = {}) {
+        // Defaults to the shared Supabase client, loaded on first write so the
+        // writer can also run against a stand-in database (see bench/)
+        this.db = options.db || null;
+        this.windowMs = options.windowMs ?? (parseInt(process.env.MESSAGE_BATCH_WINDOW_MS) || 5);
+        this.maxBatch = options.maxBatch ?? (parseInt(process.env.MESSAGE_BATCH_MAX) || 50);
+        this.pending = [];
+        this.timer = null;
+        this.stats = { written: 0, failed: 0, batches: 0 };
+    }
+
+    // Queue a message row; resolves with the stored row once its batch commits
+    write(row) {
+        return new Promise((resolve, reject) => {
+            this.pending.push({ row, resolve, reject });
+
+            if (this.pending.length >= this.maxBatch) {
+                this.flush();
+            } else if (!this.timer) {
+                this.timer = setTimeout(() => this.flush(), this.windowMs);
             }
         });
-        
-    } catch (error) {
-        console.error('Authentication error:', error);
-        res.status(500).json({ error: 'Internal server error' });
     }
-});
 
-// Get current user profile
-router.get('/profile', authenticateToken, async (req, res) => {
-    try {
-        const { data: user, error } = await supabase
-            .from('users')
-            .select('*')
-            .eq('id', req.user.id)
-            .single();
-            
-        if (error) {
-            return res.status(404).json({ error: 'User not found' });
+    // Commit everything queued so far as one multi-row insert
+    async flush() {
+        if (this.timer) {
+            clearTimeout(this.timer);
+            this.timer = null;
         }
-        
-        // Remove sensitive information
-        const { google_id, ...userData } = user;
-        
-        res.json(userData);
-    } catch (error) {
-        console.error('Profile fetch error:', error);
-        res.status(500).json({ error: 'Internal server error' });
-    }
-});
 
-// Update user profile
-router.put('/profile', authenticateToken, validateUserRegistration, async (req, res) => {
-    try {
-        const { phone, address } = req.body;
-        
-        const { data: user, error } = await supabase
-            .from('users')
-            .update({ phone, address, profile_completion_status: true })
-            .eq('id', req.user.id)
-            .select()
-            .single();
-            
-        if (error) {
-            return res.status(400).json({ error: 'Profile update failed' });
+        const batch = this.pending.splice(0, this.pending.length);
+        if (batch.length === 0) {
+            return;
         }
-        
-        res.json({ message: 'Profile updated successfully', user });
-    } catch (error) {
-        console.error('Profile update error:', error);
-        res.status(500).json({ error: 'Internal server error' });
-    }
-});
 
-// Apply to become a freelancer
-router.post('/become-freelancer', authenticateToken, async (req, res) => {
-    try {
-        const {
-            bio,
-            experience_years,
-            service_areas,
-            hourly_rate_min,
-            hourly_rate_max,
-            certifications,
-            coverage_areas
-        } = req.body;
-        
-        // Check if user already has a freelancer profile
-        const { data: existingProfile, error: profileError } = await supabase
-            .from('freelancer_profiles')
-            .select('*')
-            .eq('user_id', req.user.id)
-            .single();
-            
-        if (existingProfile) {
-            return res.status(400).json({ error: 'Freelancer profile already exists' });
+        this.stats.batches += 1;
+        const { data, error } = await this.insertRows(batch.map(entry => entry.row));
+
+        if (!error) {
+            const saved = new Map((data || []).map(message => [message.id, message]));
+            for (const entry of batch) {
+                entry.resolve(saved.get(entry.row.id) || entry.row);
+            }
+            this.stats.written += batch.length;
+            return;
         }
-        
-        // Create freelancer profile
-        const { data: profile, error: insertError } = await supabase
-            .from('freelancer_profiles')
-            .insert([
-                {
-                    user_id: req.user.id,
-                    bio,
-                    experience_years,
-                    service_areas,
-                    hourly_rate_min,
-                    hourly_rate_max,
-                    certifications,
-                    coverage_areas,
-                    approval_status: 'pending'
-                }
-            ])
-            .select()
-            .single();
-            
-        if (insertError) {
-            return res.status(400).json({ error: 'Freelancer application failed' });
+
+        // A single bad row fails the whole statement, so retry rows one by
+        // one to reject only the messages that really cannot be stored
+        if (batch.length === 1) {
+            this.stats.failed += 1;
+            batch[0].reject(error);
+            return;
         }
-        
-        // Notify admins
-        const { data: admins } = await supabase
-            .from('users')
-            .select('email')
-            .eq('admin_status', true);
-            
-        if (admins && admins.length > 0) {
-            const adminEmails = admins.map(admin => admin.email);
-            const subject = 'New Freelancer Application';
-            const message = `User ${req.user.email} has applied to become a freelancer.`;
-            
-            for (const email of adminEmails) {
-                await sendEmail(
-                    email,
-                    emailTemplates.adminNotification(subject, message).subject,
-                    emailTemplates.adminNotification(subject, message).text,
-                    emailTemplates.adminNotification(subject, message).html
-                );
+
+        console.error('Message batch insert error, retrying individually:', error);
+        await Promise.all(batch.map(async (entry) => {
+            const { data: rows, error: rowError } = await this.insertRows([entry.row]);
+
+            if (rowError) {
+                this.stats.failed += 1;
+                entry.reject(rowError);
+            } else {
+                this.stats.written += 1;
+                entry.resolve((rows && rows[0]) || entry.row);
             }
+        }));
+    }
+
+    async insertRows(rows) {
+        try {
+            const db = this.db || require('../db/index');
+            return await db
+                .from('messages')
+                .insert(rows)
+                .select();
+        } catch (error) {
+            return { data: null, error };
         }
-        
-        res.json({ message: 'Freelancer application submitted successfully', profile });
-    } catch (error) {
-        console.error('Freelancer application error:', error);
-        res.status(500).json({ error: 'Internal server error' });
     }
-});
 
-// Admin only: Get all users
-router.get('/admin/users', authenticateToken, requireAdmin, async (req, res) => {
-    try {
-        const { data: users, error } = await supabase
-            .from('users')
-            .select('*')
-            .order('created_at', { ascending: false });
-            
-        if (error) {
-            return res.status(400).json({ error: 'Failed to fetch users' });
+    // Flush outstanding messages, e.g. before shutdown
+    async close() {
+        while (this.pending.length > 0) {
+            await this.flush();
         }
-        
-        res.json(users);
-    } catch (error) {
-        console.error('Users fetch error:', error);
-        res.status(500).json({ error: 'Internal server error' });
     }
-});
+}
 
-// Admin only: Update user
-router.put('/admin/users/:id', authenticateToken, requireAdmin, async (req, res) => {
+const messageWriter = new MessageWriter();
+
+module.exports = {
+    MessageWriter,
+    messageWriter,
+    resolveMessageId
+};
+"""
+    create_file("server/services/messageWriter.js", message_writer)
+    
+    # Keyset pagination helpers shared by list endpoints
+    pagination = """const TIMESTAMP_PATTERN = /^[0-9TZ:.+ -]+$/;
+const UUID_PATTERN = /^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$/i;
+
+// Cursors are opaque to clients: base64url of [sortField, value, id]
+const encodeCursor = (values) => {
+    return Buffer.from(JSON.stringify(values)).toString('base64url');
+};
+
+const decodeCursor = (cursor) => {
     try {
-        const { id } = req.params;
-        const updates = req.body;
-        
-        const { data: user, error } = await supabase
-            .from('users')
-            .update(updates)
-            .eq('id', id)
-            .select()
-            .single();
-            
-        if (error) {
-            return res.status(400).json({ error: 'User update failed' });
-        }
-        
-        res.json({ message: 'User updated successfully', user });
+        const values = JSON.parse(Buffer.from(String(cursor), 'base64url').toString('utf8'));
+        return Array.isArray(values) ? values : null;
     } catch (error) {
-        console.error('User update error:', error);
-        res.status(500).json({ error: 'Internal server error' });
+        return null;
     }
-});
+};
 
-// Admin only: Delete user
-router.delete('/admin/users/:id', authenticateToken, requireAdmin, async (req, res) => {
-    try {
-        const { id } = req.params;
-        
-        const { error } = await supabase
-            .from('users')
-            .delete()
-            .eq('id', id);
-            
-        if (error) {
-            return res.status(400).json({ error: 'User deletion failed' });
+const clampLimit = (limit, defaultLimit, maxLimit) => {
+    return Math.min(Math.max(parseInt(limit) || defaultLimit, 1), maxLimit);
+};
+
+// Non-unique sort values are interpolated into a PostgREST or() filter, so
+// each such field declares the pattern its values must match
+const isValidPosition = ([field, value, id], sortField, fieldName) => {
+    if (field !== fieldName || typeof value !== 'string') {
+        return false;
+    }
+    if (sortField.unique) {
+        return true;
+    }
+    return sortField.pattern.test(value) && UUID_PATTERN.test(String(id));
+};
+
+// Order, cursor-filter and limit a Supabase query for one page.
+// sortFields maps allowed sort columns to { unique } or { pattern }; the
+// first entry is the default. Non-unique columns are tie-broken on id.
+const paginateQuery = (query, { sortFields, sort, order, cursor, limit, defaultLimit = 20, maxLimit = 100 }) => {
+    const field = sortFields[sort] ? sort : Object.keys(sortFields)[0];
+    const sortField = sortFields[field];
+    const ascending = order === 'asc';
+    const pageSize = clampLimit(limit, defaultLimit, maxLimit);
+    const operator = ascending ? 'gt' : 'lt';
+
+    let paged = query.order(field, { ascending });
+    if (!sortField.unique) {
+        paged = paged.order('id', { ascending });
+    }
+    paged = paged.limit(pageSize + 1);
+
+    if (cursor) {
+        const position = decodeCursor(cursor);
+        if (!position || !isValidPosition(position, sortField, field)) {
+            return { error: 'Invalid cursor' };
         }
-        
-        res.json({ message: 'User deleted successfully' });
-    } catch (error) {
-        console.error('User deletion error:', error);
-        res.status(500).json({ error: 'Internal server error' });
+        const [, value, id] = position;
+        paged = sortField.unique
+            ? paged[operator](field, value)
+            : paged.or(`${field}.${operator}."${value}",and(${field}.eq."${value}",id.${operator}.${id})`);
     }
-});
 
-module.exports = router;
+    return { query: paged, field, pageSize };
+};
+
+// Trim the look-ahead row and build the cursor for the next page
+const buildPage = (rows, { field, pageSize }) => {
+    const hasMore = rows.length > pageSize;
+    const page = rows.slice(0, pageSize);
+    const last = page[page.length - 1];
+
+    return {
+        rows: page,
+        limit: pageSize,
+        nextCursor: hasMore ? encodeCursor([field, String(last[field]), last.id]) : null
+    };
+};
+
+module.exports = {
+    TIMESTAMP_PATTERN,
+    UUID_PATTERN,
+    paginateQuery,
+    buildPage
+};
 """
-    create_file("server/routes/users.js", user_routes)
+    create_file("server/services/pagination.js", pagination)
     
-    # Jobs routes
-    jobs_routes = """const express = require('express');
-const router = express.Router();
-const supabase = require('../db/index');
-const { authenticateToken } = require('../middleware/auth');
-const { validateJobPosting } = require('../middleware/validation');
-const { rateLimitMiddleware, generalRateLimiter } = require('../middleware/rateLimit');
-const { sendEmail, emailTemplates } = require('../services/emailService');
-const { processPayment } = require('../services/paymentService');
+    # Chat history service (cursor-paginated reads of a job's messages)
+    chat_history = """const supabase = require('../db/index');
+const { TIMESTAMP_PATTERN, paginateQuery, buildPage } = require('./pagination');
 
-// Get all jobs (with filters)
-router.get('/', rateLimitMiddleware(generalRateLimiter), async (req, res) => {
-    try {
-        const { page = 1, limit = 10, status, search } = req.query;
-        const offset = (page - 1) * limit;
-        
-        let query = supabase
-            .from('jobs')
-            .select('*, client:users(*)', { count: 'exact' })
-            .order('created_at', { ascending: false });
-            
-        if (status) {
-            query = query.eq('status', status);
-        }
-        
-        if (search) {
-            query = query.ilike('title', `%${search}%`);
-        }
-        
-        query = query.range(offset, offset + limit - 1);
-        
-        const { data: jobs, error, count } = await query;
-        
-        if (error) {
-            return res.status(400).json({ error: 'Failed to fetch jobs' });
+const DEFAULT_PAGE_SIZE = 50;
+const MAX_PAGE_SIZE = 100;
+
+const MESSAGE_SORT_FIELDS = {
+    timestamp: { pattern: TIMESTAMP_PATTERN }
+};
+
+// Fetch one page of messages for a job, newest page first. Served by the
+// (job_id, timestamp DESC, id DESC) index as a single range read.
+const fetchMessagePage = async (jobId, { cursor, limit } = {}) => {
+    const paged = paginateQuery(
+        supabase.from('messages').select('*').eq('job_id', jobId),
+        {
+            sortFields: MESSAGE_SORT_FIELDS,
+            order: 'desc',
+            cursor,
+            limit,
+            defaultLimit: DEFAULT_PAGE_SIZE,
+            maxLimit: MAX_PAGE_SIZE
         }
-        
-        res.json({
-            jobs,
-            pagination: {
-                page: parseInt(page),
-                limit: parseInt(limit),
-                total: count
-            }
-        });
-    } catch (error) {
-        console.error('Jobs fetch error:', error);
-        res.status(500).json({ error: 'Internal server error' });
+    );
+    if (paged.error) {
+        return { error: paged.error };
     }
-});
 
-// Get job by ID
-router.get('/:id', rateLimitMiddleware(generalRateLimiter), async (req, res) => {
-    try {
-        const { id } = req.params;
-        
-        const { data: job, error } = await supabase
-            .from('jobs')
-            .select('*, client:users(*), applications:job_applications(*, freelancer:users(*))')
-            .eq('id', id)
-            .single();
-            
-        if (error) {
-            return res.status(404).json({ error: 'Job not found' });
-        }
-        
-        res.json(job);
-    } catch (error) {
-        console.error('Job fetch error:', error);
-        res.status(500).json({ error: 'Internal server error' });
+    const { data, error } = await paged.query;
+    if (error) {
+        return { error: 'Failed to fetch messages' };
     }
-});
 
-// Create a new job
-router.post('/', authenticateToken, validateJobPosting, async (req, res) => {
-    try {
-        const { title, description, location, timeline } = req.body;
-        
-        // Check if user already has an active job
-        const { data: activeJobs, error: activeJobsError } = await supabase
-            .from('jobs')
-            .select('*')
-            .eq('client_id', req.user.id)
-            .in('status', ['posted', 'in_progress']);
-            
-        if (activeJobsError) {
+    const page = buildPage(data, paged);
+
+    return {
+        // Oldest first, so clients can prepend older pages as they scroll up
+        messages: page.rows.reverse(),
+        limit: page.limit,
+        nextCursor: page.nextCursor
+    };
+};
+
+module.exports = {
+    fetchMessagePage,
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE
+};
+"""
+    create_file("server/services/chatHistory.js", chat_history)
+    
+    # Job membership cache (who may read and post in a job's chat room)
+    job_membership = """const supabase = require('../db/index');
+const { publish, subscribe } = require('./clusterBus');
+
+const MEMBERSHIP_TTL_MS = 60 * 1000;
+const MAX_CACHED_JOBS = 10000;
+
+// jobId -> { members: Set of user ids, expiresAt }
+const membershipCache = new Map();
+
+// No such job (no row, or an id that is not a UUID) means no members;
+// any other error is transient and must not be cached as a lockout
+const MISSING_JOB_CODES = new Set(['PGRST116', '22P02']);
+
+// The job's client and its accepted freelancer are the only chat members
+const loadJobMembers = async (jobId) => {
+    const { data: job, error } = await supabase
+        .from('jobs')
+        .select('client_id, applications:job_applications(freelancer_id)')
+        .eq('id', jobId)
+        .eq('applications.status', 'accepted')
+        .single();
+
+    if (error && !MISSING_JOB_CODES.has(error.code)) {
+        throw new Error(`Failed to load members of job ${jobId}: ${error.message}`);
+    }
+    if (!job) {
+        return new Set();
+    }
+
+    const members = new Set([job.client_id]);
+    for (const application of job.applications || []) {
+        members.add(application.freelancer_id);
+    }
+    return members;
+};
+
+const getJobMembers = async (jobId) => {
+    const cached = membershipCache.get(jobId);
+    if (cached && cached.expiresAt > Date.now()) {
+        return cached.members;
+    }
+
+    // Throws on a failed load, so only successful loads are cached
+    const members = await loadJobMembers(jobId);
+
+    membershipCache.delete(jobId);
+    if (membershipCache.size >= MAX_CACHED_JOBS) {
+        // Maps iterate in insertion order, so this drops the oldest entry
+        membershipCache.delete(membershipCache.keys().next().value);
+    }
+    membershipCache.set(jobId, { members, expiresAt: Date.now() + MEMBERSHIP_TTL_MS });
+
+    return members;
+};
+
+const isJobMember = async (jobId, user) => {
+    if (typeof jobId !== 'string' || !user) {
+        return false;
+    }
+    if (user.admin_status) {
+        return true;
+    }
+    const members = await getJobMembers(jobId);
+    return members.has(user.id);
+};
+
+// Call whenever a job's client or accepted freelancer changes
+const invalidateJobMembers = (jobId) => {
+    membershipCache.delete(jobId);
+    publish('job-members', { jobId });
+};
+
+subscribe('job-members', ({ jobId }) => {
+    membershipCache.delete(jobId);
+});
+
+module.exports = {
+    isJobMember,
+    invalidateJobMembers
+};
+"""
+    create_file("server/services/jobMembership.js", job_membership)
+    
+    # Read receipts (bulk mark-read and counter-backed unread badges)
+    read_receipts = """const supabase = require('../db/index');
+
+// Mark every unread message the user received in a job, up to and
+// including upTo, as read with a single ranged update. The unread counter
+// triggers adjust unread_message_counts for the whole range at once.
+const markReadUpTo = async (jobId, userId, upTo) => {
+    if (!upTo || isNaN(Date.parse(upTo))) {
+        return { error: 'A valid upTo timestamp is required' };
+    }
+
+    const { error, count } = await supabase
+        .from('messages')
+        .update({ read_status: true }, { count: 'exact' })
+        .eq('job_id', jobId)
+        .eq('receiver_id', userId)
+        .eq('read_status', false)
+        .lte('timestamp', upTo);
+
+    if (error) {
+        return { error: 'Failed to mark messages as read' };
+    }
+
+    return { updated: count || 0 };
+};
+
+// Unread badges for every conversation the user has, read from the
+// denormalized counters instead of counting messages
+const getUnreadCounts = async (userId) => {
+    const { data, error } = await supabase
+        .from('unread_message_counts')
+        .select('job_id, unread_count')
+        .eq('user_id', userId)
+        .gt('unread_count', 0);
+
+    if (error) {
+        return { error: 'Failed to fetch unread counts' };
+    }
+
+    return {
+        counts: data,
+        total: data.reduce((sum, row) => sum + row.unread_count, 0)
+    };
+};
+
+module.exports = {
+    markReadUpTo,
+    getUnreadCounts
+};
+"""
+    create_file("server/services/readReceipts.js", read_receipts)
+    
+    # Socket flow control (send-message rate limits and outbound backpressure)
+    socket_flow_control = """const readNumber = (name, fallback) => {
+    const value = parseFloat(process.env[name]);
+    return isNaN(value) ? fallback : value;
+};
+
+const config = {
+    socketRate: readNumber('SOCKET_MESSAGE_RATE', 5),          // messages/second per socket
+    socketBurst: readNumber('SOCKET_MESSAGE_BURST', 10),
+    roomRate: readNumber('ROOM_MESSAGE_RATE', 20),             // messages/second per job room
+    roomBurst: readNumber('ROOM_MESSAGE_BURST', 40),
+    maxMessageBytes: readNumber('SOCKET_MAX_MESSAGE_BYTES', 4096),
+    maxQueuedBytes: readNumber('SOCKET_MAX_QUEUED_BYTES', 256 * 1024),
+    overflowPolicy: process.env.SOCKET_OVERFLOW_POLICY === 'disconnect' ? 'disconnect' : 'drop'
+};
+
+class TokenBucket {
+    constructor(capacity, refillPerSecond) {
+        this.capacity = capacity;
+        this.tokens = capacity;
+        this.refillPerMs = refillPerSecond / 1000;
+        this.updatedAt = Date.now();
+    }
+
+    refill() {
+        const now = Date.now();
+        this.tokens = Math.min(this.capacity, this.tokens + (now - this.updatedAt) * this.refillPerMs);
+        this.updatedAt = now;
+    }
+
+    take() {
+        this.refill();
+        if (this.tokens >= 1) {
+            this.tokens -= 1;
+            return true;
+        }
+        return false;
+    }
+
+    msUntilNextToken() {
+        return Math.ceil((1 - this.tokens) / this.refillPerMs);
+    }
+}
+
+// Bytes sitting in engine.io's write buffer waiting for the client to read
+const queuedBytes = (socket) => {
+    const writeBuffer = socket.conn?.writeBuffer || [];
+    let total = 0;
+    for (const packet of writeBuffer) {
+        const data = packet.data;
+        if (typeof data === 'string') {
+            total += Buffer.byteLength(data);
+        } else if (data && data.length) {
+            total += data.length;
+        }
+    }
+    return total;
+};
+
+const createSocketFlowControl = (io, options = {}) => {
+    const settings = { ...config, ...options };
+    const roomBuckets = new Map();
+    const counters = {
+        rateLimitedMessages: 0,
+        oversizedMessages: 0,
+        droppedDeliveries: 0,
+        overflowDisconnects: 0
+    };
+
+    io.of('/').adapter.on('delete-room', (room) => {
+        roomBuckets.delete(room);
+    });
+
+    // Admit or reject one inbound send-message against the socket's and the
+    // room's token buckets. Returns null when allowed, or a rejection reason.
+    const admitMessage = (socket, jobId, content) => {
+        if (Buffer.byteLength(String(content)) > settings.maxMessageBytes) {
+            counters.oversizedMessages += 1;
+            return { reason: 'Message too large' };
+        }
+
+        if (!socket.data.messageBucket) {
+            socket.data.messageBucket = new TokenBucket(settings.socketBurst, settings.socketRate);
+        }
+        let roomBucket = roomBuckets.get(jobId);
+        if (!roomBucket) {
+            roomBucket = new TokenBucket(settings.roomBurst, settings.roomRate);
+            roomBuckets.set(jobId, roomBucket);
+        }
+
+        if (!socket.data.messageBucket.take()) {
+            counters.rateLimitedMessages += 1;
+            return { reason: 'Too many messages', retryAfterMs: socket.data.messageBucket.msUntilNextToken() };
+        }
+        if (!roomBucket.take()) {
+            counters.rateLimitedMessages += 1;
+            return { reason: 'Room is busy', retryAfterMs: roomBucket.msUntilNextToken() };
+        }
+        return null;
+    };
+
+    // Broadcast to a room, skipping (or disconnecting) sockets whose outbound
+    // buffer is already over the limit. The payload is still encoded once.
+    const emitToRoom = (room, event, payload) => {
+        // Only local sockets can be inspected; members on other cluster
+        // workers are left to their own worker's checks
+        const socketIds = io.of('/').adapter.rooms.get(room) || [];
+
+        const overLimit = [];
+        for (const socketId of socketIds) {
+            const socket = io.of('/').sockets.get(socketId);
+            if (socket && queuedBytes(socket) > settings.maxQueuedBytes) {
+                overLimit.push(socket);
+            }
+        }
+
+        for (const socket of overLimit) {
+            counters.droppedDeliveries += 1;
+            if (settings.overflowPolicy === 'disconnect') {
+                counters.overflowDisconnects += 1;
+                socket.disconnect(true);
+            }
+        }
+
+        io.to(room).except(overLimit.map(socket => socket.id)).emit(event, payload);
+    };
+
+    const metrics = () => {
+        let totalQueuedBytes = 0;
+        let maxSocketQueuedBytes = 0;
+        for (const socket of io.of('/').sockets.values()) {
+            const bytes = queuedBytes(socket);
+            totalQueuedBytes += bytes;
+            maxSocketQueuedBytes = Math.max(maxSocketQueuedBytes, bytes);
+        }
+
+        return {
+            ...counters,
+            queuedBytes: totalQueuedBytes,
+            maxSocketQueuedBytes,
+            overflowPolicy: settings.overflowPolicy
+        };
+    };
+
+    return {
+        admitMessage,
+        emitToRoom,
+        metrics
+    };
+};
+
+module.exports = {
+    TokenBucket,
+    createSocketFlowControl
+};
+"""
+    create_file("server/services/socketFlowControl.js", socket_flow_control)
+    
+    # Response cache (bounded, TTL'd store of serialized JSON responses)
+    response_cache = """const crypto = require('crypto');
+const { publish, subscribe } = require('./clusterBus');
+
+class ResponseCache {
+    // clusterTopic, when set, mirrors invalidations to the other cluster workers
+    constructor({ maxEntries = 500, ttlMs = 30 * 1000, clusterTopic = null } = {}) {
+        this.maxEntries = maxEntries;
+        this.ttlMs = ttlMs;
+        this.clusterTopic = clusterTopic;
+        this.entries = new Map();      // key -> { body, etag, tags, expiresAt }
+        this.tagIndex = new Map();     // tag -> Set of keys
+        this.version = 0;              // bumped on every invalidation
+        this.counters = { hits: 0, misses: 0, notModified: 0, evictions: 0, invalidations: 0 };
+        this.followers = [];           // caches that drop entries along with this one
+
+        if (clusterTopic) {
+            subscribe(clusterTopic, ({ tags }) => this.applyInvalidation(tags));
+        }
+    }
+
+    get(key) {
+        const entry = this.entries.get(key);
+        if (!entry || entry.expiresAt <= Date.now()) {
+            if (entry) {
+                this.delete(key);
+            }
+            this.counters.misses += 1;
+            return null;
+        }
+
+        // Re-insert so Map order tracks recency for LRU eviction
+        this.entries.delete(key);
+        this.entries.set(key, entry);
+        this.counters.hits += 1;
+        return entry;
+    }
+
+    // Store a response body. Pass the version read before the backend call:
+    // if anything was invalidated since, the result may be stale and is
+    // returned without being cached.
+    set(key, value, tags = [], version = this.version) {
+        const body = JSON.stringify(value);
+        const entry = {
+            body,
+            etag: `"${crypto.createHash('sha1').update(body).digest('base64url')}"`,
+            tags,
+            expiresAt: Date.now() + this.ttlMs
+        };
+
+        if (version !== this.version) {
+            return entry;
+        }
+
+        this.delete(key);
+        while (this.entries.size >= this.maxEntries) {
+            this.delete(this.entries.keys().next().value);
+            this.counters.evictions += 1;
+        }
+
+        this.entries.set(key, entry);
+        for (const tag of tags) {
+            if (!this.tagIndex.has(tag)) {
+                this.tagIndex.set(tag, new Set());
+            }
+            this.tagIndex.get(tag).add(key);
+        }
+        return entry;
+    }
+
+    delete(key) {
+        const entry = this.entries.get(key);
+        if (!entry) {
+            return;
+        }
+        this.entries.delete(key);
+        for (const tag of entry.tags) {
+            const keys = this.tagIndex.get(tag);
+            keys.delete(key);
+            if (keys.size === 0) {
+                this.tagIndex.delete(tag);
+            }
+        }
+    }
+
+    // Drop every entry carrying any of the given tags
+    invalidate(...tags) {
+        this.applyInvalidation(tags);
+        if (this.clusterTopic) {
+            publish(this.clusterTopic, { tags });
+        }
+    }
+
+    clear() {
+        this.applyInvalidation(null);
+        if (this.clusterTopic) {
+            publish(this.clusterTopic, { tags: null });
+        }
+    }
+
+    // Apply this cache's invalidations (local and cluster-wide) to another
+    follow(source) {
+        source.followers.push(this);
+        return this;
+    }
+
+    // tags === null clears everything
+    applyInvalidation(tags) {
+        this.version += 1;
+        this.counters.invalidations += 1;
+        this.followers.forEach(follower => follower.applyInvalidation(tags));
+        if (tags === null) {
+            this.entries.clear();
+            this.tagIndex.clear();
+            return;
+        }
+        for (const tag of tags) {
+            for (const key of this.tagIndex.get(tag) || []) {
+                this.delete(key);
+            }
+        }
+    }
+
+    stats() {
+        const lookups = this.counters.hits + this.counters.misses;
+        return {
+            ...this.counters,
+            entries: this.entries.size,
+            hitRatio: lookups === 0 ? 0 : this.counters.hits / lookups
+        };
+    }
+}
+
+// Shared cache for the public job feed and job detail reads
+const jobsCache = new ResponseCache({
+    maxEntries: parseInt(process.env.JOBS_CACHE_MAX_ENTRIES) || 500,
+    ttlMs: parseInt(process.env.JOBS_CACHE_TTL_MS) || 30 * 1000,
+    clusterTopic: 'jobs-cache'
+});
+
+// Searches are many and short-lived, so they get their own small-TTL cache
+// rather than evicting feed entries; job writes invalidate both
+const jobSearchCache = new ResponseCache({
+    maxEntries: parseInt(process.env.JOB_SEARCH_CACHE_MAX_ENTRIES) || 1000,
+    ttlMs: parseInt(process.env.JOB_SEARCH_CACHE_TTL_MS) || 10 * 1000
+}).follow(jobsCache);
+
+// Cache tags used by the job routes
+const jobCacheTags = {
+    list: 'jobs:list',
+    job: (id) => `job:${id}`
+};
+
+module.exports = {
+    ResponseCache,
+    jobsCache,
+    jobSearchCache,
+    jobCacheTags
+};
+"""
+    create_file("server/services/responseCache.js", response_cache)
+    
+    # Singleflight (collapse concurrent identical backend calls)
+    singleflight = """// Concurrent calls with the same key share one in-flight promise; the
+// key is released as soon as that call settles, so nothing is cached.
+// Callers receive the same result object and must not mutate it.
+class Singleflight {
+    constructor() {
+        this.inFlight = new Map();
+        this.stats = { calls: 0, shared: 0 };
+    }
+
+    do(key, fn) {
+        const existing = this.inFlight.get(key);
+        if (existing) {
+            this.stats.shared += 1;
+            return existing;
+        }
+
+        this.stats.calls += 1;
+        const call = Promise.resolve()
+            .then(fn)
+            .finally(() => {
+                this.inFlight.delete(key);
+            });
+        this.inFlight.set(key, call);
+        return call;
+    }
+}
+
+module.exports = {
+    Singleflight
+};
+"""
+    create_file("server/services/singleflight.js", singleflight)
+    
+    # Graceful shutdown (drain HTTP keep-alive connections and socket.io)
+    graceful_shutdown = """// Returns shutdown(reason). On shutdown the server stops accepting work,
+// socket.io clients are told to reconnect elsewhere, idle keep-alive
+// connections are closed at once and busy ones after their response, then
+// beforeExit runs and the process exits (or is forced to after timeoutMs).
+const createGracefulShutdown = ({ server, io, timeoutMs = 10000, beforeExit = async () => {} }) => {
+    const connections = new Map();   // socket -> in-flight requests
+    let draining = false;
+    let drained = null;
+
+    server.on('connection', (socket) => {
+        connections.set(socket, 0);
+        socket.on('close', () => {
+            connections.delete(socket);
+            if (draining && connections.size === 0 && drained) {
+                drained();
+            }
+        });
+    });
+
+    // Upgraded (websocket) connections are closed through socket.io instead
+    server.on('upgrade', (req, socket) => {
+        connections.delete(socket);
+    });
+
+    server.prependListener('request', (req, res) => {
+        const socket = req.socket;
+        connections.set(socket, (connections.get(socket) || 0) + 1);
+        if (draining) {
+            res.setHeader('Connection', 'close');
+        }
+
+        res.on('finish', () => {
+            const active = Math.max((connections.get(socket) || 1) - 1, 0);
+            if (connections.has(socket)) {
+                connections.set(socket, active);
+            }
+            if (draining && active === 0) {
+                socket.end();
+            }
+        });
+    });
+
+    const shutdown = async (reason) => {
+        if (draining) {
+            return;
+        }
+        draining = true;
+        console.log(`Shutting down (${reason}), draining ${connections.size} connections`);
+
+        const forceExit = setTimeout(() => {
+            console.error('Shutdown timed out, forcing exit');
+            process.exit(1);
+        }, timeoutMs);
+        forceExit.unref();
+
+        const allClosed = new Promise((resolve) => {
+            drained = resolve;
+        });
+
+        // Closing the transport (rather than disconnecting the socket) makes
+        // clients reconnect automatically, landing on a live worker
+        for (const socket of io.of('/').sockets.values()) {
+            socket.conn.close();
+        }
+        io.close();
+
+        for (const [socket, active] of connections) {
+            if (active === 0) {
+                socket.end();
+            }
+        }
+        if (connections.size > 0) {
+            await allClosed;
+        }
+
+        try {
+            await beforeExit();
+        } catch (error) {
+            console.error('Shutdown hook error:', error);
+        }
+        process.exit(0);
+    };
+
+    return shutdown;
+};
+
+module.exports = {
+    createGracefulShutdown
+};
+"""
+    create_file("server/services/gracefulShutdown.js", graceful_shutdown)
+    
+    # Per-request timing (Server-Timing header and slow request log)
+    request_timing = """const { AsyncLocalStorage } = require('async_hooks');
+const { performance } = require('perf_hooks');
+
+const SLOW_REQUEST_MS = parseInt(process.env.SLOW_REQUEST_MS) || 1000;
+
+// Each request gets a timing context that follows it through awaits. Spans
+// are aggregated per name (total duration and count) rather than stored
+// individually, so recording one costs two clock reads and an addition.
+const storage = new AsyncLocalStorage();
+
+const recordSpan = (timing, name, duration) => {
+    const span = timing.spans.get(name);
+    if (span) {
+        span.duration += duration;
+        span.count += 1;
+    } else {
+        timing.spans.set(name, { duration, count: 1 });
+    }
+};
+
+// Time fn() as a span of the current request; outside a request (socket
+// handlers, background flushes) fn simply runs
+const timeSpan = async (name, fn) => {
+    const timing = storage.getStore();
+    if (!timing) {
+        return fn();
+    }
+
+    const start = performance.now();
+    try {
+        return await fn();
+    } finally {
+        recordSpan(timing, name, performance.now() - start);
+    }
+};
+
+// Wrap an async function so every call is recorded as a span
+const instrument = (name, fn) => {
+    return function instrumented(...args) {
+        return timeSpan(name, () => fn.apply(this, args));
+    };
+};
+
+// Supabase query builders run when awaited, so the span covers then();
+// chained filter methods return builders that are wrapped in turn
+const instrumentQuery = (builder, name) => {
+    return new Proxy(builder, {
+        get(target, prop) {
+            if (prop === 'then') {
+                return (onFulfilled, onRejected) => {
+                    return timeSpan(name, () => target.then(result => result))
+                        .then(onFulfilled, onRejected);
+                };
+            }
+
+            const value = Reflect.get(target, prop, target);
+            if (typeof value !== 'function') {
+                return value;
+            }
+            return (...args) => {
+                const result = value.apply(target, args);
+                return result && typeof result.then === 'function' ? instrumentQuery(result, name) : result;
+            };
+        }
+    });
+};
+
+const instrumentSupabase = (client) => {
+    const from = client.from.bind(client);
+    const rpc = client.rpc.bind(client);
+    client.from = (table) => instrumentQuery(from(table), 'db');
+    client.rpc = (...args) => instrumentQuery(rpc(...args), 'db');
+    return client;
+};
+
+// "db;dur=12.3;desc="3 calls", email;dur=..., app;dur=..." where app is
+// time not covered by any span (middleware, handler code, serialisation)
+const formatServerTiming = (timing, total) => {
+    const entries = [];
+    let covered = 0;
+    for (const [name, span] of timing.spans) {
+        covered += span.duration;
+        entries.push(`${name};dur=${span.duration.toFixed(1)};desc="${span.count} call${span.count === 1 ? '' : 's'}"`);
+    }
+    entries.push(`app;dur=${Math.max(0, total - covered).toFixed(1)}`);
+    entries.push(`total;dur=${total.toFixed(1)}`);
+    return entries.join(', ');
+};
+
+const requestTiming = ({ slowMs = SLOW_REQUEST_MS } = {}) => {
+    return (req, res, next) => {
+        const timing = { start: performance.now(), spans: new Map() };
+
+        // Headers are written lazily, so the header reflects every span
+        // recorded before the response starts
+        const writeHead = res.writeHead;
+        res.writeHead = function (...args) {
+            if (!res.headersSent) {
+                res.setHeader('Server-Timing', formatServerTiming(timing, performance.now() - timing.start));
+            }
+            return writeHead.apply(this, args);
+        };
+
+        res.on('finish', () => {
+            const total = performance.now() - timing.start;
+            if (total >= slowMs) {
+                console.warn(`Slow request ${req.method} ${req.originalUrl || req.url} ${res.statusCode} ${total.toFixed(0)}ms: ${formatServerTiming(timing, total)}`);
+            }
+        });
+
+        storage.run(timing, next);
+    };
+};
+
+module.exports = {
+    requestTiming,
+    timeSpan,
+    instrument,
+    instrumentSupabase
+};
+"""
+    create_file("server/services/requestTiming.js", request_timing)
+    
+    # Prometheus metrics (served at /metrics)
+    metrics_service = """const client = require('prom-client');
+
+// Everything is registered on prom-client's default registry, which is what
+// the AggregatorRegistry in cluster.js collects from each worker
+client.collectDefaultMetrics({ prefix: 'juba_' });
+
+const httpRequests = new client.Counter({
+    name: 'juba_http_requests_total',
+    help: 'HTTP requests by route and status',
+    labelNames: ['method', 'route', 'status']
+});
+
+const httpRequestDuration = new client.Histogram({
+    name: 'juba_http_request_duration_seconds',
+    help: 'HTTP request latency by route',
+    labelNames: ['method', 'route'],
+    buckets: [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10]
+});
+
+const rateLimitRejections = new client.Counter({
+    name: 'juba_rate_limit_rejections_total',
+    help: 'Requests rejected by a rate limiter',
+    labelNames: ['limiter']
+});
+
+const chatMessages = new client.Counter({
+    name: 'juba_chat_messages_total',
+    help: 'Chat messages by outcome (received, rejected, saved, failed)',
+    labelNames: ['outcome']
+});
+
+const externalCallsInFlight = new client.Gauge({
+    name: 'juba_external_calls_in_flight',
+    help: 'Email and payment calls currently waiting on the provider',
+    labelNames: ['service']
+});
+
+const externalCallDuration = new client.Histogram({
+    name: 'juba_external_call_duration_seconds',
+    help: 'Email and payment call latency',
+    labelNames: ['service'],
+    buckets: [0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30]
+});
+
+// Gauges read live state when scraped; the sources are bound once the
+// server has created them
+const sources = { io: null, messageWriter: null };
+
+new client.Gauge({
+    name: 'juba_socket_connections',
+    help: 'Connected socket.io clients',
+    collect() {
+        this.set(sources.io ? sources.io.of('/').sockets.size : 0);
+    }
+});
+
+new client.Gauge({
+    name: 'juba_socket_rooms',
+    help: 'Job chat rooms with at least one local member',
+    collect() {
+        let rooms = 0;
+        if (sources.io) {
+            const namespace = sources.io.of('/');
+            // Every socket also sits in a room named after its own id
+            for (const room of namespace.adapter.rooms.keys()) {
+                if (!namespace.sockets.has(room)) {
+                    rooms += 1;
+                }
+            }
+        }
+        this.set(rooms);
+    }
+});
+
+new client.Gauge({
+    name: 'juba_message_writer_queue_depth',
+    help: 'Chat messages waiting for the next batch insert',
+    collect() {
+        this.set(sources.messageWriter ? sources.messageWriter.pending.length : 0);
+    }
+});
+
+const bindMetricsSources = ({ io, messageWriter }) => {
+    sources.io = io;
+    sources.messageWriter = messageWriter;
+};
+
+// Route patterns keep label cardinality bounded (/api/jobs/:id, not ids)
+const routeLabel = (req) => {
+    return req.route ? `${req.baseUrl}${req.route.path}` : 'unmatched';
+};
+
+const metricsMiddleware = (req, res, next) => {
+    const end = httpRequestDuration.startTimer();
+    res.on('finish', () => {
+        const route = routeLabel(req);
+        end({ method: req.method, route });
+        httpRequests.inc({ method: req.method, route, status: res.statusCode });
+    });
+    next();
+};
+
+// Wrap a provider call so in-flight count and latency are tracked
+const trackExternalCall = (service, fn) => {
+    return async function tracked(...args) {
+        externalCallsInFlight.inc({ service });
+        const end = externalCallDuration.startTimer({ service });
+        try {
+            return await fn.apply(this, args);
+        } finally {
+            end();
+            externalCallsInFlight.dec({ service });
+        }
+    };
+};
+
+// GET /metrics; when METRICS_TOKEN is set scrapers must send it as a bearer token
+const metricsHandler = async (req, res) => {
+    const token = process.env.METRICS_TOKEN;
+    if (token && req.headers['authorization'] !== `Bearer ${token}`) {
+        return res.status(401).json({ error: 'Metrics token required' });
+    }
+
+    try {
+        res.set('Content-Type', client.register.contentType);
+        res.end(await client.register.metrics());
+    } catch (error) {
+        console.error('Metrics error:', error);
+        res.status(500).json({ error: 'Failed to collect metrics' });
+    }
+};
+
+module.exports = {
+    metricsMiddleware,
+    metricsHandler,
+    bindMetricsSources,
+    trackExternalCall,
+    rateLimitRejections,
+    chatMessages
+};
+"""
+    create_file("server/services/metrics.js", metrics_service)
+    
+    # User routes
+    user_routes = """const express = require('express');
+const router = express.Router();
+const supabase = require('../db/index');
+const { authenticateToken, requireAdmin } = require('../middleware/auth');
+const { validateUserRegistration, handleValidationErrors } = require('../middleware/validation');
+const { rateLimitMiddleware, authRateLimiter } = require('../middleware/rateLimit');
+const { sendEmail, emailTemplates } = require('../services/emailService');
+const { getUnreadCounts } = require('../services/readReceipts');
+const { TIMESTAMP_PATTERN, paginateQuery, buildPage } = require('../services/pagination');
+const { jobsCache } = require('../services/responseCache');
+
+const ADMIN_USER_COLUMNS = 'id, email, phone, address, role, admin_status, profile_completion_status, verification_status, created_at';
+const ADMIN_USER_SORT_FIELDS = {
+    created_at: { pattern: TIMESTAMP_PATTERN },
+    email: { unique: true }
+};
+
+// Google Sign-In authentication
+router.post('/auth/google', rateLimitMiddleware(authRateLimiter), async (req, res) => {
+    try {
+        const { token, phone, address } = req.body;
+        
+        // Verify Google token
+        const verification = await verifyGoogleToken(token);
+        if (!verification.success) {
+            return res.status(401).json({ error: 'Invalid authentication token' });
+        }
+        
+        const { email, name, sub: googleId } = verification.payload;
+        
+        // Check if user already exists
+        const { data: existingUser, error: userError } = await supabase
+            .from('users')
+            .select('*')
+            .eq('google_id', googleId)
+            .single();
+            
+        let user;
+        
+        if (userError || !existingUser) {
+            // Create new user
+            const { data: newUser, error: insertError } = await supabase
+                .from('users')
+                .insert([
+                    {
+                        google_id: googleId,
+                        email,
+                        phone,
+                        address,
+                        role: 'client',
+                        // Check if admin based on email domain
+                        admin_status: email.endsWith(process.env.ADMIN_EMAIL_DOMAIN)
+                    }
+                ])
+                .select()
+                .single();
+                
+            if (insertError) {
+                return res.status(400).json({ error: 'User creation failed' });
+            }
+            
+            user = newUser;
+            
+            // Send welcome email
+            await sendEmail(email, 
+                emailTemplates.welcome(name).subject,
+                emailTemplates.welcome(name).text,
+                emailTemplates.welcome(name).html
+            );
+        } else {
+            user = existingUser;
+            
+            // Update user information if provided
+            if (phone || address) {
+                const updates = {};
+                if (phone) updates.phone = phone;
+                if (address) updates.address = address;
+                
+                const { data: updatedUser, error: updateError } = await supabase
+                    .from('users')
+                    .update(updates)
+                    .eq('id', user.id)
+                    .select()
+                    .single();
+                    
+                if (!updateError) {
+                    user = updatedUser;
+                }
+            }
+        }
+        
+        // Generate JWT token
+        const jwtToken = generateToken(user);
+        
+        res.json({
+            token: jwtToken,
+            user: {
+                id: user.id,
+                email: user.email,
+                role: user.role,
+                admin_status: user.admin_status,
+                profile_completion_status: user.profile_completion_status
+            }
+        });
+        
+    } catch (error) {
+        console.error('Authentication error:', error);
+        res.status(500).json({ error: 'Internal server error' });
+    }
+});
+
+// Get current user profile
+router.get('/profile', authenticateToken, async (req, res) => {
+    try {
+        const { data: user, error } = await supabase
+            .from('users')
+            .select('*')
+            .eq('id', req.user.id)
+            .single();
+            
+        if (error) {
+            return res.status(404).json({ error: 'User not found' });
+        }
+        
+        // Remove sensitive information
+        const { google_id, ...userData } = user;
+        
+        // The client keeps its own copy and revalidates it with If-None-Match;
+        // Express answers 304 from the ETag it computes for the body
+        res.set('Cache-Control', 'private, no-cache');
+        res.json(userData);
+    } catch (error) {
+        console.error('Profile fetch error:', error);
+        res.status(500).json({ error: 'Internal server error' });
+    }
+});
+
+// Get unread message counts per job for the current user
+router.get('/unread-counts', authenticateToken, async (req, res) => {
+    try {
+        const result = await getUnreadCounts(req.user.id);
+        
+        if (result.error) {
+            return res.status(400).json({ error: result.error });
+        }
+        
+        res.json(result);
+    } catch (error) {
+        console.error('Unread counts fetch error:', error);
+        res.status(500).json({ error: 'Internal server error' });
+    }
+});
+
+// Update user profile
+router.put('/profile', authenticateToken, validateUserRegistration, async (req, res) => {
+    try {
+        const { phone, address } = req.body;
+        
+        const { data: user, error } = await supabase
+            .from('users')
+            .update({ phone, address, profile_completion_status: true })
+            .eq('id', req.user.id)
+            .select()
+            .single();
+            
+        if (error) {
+            return res.status(400).json({ error: 'Profile update failed' });
+        }
+        
+        // Cached job responses embed the client's user row
+        jobsCache.clear();
+        
+        res.json({ message: 'Profile updated successfully', user });
+    } catch (error) {
+        console.error('Profile update error:', error);
+        res.status(500).json({ error: 'Internal server error' });
+    }
+});
+
+// Apply to become a freelancer
+router.post('/become-freelancer', authenticateToken, async (req, res) => {
+    try {
+        const {
+            bio,
+            experience_years,
+            service_areas,
+            hourly_rate_min,
+            hourly_rate_max,
+            certifications,
+            coverage_areas
+        } = req.body;
+        
+        // Check if user already has a freelancer profile
+        const { data: existingProfile, error: profileError } = await supabase
+            .from('freelancer_profiles')
+            .select('*')
+            .eq('user_id', req.user.id)
+            .single();
+            
+        if (existingProfile) {
+            return res.status(400).json({ error: 'Freelancer profile already exists' });
+        }
+        
+        // Create freelancer profile
+        const { data: profile, error: insertError } = await supabase
+            .from('freelancer_profiles')
+            .insert([
+                {
+                    user_id: req.user.id,
+                    bio,
+                    experience_years,
+                    service_areas,
+                    hourly_rate_min,
+                    hourly_rate_max,
+                    certifications,
+                    coverage_areas,
+                    approval_status: 'pending'
+                }
+            ])
+            .select()
+            .single();
+            
+        if (insertError) {
+            return res.status(400).json({ error: 'Freelancer application failed' });
+        }
+        
+        // Notify admins
+        const { data: admins } = await supabase
+            .from('users')
+            .select('email')
+            .eq('admin_status', true);
+            
+        if (admins && admins.length > 0) {
+            const adminEmails = admins.map(admin => admin.email);
+            const subject = 'New Freelancer Application';
+            const message = `User ${req.user.email} has applied to become a freelancer.`;
+            
+            for (const email of adminEmails) {
+                await sendEmail(
+                    email,
+                    emailTemplates.adminNotification(subject, message).subject,
+                    emailTemplates.adminNotification(subject, message).text,
+                    emailTemplates.adminNotification(subject, message).html
+                );
+            }
+        }
+        
+        res.json({ message: 'Freelancer application submitted successfully', profile });
+    } catch (error) {
+        console.error('Freelancer application error:', error);
+        res.status(500).json({ error: 'Internal server error' });
+    }
+});
+
+// Admin only: List users a page at a time
+// Query: role, admin_status, search (email), sort (created_at|email), order (asc|desc), cursor, limit
+router.get('/admin/users', authenticateToken, requireAdmin, async (req, res) => {
+    try {
+        const { role, admin_status, search, sort, order, cursor, limit } = req.query;
+        
+        let query = supabase
+            .from('users')
+            .select(ADMIN_USER_COLUMNS);
+            
+        if (role) {
+            query = query.eq('role', role);
+        }
+        
+        if (admin_status) {
+            query = query.eq('admin_status', admin_status === 'true');
+        }
+        
+        if (search) {
+            query = query.ilike('email', `%${search}%`);
+        }
+        
+        const paged = paginateQuery(query, { sortFields: ADMIN_USER_SORT_FIELDS, sort, order, cursor, limit });
+        if (paged.error) {
+            return res.status(400).json({ error: paged.error });
+        }
+        
+        const { data: users, error } = await paged.query;
+            
+        if (error) {
+            return res.status(400).json({ error: 'Failed to fetch users' });
+        }
+        
+        const page = buildPage(users, paged);
+        
+        res.json({
+            users: page.rows,
+            pagination: {
+                limit: page.limit,
+                nextCursor: page.nextCursor
+            }
+        });
+    } catch (error) {
+        console.error('Users fetch error:', error);
+        res.status(500).json({ error: 'Internal server error' });
+    }
+});
+
+// Admin only: Update user
+router.put('/admin/users/:id', authenticateToken, requireAdmin, async (req, res) => {
+    try {
+        const { id } = req.params;
+        const updates = req.body;
+        
+        const { data: user, error } = await supabase
+            .from('users')
+            .update(updates)
+            .eq('id', id)
+            .select()
+            .single();
+            
+        if (error) {
+            return res.status(400).json({ error: 'User update failed' });
+        }
+        
+        jobsCache.clear();
+        
+        res.json({ message: 'User updated successfully', user });
+    } catch (error) {
+        console.error('User update error:', error);
+        res.status(500).json({ error: 'Internal server error' });
+    }
+});
+
+// Admin only: Delete user
+router.delete('/admin/users/:id', authenticateToken, requireAdmin, async (req, res) => {
+    try {
+        const { id } = req.params;
+        
+        const { error } = await supabase
+            .from('users')
+            .delete()
+            .eq('id', id);
+            
+        if (error) {
+            return res.status(400).json({ error: 'User deletion failed' });
+        }
+        
+        jobsCache.clear();
+        
+        res.json({ message: 'User deleted successfully' });
+    } catch (error) {
+        console.error('User deletion error:', error);
+        res.status(500).json({ error: 'Internal server error' });
+    }
+});
+
+module.exports = router;
+"""
+    create_file("server/routes/users.js", user_routes)
+    
+    # Jobs routes
+    jobs_routes = """const express = require('express');
+const router = express.Router();
+const supabase = require('../db/index');
+const { authenticateToken, requireAdmin } = require('../middleware/auth');
+const { validateJobPosting } = require('../middleware/validation');
+const { rateLimitMiddleware, generalRateLimiter } = require('../middleware/rateLimit');
+const { sendEmail, emailTemplates } = require('../services/emailService');
+const { processPayment } = require('../services/paymentService');
+const { fetchMessagePage } = require('../services/chatHistory');
+const { isJobMember, invalidateJobMembers } = require('../services/jobMembership');
+const { markReadUpTo } = require('../services/readReceipts');
+const { TIMESTAMP_PATTERN, paginateQuery, buildPage } = require('../services/pagination');
+const { jobsCache, jobSearchCache, jobCacheTags } = require('../services/responseCache');
+const { cacheResponse } = require('../middleware/cache');
+const { Singleflight } = require('../services/singleflight');
+
+// Concurrent reads of the same job share one Supabase call. Lookups are
+// keyed by cache version too, so a read that starts after a write never
+// joins one that started before it and caches the old row.
+const jobDetailLookups = new Singleflight();
+
+// "Fix  Tap " and "fix tap" are the same search and share a cache entry.
+// Handlers query with the same normalized value the cache key uses, and the
+// client's normalizeSearch (pages/Dashboard.js) applies the same rule.
+const SEARCH_MAX_LENGTH = 100;
+const normalizeSearch = (search) => {
+    return String(search || '').toLowerCase().split(/\\s+/).filter(Boolean).join(' ').slice(0, SEARCH_MAX_LENGTH).trim();
+};
+
+// Cache keys normalize the query so equivalent requests share an entry
+const jobListCacheKey = (req) => {
+    const { page, limit, status, search } = req.query;
+    return JSON.stringify([
+        'jobs',
+        parseInt(page) || 1,
+        parseInt(limit) || 10,
+        status || '',
+        normalizeSearch(search)
+    ]);
+};
+
+const cacheJobList = cacheResponse(jobsCache, {
+    key: jobListCacheKey,
+    tags: () => [jobCacheTags.list]
+});
+
+const cacheJobDetails = cacheResponse(jobsCache, {
+    key: (req) => JSON.stringify(['job', req.params.id]),
+    tags: (req) => [jobCacheTags.job(req.params.id)]
+});
+
+const cacheJobSearch = cacheResponse(jobSearchCache, {
+    key: (req) => JSON.stringify([
+        'search',
+        req.query.status || '',
+        normalizeSearch(req.query.q),
+        req.query.cursor || '',
+        parseInt(req.query.limit) || 0
+    ]),
+    tags: () => [jobCacheTags.list]
+});
+
+const SEARCH_COLUMNS = 'id, title, description, location, timeline, status, created_at, client_id, client:users(id, email)';
+const SEARCH_SORT_FIELDS = { created_at: { pattern: TIMESTAMP_PATTERN } };
+
+// Admin listings carry the client's email and an application count rather
+// than every application and applicant
+const ADMIN_JOB_COLUMNS = 'id, title, location, status, timeline, created_at, client_id, client:users(id, email), applications:job_applications(count)';
+const ADMIN_JOB_SORT_FIELDS = {
+    created_at: { pattern: TIMESTAMP_PATTERN },
+    status: { pattern: /^[a-z_]+$/ }
+};
+
+// "My jobs" reads a client's own jobs or a freelancer's applications, each a
+// range scan on (owner, time) instead of a pass over the public feed
+const MY_JOB_COLUMNS = 'id, title, description, location, timeline, status, created_at, client_id';
+const MY_JOBS_SORT_FIELDS = { created_at: { pattern: TIMESTAMP_PATTERN } };
+const MY_APPLICATIONS_SORT_FIELDS = { application_timestamp: { pattern: TIMESTAMP_PATTERN } };
+
+// Get all jobs (with filters)
+router.get('/', rateLimitMiddleware(generalRateLimiter), cacheJobList, async (req, res) => {
+    try {
+        const { page = 1, limit = 10, status } = req.query;
+        const search = normalizeSearch(req.query.search);
+        const offset = (page - 1) * limit;
+        
+        let query = supabase
+            .from('jobs')
+            .select('*, client:users(*)', { count: 'exact' })
+            .order('created_at', { ascending: false });
+            
+        if (status) {
+            query = query.eq('status', status);
+        }
+        
+        if (search) {
+            query = query.ilike('title', `%${search}%`);
+        }
+        
+        query = query.range(offset, offset + limit - 1);
+        
+        const { data: jobs, error, count } = await query;
+        
+        if (error) {
+            return res.status(400).json({ error: 'Failed to fetch jobs' });
+        }
+        
+        res.json({
+            jobs,
+            pagination: {
+                page: parseInt(page),
+                limit: parseInt(limit),
+                total: count
+            }
+        });
+    } catch (error) {
+        console.error('Jobs fetch error:', error);
+        res.status(500).json({ error: 'Internal server error' });
+    }
+});
+
+// Search jobs by title, newest first, paginated with ?cursor=
+router.get('/search', rateLimitMiddleware(generalRateLimiter), cacheJobSearch, async (req, res) => {
+    try {
+        const { status, cursor, limit } = req.query;
+        const search = normalizeSearch(req.query.q);
+        
+        if (!search) {
+            return res.status(400).json({ error: 'Search text is required' });
+        }
+        
+        let query = supabase
+            .from('jobs')
+            .select(SEARCH_COLUMNS)
+            .ilike('title', `%${search}%`);
+            
+        if (status) {
+            query = query.eq('status', status);
+        }
+        
+        const paged = paginateQuery(query, { sortFields: SEARCH_SORT_FIELDS, cursor, limit, defaultLimit: 10, maxLimit: 50 });
+        if (paged.error) {
+            return res.status(400).json({ error: paged.error });
+        }
+        
+        const { data: jobs, error } = await paged.query;
+        
+        if (error) {
+            return res.status(400).json({ error: 'Failed to search jobs' });
+        }
+        
+        const page = buildPage(jobs, paged);
+        
+        res.json({
+            jobs: page.rows,
+            pagination: {
+                limit: page.limit,
+                nextCursor: page.nextCursor
+            }
+        });
+    } catch (error) {
+        console.error('Job search error:', error);
+        res.status(500).json({ error: 'Internal server error' });
+    }
+});
+
+// Get the current user's jobs: posted ones for clients, applied-to ones for freelancers.
+// ?status= filters by job status for both; freelancers can also filter their
+// applications with ?application_status=.
+router.get('/mine', authenticateToken, rateLimitMiddleware(generalRateLimiter), async (req, res) => {
+    try {
+        const { status, application_status: applicationStatus, cursor, limit } = req.query;
+        const isFreelancer = req.user.role === 'freelancer';
+        
+        let query;
+        if (isFreelancer) {
+            // !inner so a job status filter drops the application rows, not just their job
+            query = supabase
+                .from('job_applications')
+                .select(`id, status, proposed_rate, application_timestamp, job:jobs!inner(${MY_JOB_COLUMNS}, client:users(id, email))`)
+                .eq('freelancer_id', req.user.id);
+            if (status) {
+                query = query.eq('job.status', status);
+            }
+            if (applicationStatus) {
+                query = query.eq('status', applicationStatus);
+            }
+        } else {
+            query = supabase
+                .from('jobs')
+                .select(`${MY_JOB_COLUMNS}, applications:job_applications(count)`)
+                .eq('client_id', req.user.id);
+            if (status) {
+                query = query.eq('status', status);
+            }
+        }
+        
+        const paged = paginateQuery(query, {
+            sortFields: isFreelancer ? MY_APPLICATIONS_SORT_FIELDS : MY_JOBS_SORT_FIELDS,
+            cursor,
+            limit
+        });
+        if (paged.error) {
+            return res.status(400).json({ error: paged.error });
+        }
+        
+        const { data: rows, error } = await paged.query;
+        
+        if (error) {
+            return res.status(400).json({ error: 'Failed to fetch jobs' });
+        }
+        
+        const page = buildPage(rows, paged);
+        const jobs = isFreelancer
+            ? page.rows.filter(row => row.job).map(({ job, ...application }) => ({ ...job, application }))
+            : page.rows.map(({ applications, ...job }) => ({
+                ...job,
+                application_count: applications?.[0]?.count || 0
+            }));
+        
+        res.json({
+            jobs,
+            pagination: {
+                limit: page.limit,
+                nextCursor: page.nextCursor
+            }
+        });
+    } catch (error) {
+        console.error('My jobs fetch error:', error);
+        res.status(500).json({ error: 'Internal server error' });
+    }
+});
+
+// Get job by ID
+router.get('/:id', rateLimitMiddleware(generalRateLimiter), cacheJobDetails, async (req, res) => {
+    try {
+        const { id } = req.params;
+        
+        const { data: job, error } = await jobDetailLookups.do(`${id}:${jobsCache.version}`, () => supabase
+            .from('jobs')
+            .select('*, client:users(*), applications:job_applications(*, freelancer:users(*))')
+            .eq('id', id)
+            .single());
+            
+        if (error) {
+            return res.status(404).json({ error: 'Job not found' });
+        }
+        
+        res.json(job);
+    } catch (error) {
+        console.error('Job fetch error:', error);
+        res.status(500).json({ error: 'Internal server error' });
+    }
+});
+
+// Get chat history for a job (newest page first, paginate with ?cursor=)
+router.get('/:id/messages', authenticateToken, rateLimitMiddleware(generalRateLimiter), async (req, res) => {
+    try {
+        const { id } = req.params;
+        const { cursor, limit } = req.query;
+        
+        if (!(await isJobMember(id, req.user))) {
+            return res.status(403).json({ error: 'Not a participant in this job' });
+        }
+        
+        const page = await fetchMessagePage(id, { cursor, limit });
+        
+        if (page.error) {
+            return res.status(400).json({ error: page.error });
+        }
+        
+        res.json({
+            messages: page.messages,
+            pagination: {
+                limit: page.limit,
+                nextCursor: page.nextCursor
+            }
+        });
+    } catch (error) {
+        console.error('Messages fetch error:', error);
+        res.status(500).json({ error: 'Internal server error' });
+    }
+});
+
+// Mark all of the current user's messages in a job as read up to a timestamp
+router.post('/:id/messages/read', authenticateToken, async (req, res) => {
+    try {
+        const { id } = req.params;
+        const { upTo } = req.body;
+        
+        if (!(await isJobMember(id, req.user))) {
+            return res.status(403).json({ error: 'Not a participant in this job' });
+        }
+        
+        const result = await markReadUpTo(id, req.user.id, upTo);
+        
+        if (result.error) {
+            return res.status(400).json({ error: result.error });
+        }
+        
+        res.json({ message: 'Messages marked as read', updated: result.updated });
+    } catch (error) {
+        console.error('Mark read error:', error);
+        res.status(500).json({ error: 'Internal server error' });
+    }
+});
+
+// Create a new job
+router.post('/', authenticateToken, validateJobPosting, async (req, res) => {
+    try {
+        const { title, description, location, timeline } = req.body;
+        
+        // Check if user already has an active job
+        const { data: activeJobs, error: activeJobsError } = await supabase
+            .from('jobs')
+            .select('*')
+            .eq('client_id', req.user.id)
+            .in('status', ['posted', 'in_progress']);
+            
+        if (activeJobsError) {
             return res.status(400).json({ error: 'Failed to check active jobs' });
         }
-        
-        if (activeJobs && activeJobs.length > 0) {
-            return res.status(400).json({ error: 'You can only have one active job at a time' });
+        
+        if (activeJobs && activeJobs.length > 0) {
+            return res.status(400).json({ error: 'You can only have one active job at a time' });
+        }
+        
+        // Create new job
+        const { data: job, error } = await supabase
+            .from('jobs')
+            .insert([
+                {
+                    client_id: req.user.id,
+                    title,
+                    description,
+                    location,
+                    timeline,
+                    status: 'posted'
+                }
+            ])
+            .select('*, client:users(*)')
+            .single();
+            
+        if (error) {
+            return res.status(400).json({ error: 'Job creation failed' });
+        }
+        
+        jobsCache.invalidate(jobCacheTags.list);
+        
+        // Send notification email to client
+        await sendEmail(
+            req.user.email,
+            emailTemplates.jobPosted(req.user.email, title).subject,
+            emailTemplates.jobPosted(req.user.email, title).text,
+            emailTemplates.jobPosted(req.user.email, title).html
+        );
+        
+        res.status(201).json({ message: 'Job created successfully', job });
+    } catch (error) {
+        console.error('Job creation error:', error);
+        res.status(500).json({ error: 'Internal server error' });
+    }
+});
+
+// Apply to a job (freelancers only)
+router.post('/:id/apply', authenticateToken, async (req, res) => {
+    try {
+        const { id } = req.params;
+        const { proposed_rate } = req.body;
+        
+        // Check if user is a freelancer
+        if (req.user.role !== 'freelancer') {
+            return res.status(403).json({ error: 'Only freelancers can apply to jobs' });
+        }
+        
+        // Check if freelancer has an approved profile
+        const { data: profile, error: profileError } = await supabase
+            .from('freelancer_profiles')
+            .select('*')
+            .eq('user_id', req.user.id)
+            .eq('approval_status', 'approved')
+            .single();
+            
+        if (profileError || !profile) {
+            return res.status(403).json({ error: 'You need an approved freelancer profile to apply to jobs' });
+        }
+        
+        // Check if job exists and is open
+        const { data: job, error: jobError } = await supabase
+            .from('jobs')
+            .select('*, client:users(*)')
+            .eq('id', id)
+            .eq('status', 'posted')
+            .single();
+            
+        if (jobError || !job) {
+            return res.status(404).json({ error: 'Job not found or not open for applications' });
+        }
+        
+        // Check if freelancer has already applied
+        const { data: existingApplication, error: applicationError } = await supabase
+            .from('job_applications')
+            .select('*')
+            .eq('job_id', id)
+            .eq('freelancer_id', req.user.id)
+            .single();
+            
+        if (existingApplication) {
+            return res.status(400).json({ error: 'You have already applied to this job' });
+        }
+        
+        // Create application
+        const { data: application, error } = await supabase
+            .from('job_applications')
+            .insert([
+                {
+                    job_id: id,
+                    freelancer_id: req.user.id,
+                    proposed_rate,
+                    status: 'pending'
+                }
+            ])
+            .select('*, freelancer:users(*)')
+            .single();
+            
+        if (error) {
+            return res.status(400).json({ error: 'Application failed' });
+        }
+        
+        jobsCache.invalidate(jobCacheTags.job(id));
+        
+        // Notify client
+        await sendEmail(
+            job.client.email,
+            emailTemplates.freelancerApplied(
+                job.client.email,
+                req.user.email,
+                job.title
+            ).subject,
+            emailTemplates.freelancerApplied(
+                job.client.email,
+                req.user.email,
+                job.title
+            ).text,
+            emailTemplates.freelancerApplied(
+                job.client.email,
+                req.user.email,
+                job.title
+            ).html
+        );
+        
+        res.status(201).json({ message: 'Application submitted successfully', application });
+    } catch (error) {
+        console.error('Job application error:', error);
+        res.status(500).json({ error: 'Internal server error' });
+    }
+});
+
+// Select a freelancer for a job
+router.post('/:id/select-freelancer/:freelancerId', authenticateToken, async (req, res) => {
+    try {
+        const { id, freelancerId } = req.params;
+        
+        // Check if job exists and belongs to the user
+        const { data: job, error: jobError } = await supabase
+            .from('jobs')
+            .select('*, client:users(*)')
+            .eq('id', id)
+            .eq('client_id', req.user.id)
+            .single();
+            
+        if (jobError || !job) {
+            return res.status(404).json({ error: 'Job not found' });
+        }
+        
+        // Check if freelancer has applied to the job
+        const { data: application, error: applicationError } = await supabase
+            .from('job_applications')
+            .select('*, freelancer:users(*)')
+            .eq('job_id', id)
+            .eq('freelancer_id', freelancerId)
+            .single();
+            
+        if (applicationError || !application) {
+            return res.status(404).json({ error: 'Application not found' });
+        }
+        
+        // Update job status and selected freelancer
+        const { data: updatedJob, error: updateError } = await supabase
+            .from('jobs')
+            .update({
+                status: 'in_progress'
+            })
+            .eq('id', id)
+            .select()
+            .single();
+            
+        if (updateError) {
+            return res.status(400).json({ error: 'Failed to update job' });
+        }
+        
+        // Update application status
+        await supabase
+            .from('job_applications')
+            .update({ status: 'accepted' })
+            .eq('job_id', id)
+            .eq('freelancer_id', freelancerId);
+        invalidateJobMembers(id);
+            
+        // Reject all other applications
+        await supabase
+            .from('job_applications')
+            .update({ status: 'rejected' })
+            .eq('job_id', id)
+            .neq('freelancer_id', freelancerId);
+        
+        jobsCache.invalidate(jobCacheTags.list, jobCacheTags.job(id));
+            
+        // Create transaction record
+        const { data: transaction, error: transactionError } = await supabase
+            .from('transactions')
+            .insert([
+                {
+                    job_id: id,
+                    client_id: req.user.id,
+                    freelancer_id: freelancerId,
+                    amount: application.proposed_rate,
+                    payment_status: 'pending'
+                }
+            ])
+            .select()
+            .single();
+            
+        if (transactionError) {
+            console.error('Transaction creation error:', transactionError);
+        }
+        
+        res.json({ message: 'Freelancer selected successfully', job: updatedJob });
+    } catch (error) {
+        console.error('Freelancer selection error:', error);
+        res.status(500).json({ error: 'Internal server error' });
+    }
+});
+
+// Process payment for a job
+router.post('/:id/payment', authenticateToken, async (req, res) => {
+    try {
+        const { id } = req.params;
+        const { paymentMethod } = req.body;
+        
+        // Check if job exists and belongs to the user
+        const { data: job, error: jobError } = await supabase
+            .from('jobs')
+            .select('*, client:users(*), applications:job_applications(*, freelancer:users(*))')
+            .eq('id', id)
+            .eq('client_id', req.user.id)
+            .single();
+            
+        if (jobError || !job) {
+            return res.status(404).json({ error: 'Job not found' });
+        }
+        
+        // Check if job is in progress
+        if (job.status !== 'in_progress') {
+            return res.status(400).json({ error: 'Job is not in progress' });
+        }
+        
+        // Get the accepted application
+        const acceptedApplication = job.applications.find(app => app.status === 'accepted');
+        if (!acceptedApplication) {
+            return res.status(400).json({ error: 'No accepted application found for this job' });
+        }
+        
+        // Process payment
+        const paymentResult = await processPayment({
+            amount: acceptedApplication.proposed_rate,
+            clientId: req.user.id,
+            freelancerId: acceptedApplication.freelancer_id,
+            jobId: id,
+            paymentMethod
+        });
+        
+        if (!paymentResult.success) {
+            return res.status(400).json({ error: paymentResult.error });
+        }
+        
+        // Update transaction record
+        const { error: updateError } = await supabase
+            .from('transactions')
+            .update({
+                payment_status: 'completed',
+                payment_date: new Date(),
+                payment_reference: paymentResult.paymentReference
+            })
+            .eq('job_id', id);
+            
+        if (updateError) {
+            console.error('Transaction update error:', updateError);
+        }
+        
+        res.json({ message: 'Payment processed successfully', paymentReference: paymentResult.paymentReference });
+    } catch (error) {
+        console.error('Payment processing error:', error);
+        res.status(500).json({ error: 'Internal server error' });
+    }
+});
+
+// Complete a job
+router.post('/:id/complete', authenticateToken, async (req, res) => {
+    try {
+        const { id } = req.params;
+        
+        // Check if job exists and belongs to the user
+        const { data: job, error: jobError } = await supabase
+            .from('jobs')
+            .select('*, client:users(*)')
+            .eq('id', id)
+            .eq('client_id', req.user.id)
+            .single();
+            
+        if (jobError || !job) {
+            return res.status(404).json({ error: 'Job not found' });
+        }
+        
+        // Update job status to completed
+        const { data: updatedJob, error: updateError } = await supabase
+            .from('jobs')
+            .update({
+                status: 'completed',
+                completion_date: new Date(),
+                archive_date: new Date(Date.now() + 24 * 60 * 60 * 1000) // 24 hours from now
+            })
+            .eq('id', id)
+            .select()
+            .single();
+            
+        if (updateError) {
+            return res.status(400).json({ error: 'Failed to complete job' });
+        }
+        
+        jobsCache.invalidate(jobCacheTags.list, jobCacheTags.job(id));
+        
+        res.json({ message: 'Job completed successfully', job: updatedJob });
+    } catch (error) {
+        console.error('Job completion error:', error);
+        res.status(500).json({ error: 'Internal server error' });
+    }
+});
+
+// Admin only: List jobs a page at a time
+// Query: status, client_id, search (title), sort (created_at|status), order (asc|desc), cursor, limit
+router.get('/admin/jobs', authenticateToken, requireAdmin, async (req, res) => {
+    try {
+        const { status, client_id, search, sort, order, cursor, limit } = req.query;
+        
+        let query = supabase
+            .from('jobs')
+            .select(ADMIN_JOB_COLUMNS);
+            
+        if (status) {
+            query = query.eq('status', status);
+        }
+        
+        if (client_id) {
+            query = query.eq('client_id', client_id);
+        }
+        
+        if (search) {
+            query = query.ilike('title', `%${search}%`);
+        }
+        
+        const paged = paginateQuery(query, { sortFields: ADMIN_JOB_SORT_FIELDS, sort, order, cursor, limit });
+        if (paged.error) {
+            return res.status(400).json({ error: paged.error });
+        }
+        
+        const { data: jobs, error } = await paged.query;
+        
+        if (error) {
+            return res.status(400).json({ error: 'Failed to fetch jobs' });
+        }
+        
+        const page = buildPage(jobs, paged);
+        
+        res.json({
+            jobs: page.rows.map(({ applications, ...job }) => ({
+                ...job,
+                application_count: applications?.[0]?.count || 0
+            })),
+            pagination: {
+                limit: page.limit,
+                nextCursor: page.nextCursor
+            }
+        });
+    } catch (error) {
+        console.error('Admin jobs fetch error:', error);
+        res.status(500).json({ error: 'Internal server error' });
+    }
+});
+
+// Admin only: Update job status
+router.put('/admin/jobs/:id', authenticateToken, requireAdmin, async (req, res) => {
+    try {
+        const { id } = req.params;
+        const { status } = req.body;
+        
+        const { data: job, error } = await supabase
+            .from('jobs')
+            .update({ status })
+            .eq('id', id)
+            .select()
+            .single();
+            
+        if (error) {
+            return res.status(400).json({ error: 'Job update failed' });
+        }
+        
+        jobsCache.invalidate(jobCacheTags.list, jobCacheTags.job(id));
+        
+        res.json({ message: 'Job updated successfully', job });
+    } catch (error) {
+        console.error('Job update error:', error);
+        res.status(500).json({ error: 'Internal server error' });
+    }
+});
+
+// Admin only: Delete job
+router.delete('/admin/jobs/:id', authenticateToken, requireAdmin, async (req, res) => {
+    try {
+        const { id } = req.params;
+        
+        const { error } = await supabase
+            .from('jobs')
+            .delete()
+            .eq('id', id);
+            
+        if (error) {
+            return res.status(400).json({ error: 'Job deletion failed' });
+        }
+        
+        jobsCache.invalidate(jobCacheTags.list, jobCacheTags.job(id));
+        
+        res.json({ message: 'Job deleted successfully' });
+    } catch (error) {
+        console.error('Job deletion error:', error);
+        res.status(500).json({ error: 'Internal server error' });
+    }
+});
+
+module.exports = router;
+"""
+    create_file("server/routes/jobs.js", jobs_routes)
+    
+    # Admin routes (platform-wide aggregates)
+    admin_routes = """const express = require('express');
+const router = express.Router();
+const supabase = require('../db/index');
+const { authenticateToken, requireAdmin } = require('../middleware/auth');
+
+// Row count only: head requests return no rows
+const countRows = (table, filters = {}) => {
+    let query = supabase
+        .from(table)
+        .select('id', { count: 'exact', head: true });
+        
+    for (const [column, value] of Object.entries(filters)) {
+        query = query.eq(column, value);
+    }
+    
+    return query.then(({ count, error }) => {
+        if (error) {
+            throw error;
+        }
+        return count || 0;
+    });
+};
+
+// Admin only: Platform totals and daily rollups, read from the
+// trigger-maintained stats tables (one row plus one row per day)
+router.get('/stats', authenticateToken, requireAdmin, async (req, res) => {
+    try {
+        const days = Math.min(Math.max(parseInt(req.query.days) || 30, 1), 366);
+        const since = new Date(Date.now() - (days - 1) * 24 * 60 * 60 * 1000).toISOString().slice(0, 10);
+        
+        const [totalsResult, dailyResult] = await Promise.all([
+            supabase
+                .from('platform_stats')
+                .select('*')
+                .single(),
+            supabase
+                .from('platform_stats_daily')
+                .select('*')
+                .gte('day', since)
+                .order('day', { ascending: true })
+        ]);
+        
+        if (totalsResult.error || dailyResult.error) {
+            return res.status(400).json({ error: 'Failed to fetch platform stats' });
+        }
+        
+        const { id, ...totals } = totalsResult.data;
+        
+        res.json({ totals, daily: dailyResult.data });
+    } catch (error) {
+        console.error('Admin stats fetch error:', error);
+        res.status(500).json({ error: 'Internal server error' });
+    }
+});
+
+// Headline counts in the shape the admin page uses
+const formatCounts = (counts) => ({
+    users: {
+        total: counts.total_users,
+        freelancers: counts.freelancers,
+        admins: counts.admins
+    },
+    jobs: {
+        total: counts.total_jobs,
+        posted: counts.posted_jobs,
+        in_progress: counts.in_progress_jobs,
+        completed: counts.completed_jobs,
+        cancelled: counts.cancelled_jobs
+    },
+    pendingFreelancerProfiles: counts.pending_freelancer_profiles
+});
+
+// Exact recount from the underlying tables: nine COUNT(*) queries whose
+// cost grows with the tables, so only run on request
+const recountRows = async () => {
+    const [
+        total_users,
+        freelancers,
+        admins,
+        total_jobs,
+        posted_jobs,
+        in_progress_jobs,
+        completed_jobs,
+        cancelled_jobs,
+        pending_freelancer_profiles
+    ] = await Promise.all([
+        countRows('users'),
+        countRows('users', { role: 'freelancer' }),
+        countRows('users', { admin_status: true }),
+        countRows('jobs'),
+        countRows('jobs', { status: 'posted' }),
+        countRows('jobs', { status: 'in_progress' }),
+        countRows('jobs', { status: 'completed' }),
+        countRows('jobs', { status: 'cancelled' }),
+        countRows('freelancer_profiles', { approval_status: 'pending' })
+    ]);
+    return {
+        total_users,
+        freelancers,
+        admins,
+        total_jobs,
+        posted_jobs,
+        in_progress_jobs,
+        completed_jobs,
+        cancelled_jobs,
+        pending_freelancer_profiles
+    };
+};
+
+// Admin only: Headline counts from the maintained stats row (one row read).
+// ?exact=true recounts the tables instead, to reconcile the counters.
+router.get('/counts', authenticateToken, requireAdmin, async (req, res) => {
+    try {
+        if (req.query.exact === 'true') {
+            const counts = await recountRows();
+            return res.json({ ...formatCounts(counts), exact: true });
+        }
+        
+        const { data: counts, error } = await supabase
+            .from('platform_stats')
+            .select('total_users, freelancers, admins, total_jobs, posted_jobs, in_progress_jobs, completed_jobs, cancelled_jobs, pending_freelancer_profiles, updated_at')
+            .single();
+            
+        if (error) {
+            return res.status(400).json({ error: 'Failed to fetch counts' });
+        }
+        
+        res.json({ ...formatCounts(counts), exact: false, updatedAt: counts.updated_at });
+    } catch (error) {
+        console.error('Admin counts fetch error:', error);
+        res.status(500).json({ error: 'Internal server error' });
+    }
+});
+
+module.exports = router;
+"""
+    create_file("server/routes/admin.js", admin_routes)
+    
+    # Main server file
+    server_index = """const express = require('express');
+const cors = require('cors');
+const helmet = require('helmet');
+const compression = require('compression');
+const http = require('http');
+const path = require('path');
+const cluster = require('cluster');
+const socketIo = require('socket.io');
+const { setupWorker } = require('@socket.io/sticky');
+const { createAdapter } = require('@socket.io/cluster-adapter');
+require('dotenv').config();
+
+// Import routes
+const userRoutes = require('./routes/users');
+const jobRoutes = require('./routes/jobs');
+const adminRoutes = require('./routes/admin');
+
+// Import middleware
+const { authenticateToken, authenticateSocket } = require('./middleware/auth');
+const { rateLimitMiddleware, generalRateLimiter } = require('./middleware/rateLimit');
+const { serveClientBuild } = require('./middleware/staticClient');
+
+// Import services
+const { messageWriter, resolveMessageId } = require('./services/messageWriter');
+const { fetchMessagePage } = require('./services/chatHistory');
+const { isJobMember } = require('./services/jobMembership');
+const { markReadUpTo } = require('./services/readReceipts');
+const { createSocketFlowControl } = require('./services/socketFlowControl');
+const { jobsCache, jobSearchCache } = require('./services/responseCache');
+const { createGracefulShutdown } = require('./services/gracefulShutdown');
+const { requestTiming } = require('./services/requestTiming');
+const { metricsMiddleware, metricsHandler, bindMetricsSources, chatMessages } = require('./services/metrics');
+
+const app = express();
+const server = http.createServer(app);
+const io = socketIo(server, {
+    cors: {
+        origin: "*",
+        methods: ["GET", "POST"]
+    }
+});
+
+// In cluster mode, room broadcasts are relayed between workers
+if (cluster.isWorker) {
+    io.adapter(createAdapter());
+}
+const flowControl = createSocketFlowControl(io);
+bindMetricsSources({ io, messageWriter });
+
+// Middleware
+app.use(metricsMiddleware);
+app.use(requestTiming());
+// The served client signs in with Google Identity Services (script, popup, iframe)
+app.use(helmet({
+    contentSecurityPolicy: {
+        directives: {
+            scriptSrc: ["'self'", 'https://accounts.google.com'],
+            frameSrc: ["'self'", 'https://accounts.google.com'],
+            connectSrc: ["'self'", 'https://accounts.google.com']
+        }
+    },
+    crossOriginOpenerPolicy: { policy: 'same-origin-allow-popups' }
+}));
+// Compress JSON bodies worth it; static files arrive precompressed
+app.use(compression({
+    threshold: parseInt(process.env.COMPRESSION_THRESHOLD_BYTES) || 1024,
+    filter: (req, res) => /json/.test(res.getHeader('Content-Type') || '') && compression.filter(req, res)
+}));
+// ETag is exposed so a cross-origin client can keep the profile's version stamp
+app.use(cors({ exposedHeaders: ['ETag'] }));
+app.use(express.json({ limit: '10mb' }));
+app.use(express.urlencoded({ extended: true }));
+
+// Health check endpoint (ahead of rate limiting so probes are never throttled)
+app.get('/health', (req, res) => {
+    res.status(200).json({
+        status: 'OK',
+        message: 'Juba server is running',
+        sockets: flowControl.metrics(),
+        jobsCache: jobsCache.stats(),
+        jobSearchCache: jobSearchCache.stats()
+    });
+});
+
+// Prometheus scrape endpoint (per worker; cluster totals come from cluster.js)
+app.get('/metrics', metricsHandler);
+
+// Production client build, served ahead of rate limiting so page assets do
+// not spend the API budget
+if (process.env.SERVE_CLIENT === 'true') {
+    app.use(serveClientBuild({
+        root: process.env.CLIENT_BUILD_DIR || path.join(__dirname, '..', 'client', 'build')
+    }));
+}
+
+// Apply rate limiting to all routes
+app.use(rateLimitMiddleware(generalRateLimiter));
+
+// Routes
+app.use('/api/users', userRoutes);
+app.use('/api/jobs', jobRoutes);
+app.use('/api/admin', adminRoutes);
+
+// Socket.io for real-time messaging
+// Authenticate once at handshake; the user is cached on socket.data
+io.use(authenticateSocket);
+
+io.on('connection', (socket) => {
+    const user = socket.data.user;
+    // Jobs this socket passed the membership check for. Room membership
+    // alone is not enough: every socket is also in a room named after its id.
+    socket.data.jobs = new Set();
+    console.log('User connected:', socket.id, user.id);
+    
+    // Join room for a specific job and send the latest page of history.
+    // Only the job's client and accepted freelancer may join, and a
+    // successful join is what authorises send-message afterwards.
+    socket.on('join-job', async (jobId) => {
+        try {
+            if (!(await isJobMember(jobId, user))) {
+                socket.emit('join-job-denied', { jobId });
+                return;
+            }
+            
+            socket.data.jobs.add(jobId);
+            socket.join(jobId);
+            console.log(`User ${socket.id} joined job room ${jobId}`);
+            
+            const page = await fetchMessagePage(jobId);
+            if (page.error) {
+                console.error('Message history error:', page.error);
+                return;
+            }
+            socket.emit('message-history', { jobId, messages: page.messages, nextCursor: page.nextCursor });
+        } catch (error) {
+            console.error('Join job error:', error);
+        }
+    });
+    
+    // Handle chat messages
+    socket.on('send-message', (data) => {
+        const { jobId, receiverId, content, clientId } = data || {};
+        if (!jobId || !content || !socket.data.jobs.has(jobId)) {
+            return;
+        }
+        
+        // Per-socket and per-room token buckets keep one client from
+        // flooding the writer and every other room on this node
+        chatMessages.inc({ outcome: 'received' });
+        const rejection = flowControl.admitMessage(socket, jobId, content);
+        if (rejection) {
+            chatMessages.inc({ outcome: 'rejected' });
+            socket.emit('message-rejected', { jobId, clientId, ...rejection });
+            return;
+        }
+        
+        const message = {
+            id: resolveMessageId(clientId),
+            job_id: jobId,
+            sender_id: user.id,
+            receiver_id: receiverId,
+            content,
+            timestamp: new Date().toISOString(),
+            read_status: false
+        };
+        
+        // Broadcast optimistically; the row is stored by the next batch insert
+        flowControl.emitToRoom(jobId, 'receive-message', { ...message, pending: true });
+        
+        messageWriter.write(message)
+            .then((saved) => {
+                chatMessages.inc({ outcome: 'saved' });
+                flowControl.emitToRoom(jobId, 'message-saved', saved);
+            })
+            .catch((error) => {
+                console.error('Message save error:', error);
+                chatMessages.inc({ outcome: 'failed' });
+                flowControl.emitToRoom(jobId, 'message-failed', { id: message.id, job_id: jobId });
+            });
+    });
+    
+    // Mark everything received in a job up to a timestamp as read
+    socket.on('mark-read-up-to', async (data, ack) => {
+        const { jobId, upTo } = data || {};
+        const reply = typeof ack === 'function' ? ack : () => {};
+        if (!jobId || !socket.data.jobs.has(jobId)) {
+            return reply({ error: 'Join the job room first' });
+        }
+        
+        try {
+            const result = await markReadUpTo(jobId, user.id, upTo);
+            if (!result.error && result.updated > 0) {
+                socket.to(jobId).emit('messages-read', { jobId, readerId: user.id, upTo });
+            }
+            reply(result);
+        } catch (error) {
+            console.error('Mark read error:', error);
+            reply({ error: 'Failed to mark messages as read' });
+        }
+    });
+    
+    socket.on('disconnect', () => {
+        console.log('User disconnected:', socket.id);
+    });
+});
+
+// Error handling middleware
+app.use((err, req, res, next) => {
+    console.error(err.stack);
+    res.status(500).json({ error: 'Something went wrong!' });
+});
+
+// 404 handler
+app.use('*', (req, res) => {
+    res.status(404).json({ error: 'Route not found' });
+});
+
+const PORT = process.env.PORT || 5000;
+
+// Drain connections and flush queued chat messages before exiting
+const shutdown = createGracefulShutdown({
+    server,
+    io,
+    timeoutMs: parseInt(process.env.SHUTDOWN_TIMEOUT_MS) || 10000,
+    beforeExit: () => messageWriter.close()
+});
+process.on('SIGTERM', () => shutdown('SIGTERM'));
+process.on('SIGINT', () => shutdown('SIGINT'));
+
+if (cluster.isWorker) {
+    // Started by cluster.js: the primary owns the port and passes
+    // connections in, so the worker does not listen itself
+    setupWorker(io);
+    process.on('message', (message) => {
+        if (message?.type === 'juba:shutdown') {
+            shutdown('cluster');
+        }
+    });
+    process.send({ type: 'juba:ready' });
+} else {
+    server.listen(PORT, () => {
+        console.log(`Server running on port ${PORT}`);
+    });
+}
+
+module.exports = app;
+"""
+    create_file("server/index.js", server_index)
+    
+    # Cluster launcher (one worker per CPU behind a shared port)
+    cluster_launcher = """const cluster = require('cluster');
+const http = require('http');
+const os = require('os');
+const { setupMaster } = require('@socket.io/sticky');
+const { setupPrimary } = require('@socket.io/cluster-adapter');
+const { RateLimiterClusterMaster } = require('rate-limiter-flexible');
+const { AggregatorRegistry } = require('prom-client');
+require('dotenv').config();
+
+const { MESSAGE_TYPE } = require('./services/clusterBus');
+
+const PORT = process.env.PORT || 5000;
+const WORKERS = parseInt(process.env.CLUSTER_WORKERS) || os.cpus().length;
+const SHUTDOWN_TIMEOUT_MS = parseInt(process.env.SHUTDOWN_TIMEOUT_MS) || 10000;
+const METRICS_PORT = parseInt(process.env.METRICS_PORT) || 9464;
+
+cluster.setupPrimary({
+    exec: require.resolve('./index'),
+    serialization: 'advanced'
+});
+
+// The primary owns the port and hands each connection to a worker, keeping
+// socket.io sessions on the worker that created them
+const server = http.createServer();
+setupMaster(server, { loadBalancingMethod: 'least-connection' });
+setupPrimary();
+new RateLimiterClusterMaster();
+
+// Cluster-wide /metrics: the primary asks every worker for its registry and
+// sums the results, so one scrape covers the whole node
+const metricsRegistry = new AggregatorRegistry();
+const metricsServer = http.createServer(async (req, res) => {
+    const token = process.env.METRICS_TOKEN;
+    if (req.url !== '/metrics') {
+        res.writeHead(404).end();
+        return;
+    }
+    if (token && req.headers['authorization'] !== `Bearer ${token}`) {
+        res.writeHead(401).end();
+        return;
+    }
+
+    try {
+        const body = await metricsRegistry.clusterMetrics();
+        res.writeHead(200, { 'Content-Type': metricsRegistry.contentType }).end(body);
+    } catch (error) {
+        console.error('Cluster metrics error:', error);
+        res.writeHead(500).end();
+    }
+});
+
+let shuttingDown = false;
+let restarting = false;
+const retiring = new Set();
+
+// Resolves once the worker reports ready, or exits before doing so
+const waitUntilReady = (worker) => new Promise((resolve) => {
+    const onMessage = (message) => {
+        if (message?.type === 'juba:ready') {
+            worker.off('message', onMessage);
+            resolve();
+        }
+    };
+    worker.on('message', onMessage);
+    worker.once('exit', resolve);
+});
+
+const forkWorker = () => {
+    const worker = cluster.fork();
+
+    // Relay cache invalidations to every other worker
+    worker.on('message', (message) => {
+        if (message?.type !== MESSAGE_TYPE) {
+            return;
+        }
+        for (const other of Object.values(cluster.workers)) {
+            if (other !== worker && other.isConnected()) {
+                other.send(message);
+            }
         }
-        
-        // Create new job
-        const { data: job, error } = await supabase
-            .from('jobs')
-            .insert([
-                {
-                    client_id: req.user.id,
-                    title,
-                    description,
-                    location,
-                    timeline,
-                    status: 'posted'
-                }
-            ])
-            .select('*, client:users(*)')
-            .single();
-            
-        if (error) {
-            return res.status(400).json({ error: 'Job creation failed' });
+    });
+
+    return worker;
+};
+
+// Ask a worker to drain and wait for it to exit
+const stopWorker = (worker) => new Promise((resolve) => {
+    retiring.add(worker.id);
+    worker.once('exit', resolve);
+
+    if (worker.isConnected()) {
+        worker.send({ type: 'juba:shutdown' });
+    }
+    setTimeout(() => worker.process.kill('SIGKILL'), SHUTDOWN_TIMEOUT_MS + 1000).unref();
+});
+
+// Replace workers one at a time, starting each replacement before the
+// old worker drains so capacity never drops by more than one worker
+const rollingRestart = async () => {
+    if (restarting || shuttingDown) {
+        return;
+    }
+    restarting = true;
+    console.log('Rolling restart started');
+
+    for (const worker of Object.values(cluster.workers)) {
+        if (shuttingDown) {
+            break;
         }
-        
-        // Send notification email to client
-        await sendEmail(
-            req.user.email,
-            emailTemplates.jobPosted(req.user.email, title).subject,
-            emailTemplates.jobPosted(req.user.email, title).text,
-            emailTemplates.jobPosted(req.user.email, title).html
-        );
-        
-        res.status(201).json({ message: 'Job created successfully', job });
-    } catch (error) {
-        console.error('Job creation error:', error);
-        res.status(500).json({ error: 'Internal server error' });
+        const replacement = forkWorker();
+        await waitUntilReady(replacement);
+        await stopWorker(worker);
+    }
+
+    restarting = false;
+    console.log('Rolling restart finished');
+};
+
+const shutdown = async (signal) => {
+    if (shuttingDown) {
+        return;
+    }
+    shuttingDown = true;
+    console.log(`Primary received ${signal}, stopping ${Object.keys(cluster.workers).length} workers`);
+
+    server.close();
+    metricsServer.close();
+    await Promise.all(Object.values(cluster.workers).map(stopWorker));
+    process.exit(0);
+};
+
+cluster.on('exit', (worker, code, signal) => {
+    if (retiring.delete(worker.id) || shuttingDown) {
+        return;
     }
+    console.error(`Worker ${worker.process.pid} died (${signal || code}), starting a replacement`);
+    forkWorker();
 });
 
-// Apply to a job (freelancers only)
-router.post('/:id/apply', authenticateToken, async (req, res) => {
-    try {
-        const { id } = req.params;
-        const { proposed_rate } = req.body;
-        
-        // Check if user is a freelancer
-        if (req.user.role !== 'freelancer') {
-            return res.status(403).json({ error: 'Only freelancers can apply to jobs' });
+process.on('SIGHUP', rollingRestart);
+process.on('SIGTERM', () => shutdown('SIGTERM'));
+process.on('SIGINT', () => shutdown('SIGINT'));
+
+for (let i = 0; i < WORKERS; i++) {
+    forkWorker();
+}
+
+server.listen(PORT, () => {
+    console.log(`Primary ${process.pid} listening on port ${PORT} with ${WORKERS} workers`);
+});
+metricsServer.listen(METRICS_PORT, () => {
+    console.log(`Cluster metrics on port ${METRICS_PORT}`);
+});
+"""
+    create_file("server/cluster.js", cluster_launcher)
+    
+    # Chat message write benchmark (per-message inserts vs batched writer)
+    message_benchmark = """// Compares one insert per chat message against the batching MessageWriter.
+// Uses a simulated database with a fixed connection pool and round-trip
+// latency so it runs without a Supabase project:
+//   node bench/messageWriter.js [messages] [rttMs] [poolSize]
+const { MessageWriter, resolveMessageId } = require('../server/services/messageWriter');
+
+const TOTAL_MESSAGES = parseInt(process.argv[2]) || 5000;
+const RTT_MS = parseInt(process.argv[3]) || 4;
+const POOL_SIZE = parseInt(process.argv[4]) || 10;
+const PER_ROW_MS = 0.02;
+
+// Minimal stand-in for supabase.from('messages').insert(rows).select()
+const createSimulatedDb = () => {
+    let active = 0;
+    const waiting = [];
+    const stats = { queries: 0 };
+
+    const acquire = () => new Promise((resolve) => {
+        if (active < POOL_SIZE) {
+            active += 1;
+            resolve();
+        } else {
+            waiting.push(resolve);
         }
-        
-        // Check if freelancer has an approved profile
-        const { data: profile, error: profileError } = await supabase
-            .from('freelancer_profiles')
-            .select('*')
-            .eq('user_id', req.user.id)
-            .eq('approval_status', 'approved')
-            .single();
-            
-        if (profileError || !profile) {
-            return res.status(403).json({ error: 'You need an approved freelancer profile to apply to jobs' });
+    });
+
+    const release = () => {
+        const next = waiting.shift();
+        if (next) {
+            next();
+        } else {
+            active -= 1;
         }
-        
-        // Check if job exists and is open
-        const { data: job, error: jobError } = await supabase
-            .from('jobs')
-            .select('*, client:users(*)')
-            .eq('id', id)
-            .eq('status', 'posted')
-            .single();
-            
-        if (jobError || !job) {
-            return res.status(404).json({ error: 'Job not found or not open for applications' });
+    };
+
+    const runQuery = async (rows) => {
+        await acquire();
+        stats.queries += 1;
+        await new Promise(resolve => setTimeout(resolve, RTT_MS + rows.length * PER_ROW_MS));
+        release();
+        return { data: rows, error: null };
+    };
+
+    return {
+        stats,
+        from: () => ({
+            insert: (rows) => {
+                const query = {
+                    select: () => query,
+                    single: () => runQuery(rows).then(({ data, error }) => ({ data: data[0], error })),
+                    then: (resolve, reject) => runQuery(rows).then(resolve, reject)
+                };
+                return query;
+            }
+        })
+    };
+};
+
+const makeMessage = (i) => ({
+    id: resolveMessageId(),
+    job_id: `job-${i % 20}`,
+    sender_id: 'sender',
+    receiver_id: 'receiver',
+    content: `message ${i}`,
+    timestamp: new Date().toISOString(),
+    read_status: false
+});
+
+const benchUnbatched = async () => {
+    const db = createSimulatedDb();
+    const start = process.hrtime.bigint();
+    await Promise.all(Array.from({ length: TOTAL_MESSAGES }, (_, i) =>
+        db.from('messages').insert([makeMessage(i)]).select().single()
+    ));
+    return { elapsedMs: Number(process.hrtime.bigint() - start) / 1e6, queries: db.stats.queries };
+};
+
+const benchBatched = async () => {
+    const db = createSimulatedDb();
+    const writer = new MessageWriter({ db });
+    const start = process.hrtime.bigint();
+    await Promise.all(Array.from({ length: TOTAL_MESSAGES }, (_, i) => writer.write(makeMessage(i))));
+    return { elapsedMs: Number(process.hrtime.bigint() - start) / 1e6, queries: db.stats.queries };
+};
+
+const report = (label, { elapsedMs, queries }) => {
+    const throughput = Math.round(TOTAL_MESSAGES / (elapsedMs / 1000));
+    console.log(`${label.padEnd(12)} ${String(throughput).padStart(8)} msg/s  ${String(queries).padStart(6)} queries  ${elapsedMs.toFixed(1)} ms`);
+};
+
+const main = async () => {
+    console.log(`${TOTAL_MESSAGES} messages, ${RTT_MS} ms round trip, pool of ${POOL_SIZE}`);
+    report('unbatched', await benchUnbatched());
+    report('batched', await benchBatched());
+};
+
+main().catch((error) => {
+    console.error(error);
+    process.exit(1);
+});
+"""
+    create_file("bench/messageWriter.js", message_benchmark)
+    
+    # Cluster scaling benchmark (requests/s by worker count)
+    cluster_benchmark = """// Measures requests/s through server/cluster.js for increasing worker
+// counts. Each run starts the cluster on its own port, waits for /health,
+// then drives keep-alive load from worker threads. The load generator
+// shares the machine's CPUs, so compare runs rather than absolute numbers.
+//   node bench/cluster.js [seconds] [connections] [path]
+const { spawn } = require('child_process');
+const { Worker, isMainThread, parentPort, workerData } = require('worker_threads');
+const http = require('http');
+const os = require('os');
+const path = require('path');
+
+const DURATION_SECONDS = parseInt(process.argv[2]) || 10;
+const CONNECTIONS = parseInt(process.argv[3]) || 64;
+const TARGET_PATH = process.argv[4] || '/health';
+const LOAD_THREADS = Math.min(4, os.cpus().length);
+const BASE_PORT = 5400;
+
+const request = (agent, port) => new Promise((resolve) => {
+    const req = http.get({ host: '127.0.0.1', port, path: TARGET_PATH, agent }, (res) => {
+        res.resume();
+        res.on('end', () => resolve(res.statusCode < 500));
+    });
+    req.on('error', () => resolve(false));
+});
+
+// Load thread: keep `connections` requests in flight until the deadline
+const runLoad = async ({ port, connections, deadline }) => {
+    const agent = new http.Agent({ keepAlive: true, maxSockets: connections });
+    let completed = 0;
+    let failed = 0;
+
+    await Promise.all(Array.from({ length: connections }, async () => {
+        while (Date.now() < deadline) {
+            if (await request(agent, port)) {
+                completed += 1;
+            } else {
+                failed += 1;
+            }
         }
-        
-        // Check if freelancer has already applied
-        const { data: existingApplication, error: applicationError } = await supabase
-            .from('job_applications')
-            .select('*')
-            .eq('job_id', id)
-            .eq('freelancer_id', req.user.id)
-            .single();
-            
-        if (existingApplication) {
-            return res.status(400).json({ error: 'You have already applied to this job' });
+    }));
+
+    agent.destroy();
+    parentPort.postMessage({ completed, failed });
+};
+
+const sleep = (ms) => new Promise(resolve => setTimeout(resolve, ms));
+
+const waitForServer = async (port) => {
+    for (let attempt = 0; attempt < 100; attempt++) {
+        if (await request(undefined, port)) {
+            return;
         }
-        
-        // Create application
-        const { data: application, error } = await supabase
-            .from('job_applications')
-            .insert([
-                {
-                    job_id: id,
-                    freelancer_id: req.user.id,
-                    proposed_rate,
-                    status: 'pending'
-                }
-            ])
-            .select('*, freelancer:users(*)')
-            .single();
-            
-        if (error) {
-            return res.status(400).json({ error: 'Application failed' });
+        await sleep(100);
+    }
+    throw new Error(`Server on port ${port} did not become ready`);
+};
+
+const startCluster = (workers, port) => {
+    return spawn(process.execPath, [path.join(__dirname, '../server/cluster.js')], {
+        env: {
+            ...process.env,
+            CLUSTER_WORKERS: String(workers),
+            PORT: String(port),
+            METRICS_PORT: String(port + 1000),
+            SUPABASE_URL: process.env.SUPABASE_URL || 'http://127.0.0.1:54321',
+            SUPABASE_ANON_KEY: process.env.SUPABASE_ANON_KEY || 'bench',
+            JWT_SECRET: process.env.JWT_SECRET || 'bench'
+        },
+        stdio: 'ignore'
+    });
+};
+
+const measure = async (workers, port) => {
+    const child = startCluster(workers, port);
+    try {
+        await waitForServer(port);
+        await sleep(500); // let the remaining workers finish booting
+
+        const deadline = Date.now() + DURATION_SECONDS * 1000;
+        const perThread = Math.max(1, Math.floor(CONNECTIONS / LOAD_THREADS));
+        const results = await Promise.all(Array.from({ length: LOAD_THREADS }, () => new Promise((resolve, reject) => {
+            const thread = new Worker(__filename, { workerData: { port, connections: perThread, deadline } });
+            thread.once('message', resolve);
+            thread.once('error', reject);
+        })));
+
+        const completed = results.reduce((sum, result) => sum + result.completed, 0);
+        const failed = results.reduce((sum, result) => sum + result.failed, 0);
+        return { requestsPerSecond: Math.round(completed / DURATION_SECONDS), failed };
+    } finally {
+        child.kill('SIGTERM');
+        await new Promise(resolve => child.once('exit', resolve));
+    }
+};
+
+const workerCounts = () => {
+    const counts = [];
+    for (let workers = 1; workers < os.cpus().length; workers *= 2) {
+        counts.push(workers);
+    }
+    counts.push(os.cpus().length);
+    return counts;
+};
+
+const main = async () => {
+    console.log(`GET ${TARGET_PATH}, ${CONNECTIONS} connections, ${DURATION_SECONDS}s per run, ${os.cpus().length} CPUs`);
+
+    let baseline = null;
+    for (const [index, workers] of workerCounts().entries()) {
+        const { requestsPerSecond, failed } = await measure(workers, BASE_PORT + index);
+        baseline = baseline || requestsPerSecond;
+        const scaling = (requestsPerSecond / baseline).toFixed(2);
+        console.log(`${String(workers).padStart(3)} workers  ${String(requestsPerSecond).padStart(8)} req/s  x${scaling}  ${failed} failed`);
+    }
+};
+
+if (isMainThread) {
+    main().catch((error) => {
+        console.error(error);
+        process.exit(1);
+    });
+} else {
+    runLoad(workerData);
+}
+"""
+    create_file("bench/cluster.js", cluster_benchmark)
+    
+    # End-to-end load test against the in-memory database
+    load_test = """// End-to-end load test for the API and chat. Seeds the in-memory database
+// (DB_BACKEND=memory, see server/db/memory.js), starts server/index.js
+// against it, then runs a weighted mix of browse, search, profile, history,
+// apply and select-freelancer flows from virtual users while socket.io
+// pairs chat in their job rooms. Prints throughput and p50/p95/p99 per
+// endpoint and writes the numbers to bench/results/ for later comparison.
+//   node bench/loadtest.js [seconds] [virtualUsers] [chatRooms]
+//   node bench/loadtest.js compare <before.json> <after.json>
+const { spawn } = require('child_process');
+const crypto = require('crypto');
+const fs = require('fs');
+const net = require('net');
+const os = require('os');
+const path = require('path');
+const jwt = require('jsonwebtoken');
+const { io: connectSocket } = require('socket.io-client');
+
+const DURATION_SECONDS = parseInt(process.argv[2]) || 30;
+const VIRTUAL_USERS = parseInt(process.argv[3]) || 50;
+const CHAT_ROOMS = parseInt(process.argv[4]) || 20;
+const CHAT_INTERVAL_MS = 250;
+const JWT_SECRET = 'loadtest';
+const RESULTS_DIR = path.join(__dirname, 'results');
+
+const SEED_SIZES = {
+    clients: 2000,
+    freelancers: 500,
+    postedJobs: 3000,
+    selectableJobs: 1000,
+    activeJobs: 500,
+    messagesPerActiveJob: 40
+};
+
+// Relative weight of each flow in the virtual user mix
+const SCENARIO_WEIGHTS = {
+    browse: 40,
+    search: 15,
+    profile: 10,
+    history: 15,
+    apply: 12,
+    select: 8,
+    admin: 2
+};
+
+const WORDS = ['plumbing', 'painting', 'garden', 'electrical', 'roof', 'tiling', 'cleaning', 'moving', 'carpentry', 'welding'];
+const TOWNS = ['Juba Central', 'Gudele Block', 'Munuki Market', 'Kator Hills', 'Hai Malakal'];
+
+const pick = items => items[Math.floor(Math.random() * items.length)];
+const daysAgo = days => new Date(Date.now() - days * 24 * 60 * 60 * 1000).toISOString();
+
+// Seed rows plus the handles each scenario draws from
+const buildSeed = () => {
+    const users = [];
+    const profiles = [];
+    const jobs = [];
+    const applications = [];
+    const messages = [];
+    const fixtures = { clients: [], freelancers: [], postedJobs: [], selectable: [], activeJobs: [], admin: null };
+
+    const addUser = (role, i) => {
+        const user = {
+            id: crypto.randomUUID(),
+            google_id: `${role}-${i}`,
+            email: `${role}${i}@loadtest.example`,
+            phone: `+211900${String(i).padStart(6, '0')}`,
+            address: pick(TOWNS),
+            role,
+            admin_status: false,
+            profile_completion_status: true,
+            verification_status: true,
+            created_at: daysAgo(Math.random() * 365)
+        };
+        users.push(user);
+        return user;
+    };
+
+    const addJob = (client, status) => {
+        const job = {
+            id: crypto.randomUUID(),
+            client_id: client.id,
+            title: `${pick(WORDS)} job in ${pick(TOWNS)}`,
+            description: `Looking for help with ${pick(WORDS)} and ${pick(WORDS)} this week.`,
+            location: pick(TOWNS),
+            status,
+            timeline: 'This week',
+            created_at: daysAgo(Math.random() * 90)
+        };
+        jobs.push(job);
+        return job;
+    };
+
+    const addApplication = (job, freelancer, status) => {
+        applications.push({
+            id: crypto.randomUUID(),
+            job_id: job.id,
+            freelancer_id: freelancer.id,
+            proposed_rate: 50 + Math.round(Math.random() * 450),
+            status,
+            application_timestamp: job.created_at
+        });
+    };
+
+    fixtures.admin = addUser('admin', 0);
+    fixtures.admin.admin_status = true;
+    for (let i = 0; i < SEED_SIZES.clients; i++) {
+        fixtures.clients.push(addUser('client', i));
+    }
+    for (let i = 0; i < SEED_SIZES.freelancers; i++) {
+        const freelancer = addUser('freelancer', i);
+        fixtures.freelancers.push(freelancer);
+        profiles.push({
+            id: crypto.randomUUID(),
+            user_id: freelancer.id,
+            bio: `Experienced in ${pick(WORDS)} and ${pick(WORDS)}.`,
+            experience_years: 1 + Math.floor(Math.random() * 15),
+            approval_status: 'approved'
+        });
+    }
+
+    for (let i = 0; i < SEED_SIZES.postedJobs; i++) {
+        fixtures.postedJobs.push(addJob(pick(fixtures.clients), 'posted'));
+    }
+
+    // Each selectable job has one pending application for its client to accept
+    for (let i = 0; i < SEED_SIZES.selectableJobs; i++) {
+        const client = fixtures.clients[i % fixtures.clients.length];
+        const freelancer = pick(fixtures.freelancers);
+        const job = addJob(client, 'posted');
+        addApplication(job, freelancer, 'pending');
+        fixtures.selectable.push({ job, client, freelancer });
+    }
+
+    for (let i = 0; i < SEED_SIZES.activeJobs; i++) {
+        const client = pick(fixtures.clients);
+        const freelancer = pick(fixtures.freelancers);
+        const job = addJob(client, 'in_progress');
+        addApplication(job, freelancer, 'accepted');
+        fixtures.activeJobs.push({ job, client, freelancer });
+
+        for (let m = 0; m < SEED_SIZES.messagesPerActiveJob; m++) {
+            const fromClient = m % 2 === 0;
+            messages.push({
+                id: crypto.randomUUID(),
+                job_id: job.id,
+                sender_id: fromClient ? client.id : freelancer.id,
+                receiver_id: fromClient ? freelancer.id : client.id,
+                content: `Seed message ${m}`,
+                timestamp: daysAgo((SEED_SIZES.messagesPerActiveJob - m) / 24),
+                read_status: m < SEED_SIZES.messagesPerActiveJob - 3
+            });
         }
-        
-        // Notify client
-        await sendEmail(
-            job.client.email,
-            emailTemplates.freelancerApplied(
-                job.client.email,
-                req.user.email,
-                job.title
-            ).subject,
-            emailTemplates.freelancerApplied(
-                job.client.email,
-                req.user.email,
-                job.title
-            ).text,
-            emailTemplates.freelancerApplied(
-                job.client.email,
-                req.user.email,
-                job.title
-            ).html
-        );
-        
-        res.status(201).json({ message: 'Application submitted successfully', application });
-    } catch (error) {
-        console.error('Job application error:', error);
-        res.status(500).json({ error: 'Internal server error' });
     }
+
+    return {
+        seed: { users, freelancer_profiles: profiles, jobs, job_applications: applications, messages },
+        fixtures
+    };
+};
+
+const tokenFor = user => jwt.sign(
+    { id: user.id, email: user.email, role: user.role, admin_status: user.admin_status },
+    JWT_SECRET,
+    { expiresIn: '1h' }
+);
+
+const freePort = () => new Promise((resolve, reject) => {
+    const probe = net.createServer();
+    probe.once('error', reject);
+    probe.listen(0, () => {
+        const { port } = probe.address();
+        probe.close(() => resolve(port));
+    });
 });
 
-// Select a freelancer for a job
-router.post('/:id/select-freelancer/:freelancerId', authenticateToken, async (req, res) => {
-    try {
-        const { id, freelancerId } = req.params;
-        
-        // Check if job exists and belongs to the user
-        const { data: job, error: jobError } = await supabase
-            .from('jobs')
-            .select('*, client:users(*)')
-            .eq('id', id)
-            .eq('client_id', req.user.id)
-            .single();
-            
-        if (jobError || !job) {
-            return res.status(404).json({ error: 'Job not found' });
+const sleep = ms => new Promise(resolve => setTimeout(resolve, ms));
+
+const startServer = async (seedPath, port) => {
+    const child = spawn(process.execPath, [path.join(__dirname, '../server/index.js')], {
+        env: {
+            ...process.env,
+            PORT: String(port),
+            DB_BACKEND: 'memory',
+            MEMORY_DB_SEED: seedPath,
+            JWT_SECRET,
+            EMAIL_TRANSPORT: 'json',
+            RATE_LIMIT_POINTS: '1000000000',
+            AUTH_RATE_LIMIT_POINTS: '1000000000',
+            SOCKET_MESSAGE_RATE: '1000',
+            SOCKET_MESSAGE_BURST: '1000',
+            ROOM_MESSAGE_RATE: '1000',
+            ROOM_MESSAGE_BURST: '1000',
+            SLOW_REQUEST_MS: '60000'
+        },
+        stdio: ['ignore', 'ignore', 'inherit']
+    });
+
+    for (let attempt = 0; attempt < 100; attempt++) {
+        try {
+            const response = await fetch(`http://127.0.0.1:${port}/health`);
+            if (response.ok) {
+                return child;
+            }
+        } catch (error) {
+            // not listening yet
         }
-        
-        // Check if freelancer has applied to the job
-        const { data: application, error: applicationError } = await supabase
-            .from('job_applications')
-            .select('*, freelancer:users(*)')
-            .eq('job_id', id)
-            .eq('freelancer_id', freelancerId)
-            .single();
-            
-        if (applicationError || !application) {
-            return res.status(404).json({ error: 'Application not found' });
+        await sleep(100);
+    }
+    child.kill('SIGKILL');
+    throw new Error('Server did not become ready');
+};
+
+// Per-endpoint latency samples and outcome counts
+class Recorder {
+    constructor() {
+        this.endpoints = new Map();
+    }
+
+    record(endpoint, durationMs, ok, status) {
+        let entry = this.endpoints.get(endpoint);
+        if (!entry) {
+            entry = { samples: [], errors: 0, statuses: {} };
+            this.endpoints.set(endpoint, entry);
         }
-        
-        // Update job status and selected freelancer
-        const { data: updatedJob, error: updateError } = await supabase
-            .from('jobs')
-            .update({
-                status: 'in_progress'
-            })
-            .eq('id', id)
-            .select()
-            .single();
-            
-        if (updateError) {
-            return res.status(400).json({ error: 'Failed to update job' });
+        entry.samples.push(durationMs);
+        entry.statuses[status] = (entry.statuses[status] || 0) + 1;
+        if (!ok) {
+            entry.errors += 1;
         }
-        
-        // Update application status
-        await supabase
-            .from('job_applications')
-            .update({ status: 'accepted' })
-            .eq('job_id', id)
-            .eq('freelancer_id', freelancerId);
-            
-        // Reject all other applications
-        await supabase
-            .from('job_applications')
-            .update({ status: 'rejected' })
-            .eq('job_id', id)
-            .neq('freelancer_id', freelancerId);
-            
-        // Create transaction record
-        const { data: transaction, error: transactionError } = await supabase
-            .from('transactions')
-            .insert([
-                {
-                    job_id: id,
-                    client_id: req.user.id,
-                    freelancer_id: freelancerId,
-                    amount: application.proposed_rate,
-                    payment_status: 'pending'
-                }
-            ])
-            .select()
-            .single();
-            
-        if (transactionError) {
-            console.error('Transaction creation error:', transactionError);
+    }
+
+    summary(elapsedSeconds) {
+        const percentile = (sorted, p) => sorted[Math.min(sorted.length - 1, Math.floor(sorted.length * p))];
+        const result = {};
+        for (const [endpoint, entry] of [...this.endpoints].sort(([a], [b]) => a.localeCompare(b))) {
+            const sorted = entry.samples.sort((a, b) => a - b);
+            result[endpoint] = {
+                requests: sorted.length,
+                errors: entry.errors,
+                throughput: Number((sorted.length / elapsedSeconds).toFixed(1)),
+                p50: Number(percentile(sorted, 0.5).toFixed(2)),
+                p95: Number(percentile(sorted, 0.95).toFixed(2)),
+                p99: Number(percentile(sorted, 0.99).toFixed(2)),
+                statuses: entry.statuses
+            };
         }
-        
-        res.json({ message: 'Freelancer selected successfully', job: updatedJob });
-    } catch (error) {
-        console.error('Freelancer selection error:', error);
-        res.status(500).json({ error: 'Internal server error' });
+        return result;
     }
-});
+}
 
-// Process payment for a job
-router.post('/:id/payment', authenticateToken, async (req, res) => {
-    try {
-        const { id } = req.params;
-        const { paymentMethod } = req.body;
-        
-        // Check if job exists and belongs to the user
-        const { data: job, error: jobError } = await supabase
-            .from('jobs')
-            .select('*, client:users(*), applications:job_applications(*, freelancer:users(*))')
-            .eq('id', id)
-            .eq('client_id', req.user.id)
-            .single();
-            
-        if (jobError || !job) {
-            return res.status(404).json({ error: 'Job not found' });
+// Scenario flows; each step names the endpoint it is reported under
+const createScenarios = ({ baseUrl, fixtures, recorder }) => {
+    const request = async (endpoint, urlPath, { method = 'GET', token, body, expected = [] } = {}) => {
+        const headers = { 'Content-Type': 'application/json' };
+        if (token) {
+            headers.Authorization = `Bearer ${token}`;
         }
-        
-        // Check if job is in progress
-        if (job.status !== 'in_progress') {
-            return res.status(400).json({ error: 'Job is not in progress' });
+
+        const start = performance.now();
+        try {
+            const response = await fetch(`${baseUrl}${urlPath}`, {
+                method,
+                headers,
+                body: body ? JSON.stringify(body) : undefined
+            });
+            const payload = await response.text();
+            const ok = response.ok || response.status === 304 || expected.includes(response.status);
+            recorder.record(endpoint, performance.now() - start, ok, response.status);
+            return ok && payload ? JSON.parse(payload) : null;
+        } catch (error) {
+            recorder.record(endpoint, performance.now() - start, false, 'network');
+            return null;
         }
-        
-        // Get the accepted application
-        const acceptedApplication = job.applications.find(app => app.status === 'accepted');
-        if (!acceptedApplication) {
-            return res.status(400).json({ error: 'No accepted application found for this job' });
+    };
+
+    const tokens = new Map();
+    const token = (user) => {
+        if (!tokens.has(user.id)) {
+            tokens.set(user.id, tokenFor(user));
         }
-        
-        // Process payment
-        const paymentResult = await processPayment({
-            amount: acceptedApplication.proposed_rate,
-            clientId: req.user.id,
-            freelancerId: acceptedApplication.freelancer_id,
-            jobId: id,
-            paymentMethod
-        });
-        
-        if (!paymentResult.success) {
-            return res.status(400).json({ error: paymentResult.error });
+        return tokens.get(user.id);
+    };
+
+    // Unused (freelancer, job) pairs so applies exercise the insert path
+    let applyCursor = 0;
+    const nextApplyPair = () => {
+        const job = fixtures.postedJobs[applyCursor % fixtures.postedJobs.length];
+        const freelancer = fixtures.freelancers[Math.floor(applyCursor / fixtures.postedJobs.length) % fixtures.freelancers.length];
+        applyCursor += 1;
+        return { job, freelancer };
+    };
+    let selectCursor = 0;
+
+    return {
+        browse: async () => {
+            const list = await request('GET /api/jobs', `/api/jobs?page=${1 + Math.floor(Math.random() * 5)}&limit=10`);
+            const job = list?.jobs?.length ? pick(list.jobs) : pick(fixtures.postedJobs);
+            await request('GET /api/jobs/:id', `/api/jobs/${job.id}`);
+        },
+        search: async () => {
+            await request('GET /api/jobs/search', `/api/jobs/search?status=posted&q=${pick(WORDS)}`);
+        },
+        profile: async () => {
+            const user = pick(Math.random() < 0.5 ? fixtures.clients : fixtures.freelancers);
+            await request('GET /api/users/profile', '/api/users/profile', { token: token(user) });
+            await request('GET /api/users/unread-counts', '/api/users/unread-counts', { token: token(user) });
+            await request('GET /api/jobs/mine', '/api/jobs/mine', { token: token(user) });
+        },
+        history: async () => {
+            const { job, client } = pick(fixtures.activeJobs);
+            await request('GET /api/jobs/:id/messages', `/api/jobs/${job.id}/messages?limit=20`, { token: token(client) });
+        },
+        apply: async () => {
+            const { job, freelancer } = nextApplyPair();
+            await request('POST /api/jobs/:id/apply', `/api/jobs/${job.id}/apply`, {
+                method: 'POST',
+                token: token(freelancer),
+                body: { proposed_rate: 100 + Math.round(Math.random() * 400) },
+                // Once every pair has been used the route answers "already applied"
+                expected: [400]
+            });
+        },
+        select: async () => {
+            if (selectCursor >= fixtures.selectable.length) {
+                return false;
+            }
+            const { job, client, freelancer } = fixtures.selectable[selectCursor++];
+            await request('POST /api/jobs/:id/select-freelancer/:freelancerId', `/api/jobs/${job.id}/select-freelancer/${freelancer.id}`, {
+                method: 'POST',
+                token: token(client)
+            });
+            return true;
+        },
+        admin: async () => {
+            const adminToken = token(fixtures.admin);
+            await request('GET /api/admin/stats', '/api/admin/stats?days=7', { token: adminToken });
+            await request('GET /api/users/admin/users', '/api/users/admin/users?limit=50', { token: adminToken });
+            await request('GET /api/jobs/admin/jobs', '/api/jobs/admin/jobs?limit=50&status=posted', { token: adminToken });
         }
-        
-        // Update transaction record
-        const { error: updateError } = await supabase
-            .from('transactions')
-            .update({
-                payment_status: 'completed',
-                payment_date: new Date(),
-                payment_reference: paymentResult.paymentReference
-            })
-            .eq('job_id', id);
-            
-        if (updateError) {
-            console.error('Transaction update error:', updateError);
+    };
+};
+
+const pickScenario = () => {
+    const total = Object.values(SCENARIO_WEIGHTS).reduce((sum, weight) => sum + weight, 0);
+    let roll = Math.random() * total;
+    for (const [name, weight] of Object.entries(SCENARIO_WEIGHTS)) {
+        roll -= weight;
+        if (roll < 0) {
+            return name;
         }
-        
-        res.json({ message: 'Payment processed successfully', paymentReference: paymentResult.paymentReference });
-    } catch (error) {
-        console.error('Payment processing error:', error);
-        res.status(500).json({ error: 'Internal server error' });
     }
-});
+    return 'browse';
+};
 
-// Complete a job
-router.post('/:id/complete', authenticateToken, async (req, res) => {
-    try {
-        const { id } = req.params;
-        
-        // Check if job exists and belongs to the user
-        const { data: job, error: jobError } = await supabase
-            .from('jobs')
-            .select('*, client:users(*)')
-            .eq('id', id)
-            .eq('client_id', req.user.id)
-            .single();
-            
-        if (jobError || !job) {
-            return res.status(404).json({ error: 'Job not found' });
-        }
-        
-        // Update job status to completed
-        const { data: updatedJob, error: updateError } = await supabase
-            .from('jobs')
-            .update({
-                status: 'completed',
-                completion_date: new Date(),
-                archive_date: new Date(Date.now() + 24 * 60 * 60 * 1000) // 24 hours from now
-            })
-            .eq('id', id)
-            .select()
-            .single();
-            
-        if (updateError) {
-            return res.status(400).json({ error: 'Failed to complete job' });
+const runVirtualUser = async (scenarios, deadline) => {
+    while (Date.now() < deadline) {
+        const name = pickScenario();
+        // select runs out of seeded jobs on long runs; fall back to browsing
+        if ((await scenarios[name]()) === false) {
+            await scenarios.browse();
         }
-        
-        res.json({ message: 'Job completed successfully', job: updatedJob });
-    } catch (error) {
-        console.error('Job completion error:', error);
-        res.status(500).json({ error: 'Internal server error' });
     }
-});
+};
 
-// Admin only: Get all jobs with full details
-router.get('/admin/jobs', authenticateToken, requireAdmin, async (req, res) => {
-    try {
-        const { page = 1, limit = 20, status } = req.query;
-        const offset = (page - 1) * limit;
-        
-        let query = supabase
-            .from('jobs')
-            .select('*, client:users(*), applications:job_applications(*, freelancer:users(*))', { count: 'exact' })
-            .order('created_at', { ascending: false });
-            
-        if (status) {
-            query = query.eq('status', status);
-        }
-        
-        query = query.range(offset, offset + limit - 1);
-        
-        const { data: jobs, error, count } = await query;
-        
-        if (error) {
-            return res.status(400).json({ error: 'Failed to fetch jobs' });
-        }
-        
-        res.json({
-            jobs,
-            pagination: {
-                page: parseInt(page),
-                limit: parseInt(limit),
-                total: count
+// Client and freelancer sockets per active job; the client sends on an
+// interval and both receive-message (optimistic broadcast, measured at the
+// freelancer) and message-saved (after the batch insert) are timed
+const runChat = async ({ baseUrl, fixtures, recorder, deadline }) => {
+    const rooms = fixtures.activeJobs.slice(0, CHAT_ROOMS);
+    const sockets = [];
+
+    const connect = user => new Promise((resolve, reject) => {
+        const socket = connectSocket(baseUrl, { auth: { token: tokenFor(user) }, transports: ['websocket'], forceNew: true });
+        sockets.push(socket);
+        socket.once('connect', () => resolve(socket));
+        socket.once('connect_error', reject);
+    });
+
+    const join = (socket, jobId) => new Promise((resolve) => {
+        socket.once('message-history', resolve);
+        socket.once('join-job-denied', resolve);
+        socket.emit('join-job', jobId);
+    });
+
+    await Promise.all(rooms.map(async ({ job, client, freelancer }) => {
+        const [sender, receiver] = await Promise.all([connect(client), connect(freelancer)]);
+        await Promise.all([join(sender, job.id), join(receiver, job.id)]);
+
+        const sentAt = new Map();
+        receiver.on('receive-message', (message) => {
+            const start = sentAt.get(message.id);
+            if (start !== undefined) {
+                recorder.record('socket receive-message', performance.now() - start, true, 'delivered');
             }
         });
-    } catch (error) {
-        console.error('Admin jobs fetch error:', error);
-        res.status(500).json({ error: 'Internal server error' });
+        sender.on('message-saved', (message) => {
+            const start = sentAt.get(message.id);
+            if (start !== undefined) {
+                recorder.record('socket message-saved', performance.now() - start, true, 'saved');
+                sentAt.delete(message.id);
+            }
+        });
+        const fail = (id, outcome) => {
+            const start = sentAt.get(id);
+            if (start !== undefined) {
+                recorder.record('socket message-saved', performance.now() - start, false, outcome);
+                sentAt.delete(id);
+            }
+        };
+        sender.on('message-failed', ({ id }) => fail(id, 'failed'));
+        sender.on('message-rejected', ({ clientId }) => fail(clientId, 'rejected'));
+
+        while (Date.now() < deadline) {
+            const clientId = crypto.randomUUID();
+            sentAt.set(clientId, performance.now());
+            sender.emit('send-message', { jobId: job.id, receiverId: freelancer.id, content: 'Load test message', clientId });
+            await sleep(CHAT_INTERVAL_MS);
+        }
+    }));
+
+    // Let the last batch commit before disconnecting
+    await sleep(500);
+    for (const socket of sockets) {
+        socket.disconnect();
     }
-});
+};
 
-// Admin only: Update job status
-router.put('/admin/jobs/:id', authenticateToken, requireAdmin, async (req, res) => {
+const printSummary = (summary) => {
+    console.log(`${'endpoint'.padEnd(52)} ${'req/s'.padStart(8)} ${'p50'.padStart(8)} ${'p95'.padStart(8)} ${'p99'.padStart(8)} ${'errors'.padStart(7)}`);
+    for (const [endpoint, stats] of Object.entries(summary)) {
+        console.log(`${endpoint.padEnd(52)} ${String(stats.throughput).padStart(8)} ${stats.p50.toFixed(1).padStart(8)} ${stats.p95.toFixed(1).padStart(8)} ${stats.p99.toFixed(1).padStart(8)} ${String(stats.errors).padStart(7)}`);
+    }
+};
+
+const run = async () => {
+    const { seed, fixtures } = buildSeed();
+    const seedPath = path.join(os.tmpdir(), `juba-loadtest-seed-${process.pid}.json`);
+    fs.writeFileSync(seedPath, JSON.stringify(seed));
+
+    const port = await freePort();
+    const baseUrl = `http://127.0.0.1:${port}`;
+    const server = await startServer(seedPath, port);
+    const recorder = new Recorder();
+
+    console.log(`${VIRTUAL_USERS} virtual users, ${CHAT_ROOMS} chat rooms, ${DURATION_SECONDS}s against ${baseUrl}`);
     try {
-        const { id } = req.params;
-        const { status } = req.body;
-        
-        const { data: job, error } = await supabase
-            .from('jobs')
-            .update({ status })
-            .eq('id', id)
-            .select()
-            .single();
-            
-        if (error) {
-            return res.status(400).json({ error: 'Job update failed' });
-        }
-        
-        res.json({ message: 'Job updated successfully', job });
-    } catch (error) {
-        console.error('Job update error:', error);
-        res.status(500).json({ error: 'Internal server error' });
+        const start = Date.now();
+        const deadline = start + DURATION_SECONDS * 1000;
+        const scenarios = createScenarios({ baseUrl, fixtures, recorder });
+        await Promise.all([
+            ...Array.from({ length: VIRTUAL_USERS }, () => runVirtualUser(scenarios, deadline)),
+            runChat({ baseUrl, fixtures, recorder, deadline })
+        ]);
+        const elapsedSeconds = (Date.now() - start) / 1000;
+
+        const summary = recorder.summary(elapsedSeconds);
+        printSummary(summary);
+
+        const result = {
+            startedAt: new Date(start).toISOString(),
+            config: {
+                durationSeconds: DURATION_SECONDS,
+                virtualUsers: VIRTUAL_USERS,
+                chatRooms: CHAT_ROOMS,
+                scenarioWeights: SCENARIO_WEIGHTS,
+                seedSizes: SEED_SIZES,
+                dbLatencyMs: process.env.MEMORY_DB_LATENCY_MS || 'default',
+                dbJitterMs: process.env.MEMORY_DB_JITTER_MS || 'default',
+                node: process.version,
+                cpus: os.cpus().length
+            },
+            endpoints: summary
+        };
+        fs.mkdirSync(RESULTS_DIR, { recursive: true });
+        const resultPath = path.join(RESULTS_DIR, `loadtest-${result.startedAt.replace(/[:.]/g, '-')}.json`);
+        fs.writeFileSync(resultPath, JSON.stringify(result, null, 2));
+        console.log(`Results written to ${path.relative(process.cwd(), resultPath)}`);
+    } finally {
+        server.kill('SIGTERM');
+        fs.rmSync(seedPath, { force: true });
     }
-});
+};
 
-// Admin only: Delete job
-router.delete('/admin/jobs/:id', authenticateToken, requireAdmin, async (req, res) => {
-    try {
-        const { id } = req.params;
-        
-        const { error } = await supabase
-            .from('jobs')
-            .delete()
-            .eq('id', id);
-            
-        if (error) {
-            return res.status(400).json({ error: 'Job deletion failed' });
-        }
-        
-        res.json({ message: 'Job deleted successfully' });
-    } catch (error) {
-        console.error('Job deletion error:', error);
-        res.status(500).json({ error: 'Internal server error' });
+// Side-by-side throughput and p95 for two result files
+const compare = (beforePath, afterPath) => {
+    const before = JSON.parse(fs.readFileSync(beforePath, 'utf8')).endpoints;
+    const after = JSON.parse(fs.readFileSync(afterPath, 'utf8')).endpoints;
+    const change = (a, b) => (a ? `${(((b - a) / a) * 100).toFixed(1)}%` : 'n/a').padStart(8);
+
+    console.log(`${'endpoint'.padEnd(52)} ${'req/s'.padStart(8)} ${'change'.padStart(8)} ${'p95'.padStart(8)} ${'change'.padStart(8)}`);
+    for (const endpoint of new Set([...Object.keys(before), ...Object.keys(after)])) {
+        const a = before[endpoint] || {};
+        const b = after[endpoint] || {};
+        console.log(`${endpoint.padEnd(52)} ${String(b.throughput ?? '-').padStart(8)} ${change(a.throughput, b.throughput)} ${String(b.p95 ?? '-').padStart(8)} ${change(a.p95, b.p95)}`);
     }
-});
+};
 
-module.exports = router;
+if (process.argv[2] === 'compare') {
+    compare(process.argv[3], process.argv[4]);
+} else {
+    run().catch((error) => {
+        console.error(error);
+        process.exit(1);
+    });
+}
 """
-    create_file("server/routes/jobs.js", jobs_routes)
+    create_file("bench/loadtest.js", load_test)
     
-    # Main server file
-    server_index = """const express = require('express');
-const cors = require('cors');
-const helmet = require('helmet');
-const http = require('http');
-const socketIo = require('socket.io');
-require('dotenv').config();
+    # Singleflight test: parallel job detail requests share one backend query
+    singleflight_test = """const test = require('node:test');
+const assert = require('node:assert');
+const express = require('express');
+
+// Swap in a stand-in Supabase client before any route module loads it
+const dbPath = require.resolve('../db/index');
+const backend = { queries: 0 };
+const fakeJob = { id: 'job-1', title: 'Fix a leaking tap', client: {}, applications: [] };
+
+const fakeSupabase = {
+    from: () => {
+        const query = {
+            select: () => query,
+            eq: () => query,
+            single: () => {
+                backend.queries += 1;
+                return new Promise(resolve => setTimeout(() => resolve({ data: fakeJob, error: null }), 50));
+            }
+        };
+        return query;
+    }
+};
+require.cache[dbPath] = { id: dbPath, filename: dbPath, loaded: true, exports: fakeSupabase };
 
-// Import routes
-const userRoutes = require('./routes/users');
-const jobRoutes = require('./routes/jobs');
+const jobRoutes = require('../routes/jobs');
 
-// Import middleware
-const { authenticateToken } = require('./middleware/auth');
-const { rateLimitMiddleware, generalRateLimiter } = require('./middleware/rateLimit');
+test('parallel GET /api/jobs/:id requests share one Supabase query', async () => {
+    const app = express();
+    app.use('/api/jobs', jobRoutes);
+    const server = app.listen(0);
+    const { port } = server.address();
 
-const app = express();
-const server = http.createServer(app);
-const io = socketIo(server, {
-    cors: {
-        origin: "*",
-        methods: ["GET", "POST"]
+    try {
+        const parallelRequests = 20;
+        const responses = await Promise.all(
+            Array.from({ length: parallelRequests }, () => fetch(`http://127.0.0.1:${port}/api/jobs/job-1`))
+        );
+        const bodies = await Promise.all(responses.map(response => response.json()));
+
+        assert.strictEqual(backend.queries, 1);
+        for (const [index, response] of responses.entries()) {
+            assert.strictEqual(response.status, 200);
+            assert.deepStrictEqual(bodies[index], fakeJob);
+        }
+    } finally {
+        server.close();
+    }
+});
+"""
+    create_file("server/tests/singleflight.test.js", singleflight_test)
+    
+    memory_db_test = """const test = require('node:test');
+const assert = require('node:assert');
+
+const { createMemoryClient } = require('../db/memory');
+
+const seed = () => createMemoryClient({
+    latencyMs: 0,
+    jitterMs: 0,
+    seed: {
+        users: [
+            { id: 'u1', google_id: 'g1', email: 'ada@example.com', phone: '1', address: 'a', role: 'client', created_at: '2024-01-01T00:00:00.000Z' },
+            { id: 'u2', google_id: 'g2', email: 'bo@example.com', phone: '2', address: 'b', role: 'freelancer', created_at: '2024-01-02T00:00:00.000Z' }
+        ],
+        jobs: [
+            { id: 'j1', client_id: 'u1', title: 'Fix tap', description: 'd', location: 'Juba', status: 'posted', created_at: '2024-02-01T00:00:00.000Z' },
+            { id: 'j2', client_id: 'u1', title: 'Paint wall', description: 'd', location: 'Juba', status: 'in_progress', created_at: '2024-02-02T00:00:00.000Z' },
+            { id: 'j3', client_id: 'u1', title: 'Fix door', description: 'd', location: 'Juba', status: 'completed', created_at: '2024-02-02T00:00:00.000Z' }
+        ],
+        job_applications: [
+            { id: 'a1', job_id: 'j1', freelancer_id: 'u2', proposed_rate: 10 }
+        ]
     }
 });
 
-// Middleware
-app.use(helmet());
-app.use(cors());
-app.use(express.json({ limit: '10mb' }));
-app.use(express.urlencoded({ extended: true }));
+test('filters, orders, ranges and counts like PostgREST', async () => {
+    const supabase = seed();
+    const { data, count, error } = await supabase
+        .from('jobs')
+        .select('*, client:users(*)', { count: 'exact' })
+        .in('status', ['posted', 'in_progress', 'completed'])
+        .ilike('title', '%FIX%')
+        .order('created_at', { ascending: false })
+        .range(0, 0);
+
+    assert.strictEqual(error, null);
+    assert.strictEqual(count, 2);
+    assert.deepStrictEqual(data.map(job => job.id), ['j3']);
+    assert.strictEqual(data[0].client.email, 'ada@example.com');
+});
 
-// Apply rate limiting to all routes
-app.use(rateLimitMiddleware(generalRateLimiter));
+test('embeds one-to-many relations and counts', async () => {
+    const supabase = seed();
+    const { data } = await supabase
+        .from('jobs')
+        .select('id, applications:job_applications(*, freelancer:users(email)), totals:job_applications(count)')
+        .eq('id', 'j1')
+        .single();
+
+    assert.strictEqual(data.applications[0].freelancer.email, 'bo@example.com');
+    assert.deepStrictEqual(data.totals, [{ count: 1 }]);
+
+    // Filters on embedded columns narrow the embedded rows only
+    const accepted = await supabase
+        .from('jobs')
+        .select('client_id, applications:job_applications(freelancer_id)')
+        .eq('id', 'j1')
+        .eq('applications.status', 'accepted')
+        .single();
+    assert.deepStrictEqual(accepted.data, { client_id: 'u1', applications: [] });
+
+    // !inner turns an embedded filter into a filter on the parent rows
+    const inProgress = await supabase
+        .from('job_applications')
+        .select('id, job:jobs!inner(status)')
+        .eq('job.status', 'in_progress');
+    assert.deepStrictEqual(inProgress.data, []);
+});
 
-// Routes
-app.use('/api/users', userRoutes);
-app.use('/api/jobs', jobRoutes);
+test('supports keyset cursors written with or()', async () => {
+    const supabase = seed();
+    const { data } = await supabase
+        .from('jobs')
+        .select('id')
+        .or('created_at.lt."2024-02-02T00:00:00.000Z",and(created_at.eq."2024-02-02T00:00:00.000Z",id.lt.j3)')
+        .order('created_at', { ascending: false })
+        .order('id', { ascending: false });
 
-// Health check endpoint
-app.get('/health', (req, res) => {
-    res.status(200).json({ status: 'OK', message: 'Juba server is running' });
+    assert.deepStrictEqual(data.map(job => job.id), ['j2', 'j1']);
 });
 
-// Socket.io for real-time messaging
-io.on('connection', (socket) => {
-    console.log('User connected:', socket.id);
-    
-    // Join room for a specific job
-    socket.on('join-job', (jobId) => {
-        socket.join(jobId);
-        console.log(`User ${socket.id} joined job room ${jobId}`);
-    });
-    
-    // Handle chat messages
-    socket.on('send-message', async (data) => {
-        try {
-            const { jobId, senderId, receiverId, content } = data;
-            
-            // Save message to database
-            const supabase = require('./db/index');
-            const { data: message, error } = await supabase
-                .from('messages')
-                .insert([
-                    {
-                        job_id: jobId,
-                        sender_id: senderId,
-                        receiver_id: receiverId,
-                        content
-                    }
-                ])
-                .select()
-                .single();
-                
-            if (error) {
-                console.error('Message save error:', error);
-                return;
-            }
-            
-            // Emit message to the job room
-            io.to(jobId).emit('receive-message', message);
-        } catch (error) {
-            console.error('Message handling error:', error);
-        }
-    });
+test('writes apply defaults, enforce uniqueness and cascade deletes', async () => {
+    const supabase = seed();
+    const inserted = await supabase
+        .from('jobs')
+        .insert([{ client_id: 'u1', title: 'New', description: 'd', location: 'Juba' }])
+        .select()
+        .single();
+    assert.strictEqual(inserted.data.status, 'posted');
+    assert.ok(inserted.data.id && inserted.data.created_at);
+
+    const duplicate = await supabase.from('users').insert([{ google_id: 'g3', email: 'ada@example.com' }]);
+    assert.strictEqual(duplicate.error.code, '23505');
+
+    const updated = await supabase.from('jobs').update({ status: 'cancelled' }, { count: 'exact' }).eq('client_id', 'u1').neq('id', 'j3');
+    assert.strictEqual(updated.count, 3);
+
+    await supabase.from('jobs').delete().eq('id', 'j1');
+    const applications = await supabase.from('job_applications').select('*');
+    assert.deepStrictEqual(applications.data, []);
+
+    const missing = await supabase.from('jobs').select('*').eq('id', 'j1').single();
+    assert.strictEqual(missing.error.code, 'PGRST116');
+});
+"""
+    create_file("server/tests/memoryDb.test.js", memory_db_test)
     
-    socket.on('disconnect', () => {
-        console.log('User disconnected:', socket.id);
+    static_client_test = """const test = require('node:test');
+const assert = require('node:assert');
+const fs = require('fs');
+const os = require('os');
+const path = require('path');
+const http = require('http');
+const zlib = require('zlib');
+
+const { serveClientBuild } = require('../middleware/staticClient');
+
+const makeBuild = () => {
+    const root = fs.mkdtempSync(path.join(os.tmpdir(), 'juba-build-'));
+    const js = 'console.log("juba");'.repeat(100);
+    fs.mkdirSync(path.join(root, 'static', 'js'), { recursive: true });
+    fs.mkdirSync(path.join(root, 'static', 'media'), { recursive: true });
+    fs.writeFileSync(path.join(root, 'static', 'media', 'logo.6ce24c58023cc2f8fd88fe9d219db6c6.svg'), '<svg></svg>');
+    fs.writeFileSync(path.join(root, 'index.html'), '<div id="root"></div>');
+    fs.writeFileSync(path.join(root, 'static', 'js', 'main.1a2b3c4d.js'), js);
+    fs.writeFileSync(path.join(root, 'static', 'js', 'main.1a2b3c4d.js.br'), zlib.brotliCompressSync(js));
+    fs.writeFileSync(path.join(root, 'static', 'js', 'main.1a2b3c4d.js.gz'), zlib.gzipSync(js));
+    return root;
+};
+
+const withServer = async (run) => {
+    const middleware = serveClientBuild({ root: makeBuild() });
+    const server = http.createServer((req, res) => middleware(req, res, () => {
+        res.statusCode = 404;
+        res.end('next');
+    }));
+    await new Promise(resolve => server.listen(0, resolve));
+    const get = (urlPath, headers = {}) => new Promise((resolve, reject) => {
+        http.get({ port: server.address().port, path: urlPath, headers }, (res) => {
+            const chunks = [];
+            res.on('data', chunk => chunks.push(chunk));
+            res.on('end', () => resolve({ status: res.statusCode, headers: res.headers, body: Buffer.concat(chunks) }));
+        }).on('error', reject);
     });
-});
+    try {
+        await run(get);
+    } finally {
+        server.close();
+    }
+};
 
-// Error handling middleware
-app.use((err, req, res, next) => {
-    console.error(err.stack);
-    res.status(500).json({ error: 'Something went wrong!' });
-});
+test('serves the best precompressed variant with immutable caching', async () => {
+    await withServer(async (get) => {
+        const br = await get('/static/js/main.1a2b3c4d.js', { 'accept-encoding': 'gzip, deflate, br' });
+        assert.strictEqual(br.status, 200);
+        assert.strictEqual(br.headers['content-encoding'], 'br');
+        assert.strictEqual(br.headers['cache-control'], 'public, max-age=31536000, immutable');
+        assert.strictEqual(br.headers.vary, 'Accept-Encoding');
+        assert.match(zlib.brotliDecompressSync(br.body).toString(), /juba/);
 
-// 404 handler
-app.use('*', (req, res) => {
-    res.status(404).json({ error: 'Route not found' });
-});
+        const gz = await get('/static/js/main.1a2b3c4d.js', { 'accept-encoding': 'gzip, br;q=0' });
+        assert.strictEqual(gz.headers['content-encoding'], 'gzip');
 
-const PORT = process.env.PORT || 5000;
+        const plain = await get('/static/js/main.1a2b3c4d.js', { 'accept-encoding': 'identity' });
+        assert.strictEqual(plain.headers['content-encoding'], undefined);
+        assert.strictEqual(plain.body.length, Number(plain.headers['content-length']));
 
-server.listen(PORT, () => {
-    console.log(`Server running on port ${PORT}`);
+        const revalidated = await get('/static/js/main.1a2b3c4d.js', { 'accept-encoding': 'br', 'if-none-match': br.headers.etag });
+        assert.strictEqual(revalidated.status, 304);
+
+        const media = await get('/static/media/logo.6ce24c58023cc2f8fd88fe9d219db6c6.svg');
+        assert.strictEqual(media.headers['cache-control'], 'public, max-age=31536000, immutable');
+    });
 });
 
-module.exports = app;
+test('falls back to index.html for client routes but not API paths', async () => {
+    await withServer(async (get) => {
+        const route = await get('/job/123', { accept: 'text/html' });
+        assert.strictEqual(route.status, 200);
+        assert.strictEqual(route.headers['cache-control'], 'no-cache');
+        assert.strictEqual(route.body.toString(), '<div id="root"></div>');
+
+        assert.strictEqual((await get('/api/jobs', { accept: 'text/html' })).body.toString(), 'next');
+        assert.strictEqual((await get('/static/js/missing.js')).body.toString(), 'next');
+        assert.strictEqual((await get('/../../etc/passwd', { accept: 'text/html' })).body.toString(), '<div id="root"></div>');
+    });
+});
 """
-    create_file("server/index.js", server_index)
+    create_file("server/tests/staticClient.test.js", static_client_test)
     
     # Create React app structure
     # Package.json for React app
@@ -1415,9 +5736,15 @@ module.exports = app;
         "scripts": {
             "start": "react-scripts start",
             "build": "react-scripts build",
+            "postbuild": "node scripts/compress-build.js && node scripts/check-bundle-size.js",
+            "check:bundle": "node scripts/check-bundle-size.js",
             "test": "react-scripts test",
             "eject": "react-scripts eject"
         },
+        "bundleBudget": {
+            "initialJsKb": 90,
+            "initialCssKb": 12
+        },
         "browserslist": {
             "production": [
                 ">0.2%",
@@ -1438,6 +5765,7 @@ module.exports = app;
     react_app = """import React from 'react';
 import ReactDOM from 'react-dom/client';
 import App from './App';
+import { register as registerServiceWorker } from './serviceWorkerRegistration';
 
 const root = ReactDOM.createRoot(document.getElementById('root'));
 root.render(
@@ -1445,29 +5773,276 @@ root.render(
     <App />
   </React.StrictMode>
 );
+
+registerServiceWorker();
 """
     create_file("client/src/index.js", react_app)
     
+    # Service worker: precached build assets, network-first job reads and
+    # an offline queue for applications
+    service_worker = """/* eslint-disable no-restricted-globals */
+// Built by react-scripts (InjectManifest), which replaces the manifest
+// placeholder below with the hashed build assets at build time.
+const PRECACHE = 'juba-precache-v1';
+const API_CACHE = 'juba-api-v1';
+const CURRENT_CACHES = [PRECACHE, API_CACHE];
+const API_TIMEOUT_MS = 3000;
+const API_CACHE_MAX_ENTRIES = 60;
+const SYNC_TAG = 'juba-apply-queue';
+
+const precacheEntries = (self.__WB_MANIFEST || []).map(entry => (typeof entry === 'string' ? entry : entry.url));
+const precacheUrls = new Set(precacheEntries.map(url => new URL(url, self.location.origin).pathname));
+
+// Public job reads only: the feed and single jobs. Per-user lists, chat
+// history and admin views stay network-only so nothing leaks between logins.
+const JOB_DETAIL_PATH = /^[/]api[/]jobs[/][0-9a-f-]{36}$/;
+const isCachedApiRead = (url) => url.pathname === '/api/jobs' || JOB_DETAIL_PATH.test(url.pathname);
+const APPLY_PATH = /^[/]api[/]jobs[/]([0-9a-f-]{36})[/]apply$/;
+const SERVER_PATHS = ['/api/', '/socket.io/', '/metrics', '/health'];
+
+self.addEventListener('install', (event) => {
+  event.waitUntil(
+    caches.open(PRECACHE)
+      // Bypass the HTTP cache so index.html matches this build
+      .then(cache => cache.addAll([...precacheUrls].map(url => new Request(url, { cache: 'reload' }))))
+      .then(() => self.skipWaiting())
+  );
+});
+
+// Drop other caches and assets from previous builds
+const cleanCaches = async () => {
+  const keys = await caches.keys();
+  await Promise.all(keys.filter(key => !CURRENT_CACHES.includes(key)).map(key => caches.delete(key)));
+  const precache = await caches.open(PRECACHE);
+  const cached = await precache.keys();
+  await Promise.all(cached
+    .filter(request => !precacheUrls.has(new URL(request.url).pathname))
+    .map(request => precache.delete(request)));
+};
+
+self.addEventListener('activate', (event) => {
+  event.waitUntil(cleanCaches().then(() => self.clients.claim()));
+});
+
+// Hashed assets never change, so the precache answers first
+const cacheFirst = async (request) => {
+  const cached = await caches.match(request, { cacheName: PRECACHE });
+  return cached || fetch(request);
+};
+
+// The app shell comes from the precache; the server only sees API traffic
+const appShell = async (request) => {
+  const cached = await caches.match('/index.html', { cacheName: PRECACHE });
+  return cached || fetch(request);
+};
+
+const trimCache = async (cacheName, maxEntries) => {
+  const cache = await caches.open(cacheName);
+  const keys = await cache.keys();
+  await Promise.all(keys.slice(0, Math.max(0, keys.length - maxEntries)).map(key => cache.delete(key)));
+};
+
+// Fresh data when the network answers in time, the last copy otherwise
+const networkFirst = async (request) => {
+  const cache = await caches.open(API_CACHE);
+  const network = fetch(request).then(async (response) => {
+    if (response.ok) {
+      await cache.put(request, response.clone());
+      trimCache(API_CACHE, API_CACHE_MAX_ENTRIES);
+    }
+    return response;
+  });
+
+  const timeout = new Promise(resolve => setTimeout(resolve, API_TIMEOUT_MS));
+  const first = await Promise.race([network.catch(() => undefined), timeout]);
+  if (first) {
+    return first;
+  }
+  const cached = await cache.match(request);
+  return cached || network;
+};
+
+// Applications made offline are kept in IndexedDB and replayed on reconnect
+const openQueue = () => new Promise((resolve, reject) => {
+  const open = indexedDB.open('juba-sync', 1);
+  open.onupgradeneeded = () => open.result.createObjectStore('requests', { keyPath: 'id', autoIncrement: true });
+  open.onsuccess = () => resolve(open.result);
+  open.onerror = () => reject(open.error);
+});
+
+const queueTransaction = async (mode, run) => {
+  const db = await openQueue();
+  return new Promise((resolve, reject) => {
+    const transaction = db.transaction('requests', mode);
+    const result = run(transaction.objectStore('requests'));
+    transaction.oncomplete = () => resolve(result.result);
+    transaction.onerror = () => reject(transaction.error);
+  });
+};
+
+const notifyClients = async (message) => {
+  const windows = await self.clients.matchAll({ type: 'window' });
+  windows.forEach(client => client.postMessage(message));
+};
+
+const queueApplication = async (request, jobId) => {
+  const body = await request.text();
+  await queueTransaction('readwrite', store => store.add({
+    jobId,
+    url: request.url,
+    authorization: request.headers.get('Authorization'),
+    body,
+    queuedAt: Date.now()
+  }));
+  if (self.registration.sync) {
+    await self.registration.sync.register(SYNC_TAG);
+  }
+  return new Response(JSON.stringify({ queued: true }), {
+    status: 202,
+    headers: { 'Content-Type': 'application/json' }
+  });
+};
+
+const applyWithQueue = async (request, jobId) => {
+  const body = request.clone();
+  try {
+    return await fetch(request);
+  } catch (error) {
+    return queueApplication(body, jobId);
+  }
+};
+
+let replaying = null;
+const replayQueue = () => {
+  if (!replaying) {
+    replaying = (async () => {
+      const queued = await queueTransaction('readonly', store => store.getAll());
+      for (const entry of queued) {
+        // A network failure leaves the rest queued for the next attempt
+        const response = await fetch(entry.url, {
+          method: 'POST',
+          headers: { 'Content-Type': 'application/json', Authorization: entry.authorization },
+          body: entry.body
+        });
+        await queueTransaction('readwrite', store => store.delete(entry.id));
+        await notifyClients({ type: 'application-synced', jobId: entry.jobId, status: response.status });
+      }
+    })().finally(() => {
+      replaying = null;
+    });
+  }
+  return replaying;
+};
+
+self.addEventListener('sync', (event) => {
+  if (event.tag === SYNC_TAG) {
+    event.waitUntil(replayQueue());
+  }
+});
+
+// Browsers without Background Sync ask for a replay when they come online
+self.addEventListener('message', (event) => {
+  if (event.data?.type === 'replay-queue') {
+    event.waitUntil(replayQueue().catch(() => {}));
+  }
+});
+
+self.addEventListener('fetch', (event) => {
+  const { request } = event;
+  const url = new URL(request.url);
+  if (url.origin !== self.location.origin) {
+    return;
+  }
+
+  if (request.method === 'POST') {
+    const apply = url.pathname.match(APPLY_PATH);
+    if (apply) {
+      event.respondWith(applyWithQueue(request, apply[1]));
+    }
+    return;
+  }
+  if (request.method !== 'GET') {
+    return;
+  }
+
+  if (request.mode === 'navigate' && !SERVER_PATHS.some(prefix => url.pathname.startsWith(prefix))) {
+    event.respondWith(appShell(request));
+  } else if (precacheUrls.has(url.pathname)) {
+    event.respondWith(cacheFirst(request));
+  } else if (isCachedApiRead(url)) {
+    event.respondWith(networkFirst(request));
+  }
+});
+"""
+    create_file("client/src/service-worker.js", service_worker)
+    
+    service_worker_registration = """import { invalidateQueries } from './queryCache';
+
+// Production builds only: the dev server has no precache manifest
+export const register = () => {
+  if (process.env.NODE_ENV !== 'production' || !('serviceWorker' in navigator)) {
+    return;
+  }
+
+  window.addEventListener('load', () => {
+    navigator.serviceWorker
+      .register(`${process.env.PUBLIC_URL}/service-worker.js`)
+      .catch(error => console.error('Service worker registration failed:', error));
+  });
+
+  // A queued application reached the server: show its real state
+  navigator.serviceWorker.addEventListener('message', (event) => {
+    if (event.data?.type === 'application-synced') {
+      invalidateQueries(`job:${event.data.jobId}`);
+      invalidateQueries('jobs:mine');
+    }
+  });
+
+  // Browsers without Background Sync replay the queue on reconnect
+  window.addEventListener('online', () => {
+    navigator.serviceWorker.controller?.postMessage({ type: 'replay-queue' });
+  });
+};
+"""
+    create_file("client/src/serviceWorkerRegistration.js", service_worker_registration)
+    
     # Main App component
-    app_component = """import React from 'react';
+    app_component = """import React, { Suspense, useEffect } from 'react';
 import { BrowserRouter as Router, Routes, Route } from 'react-router-dom';
 import { GoogleOAuthProvider } from '@react-oauth/google';
 
 // Import components
 import Header from './components/Header';
 import Home from './pages/Home';
-import Login from './pages/Login';
-import Dashboard from './pages/Dashboard';
-import JobPost from './pages/JobPost';
-import JobDetails from './pages/JobDetails';
-import FreelancerApplication from './pages/FreelancerApplication';
-import AdminDashboard from './pages/AdminDashboard';
+
+// Every other page is its own chunk, loaded on first visit (see routes.js)
+import {
+  Login,
+  Dashboard,
+  JobPost,
+  JobDetails,
+  FreelancerApplication,
+  AdminDashboard,
+  prefetchLikelyRoutes
+} from './routes';
 
 // Import context
-import { AuthProvider } from './context/AuthContext';
+import { AuthProvider, useAuth } from './context/AuthContext';
+
+// Styles: App.css is split by gen2.py into critical CSS inlined in
+// index.html and one stylesheet per lazy page
+
+// Warm the chunks the current user is likely to open next once the
+// browser is idle
+function RoutePrefetcher() {
+  const { currentUser } = useAuth();
+
+  useEffect(() => {
+    return prefetchLikelyRoutes(currentUser);
+  }, [currentUser]);
 
-// Import styles
-import './App.css';
+  return null;
+}
 
 function App() {
   return (
@@ -1476,16 +6051,19 @@ function App() {
         <Router>
           <div className="App">
             <Header />
+            <RoutePrefetcher />
             <main className="main-content">
-              <Routes>
-                <Route path="/" element={<Home />} />
-                <Route path="/login" element={<Login />} />
-                <Route path="/dashboard" element={<Dashboard />} />
-                <Route path="/post-job" element={<JobPost />} />
-                <Route path="/job/:id" element={<JobDetails />} />
-                <Route path="/become-freelancer" element={<FreelancerApplication />} />
-                <Route path="/admin" element={<AdminDashboard />} />
-              </Routes>
+              <Suspense fallback={<div className="spinner"></div>}>
+                <Routes>
+                  <Route path="/" element={<Home />} />
+                  <Route path="/login" element={<Login />} />
+                  <Route path="/dashboard" element={<Dashboard />} />
+                  <Route path="/post-job" element={<JobPost />} />
+                  <Route path="/job/:id" element={<JobDetails />} />
+                  <Route path="/become-freelancer" element={<FreelancerApplication />} />
+                  <Route path="/admin" element={<AdminDashboard />} />
+                </Routes>
+              </Suspense>
             </main>
           </div>
         </Router>
@@ -1498,8 +6076,192 @@ export default App;
 """
     create_file("client/src/App.js", app_component)
     
+    # Lazy route chunks and idle-time prefetching
+    routes_module = """import { lazy } from 'react';
+
+// One loader per route chunk. React.lazy and prefetching share the loader,
+// and the bundler caches the import, so a prefetched chunk renders at once.
+const loaders = {
+  login: () => import(/* webpackChunkName: "login" */ './pages/Login'),
+  dashboard: () => import(/* webpackChunkName: "dashboard" */ './pages/Dashboard'),
+  jobPost: () => import(/* webpackChunkName: "job-post" */ './pages/JobPost'),
+  jobDetails: () => import(/* webpackChunkName: "job-details" */ './pages/JobDetails'),
+  freelancerApplication: () => import(/* webpackChunkName: "freelancer-application" */ './pages/FreelancerApplication'),
+  adminDashboard: () => import(/* webpackChunkName: "admin" */ './pages/AdminDashboard')
+};
+
+export const Login = lazy(loaders.login);
+export const Dashboard = lazy(loaders.dashboard);
+export const JobPost = lazy(loaders.jobPost);
+export const JobDetails = lazy(loaders.jobDetails);
+export const FreelancerApplication = lazy(loaders.freelancerApplication);
+export const AdminDashboard = lazy(loaders.adminDashboard);
+
+// Where each kind of visitor usually goes next
+const likelyRoutes = (user) => {
+  if (!user) {
+    return ['login'];
+  }
+  if (user.admin_status) {
+    return ['dashboard', 'adminDashboard', 'jobDetails'];
+  }
+  if (user.role === 'freelancer') {
+    return ['dashboard', 'jobDetails'];
+  }
+  return ['dashboard', 'jobDetails', 'jobPost'];
+};
+
+// Skip prefetching when the user asked to save data or the link is slow;
+// those chunks will load on demand instead
+const shouldPrefetch = () => {
+  const connection = navigator.connection;
+  if (!connection) {
+    return true;
+  }
+  return !connection.saveData && !['slow-2g', '2g'].includes(connection.effectiveType);
+};
+
+const whenIdle = (callback) => {
+  if ('requestIdleCallback' in window) {
+    const handle = window.requestIdleCallback(callback, { timeout: 5000 });
+    return () => window.cancelIdleCallback(handle);
+  }
+  const handle = setTimeout(callback, 2000);
+  return () => clearTimeout(handle);
+};
+
+// Returns a cancel function so effects can clean up on unmount
+export const prefetchLikelyRoutes = (user) => {
+  if (!shouldPrefetch()) {
+    return () => {};
+  }
+
+  return whenIdle(() => {
+    likelyRoutes(user).forEach((name) => {
+      loaders[name]().catch(() => {
+        // A failed prefetch is retried by React.lazy on navigation
+      });
+    });
+  });
+};
+"""
+    create_file("client/src/routes.js", routes_module)
+    
+    # Bundle size budget, checked after every production build
+    bundle_budget_script = """// Fails the build when the initial (entrypoint) JS or CSS grows past the
+// gzip budget in package.json "bundleBudget". Route chunks are reported but
+// only the initial download is budgeted, since that is what blocks first
+// paint on a mobile link.
+const fs = require('fs');
+const path = require('path');
+const zlib = require('zlib');
+
+const buildDir = path.join(__dirname, '..', 'build');
+const { bundleBudget } = require('../package.json');
+
+const gzipKb = (file) => zlib.gzipSync(fs.readFileSync(path.join(buildDir, file)), { level: 9 }).length / 1024;
+
+const manifest = JSON.parse(fs.readFileSync(path.join(buildDir, 'asset-manifest.json'), 'utf8'));
+const initial = manifest.entrypoints;
+const initialJs = initial.filter(file => file.endsWith('.js'));
+const initialCss = initial.filter(file => file.endsWith('.css'));
+
+const sum = files => files.reduce((total, file) => total + gzipKb(file), 0);
+const results = [
+  { label: 'initial JS', size: sum(initialJs), budget: bundleBudget.initialJsKb },
+  { label: 'initial CSS', size: sum(initialCss), budget: bundleBudget.initialCssKb }
+];
+
+const routeChunks = Object.values(manifest.files)
+  .map(file => file.replace(/^[/]/, ''))
+  .filter(file => file.endsWith('.chunk.js') && !initial.includes(file));
+
+console.log('Bundle sizes (gzip):');
+results.forEach(({ label, size, budget }) => {
+  console.log(`  ${label.padEnd(12)} ${size.toFixed(1).padStart(7)} kB  (budget ${budget} kB)`);
+});
+routeChunks.forEach((file) => {
+  console.log(`  ${path.basename(file).padEnd(40)} ${gzipKb(file).toFixed(1).padStart(7)} kB`);
+});
+
+const over = results.filter(({ size, budget }) => size > budget);
+if (over.length > 0) {
+  over.forEach(({ label, size, budget }) => {
+    console.error(`${label} is ${size.toFixed(1)} kB gzipped, over its ${budget} kB budget`);
+  });
+  process.exit(1);
+}
+"""
+    create_file("client/scripts/check-bundle-size.js", bundle_budget_script)
+    
+    compress_build_script = """// Writes .br and .gz next to every compressible build file so the server
+// can send them as-is instead of compressing on each request. Runs after
+// `react-scripts build` (postbuild).
+const fs = require('fs');
+const path = require('path');
+const zlib = require('zlib');
+
+const buildDir = path.join(__dirname, '..', 'build');
+const COMPRESSIBLE = new Set(['.js', '.css', '.html', '.json', '.svg', '.txt', '.ico', '.map']);
+// Below this a compressed body plus headers is no smaller than the original
+const MIN_BYTES = 1024;
+
+const walk = (dir) => fs.readdirSync(dir, { withFileTypes: true }).flatMap((entry) => {
+  const fullPath = path.join(dir, entry.name);
+  return entry.isDirectory() ? walk(fullPath) : [fullPath];
+});
+
+const compressors = [
+  {
+    extension: '.br',
+    compress: source => zlib.brotliCompressSync(source, {
+      params: {
+        [zlib.constants.BROTLI_PARAM_QUALITY]: zlib.constants.BROTLI_MAX_QUALITY,
+        [zlib.constants.BROTLI_PARAM_SIZE_HINT]: source.length
+      }
+    })
+  },
+  { extension: '.gz', compress: source => zlib.gzipSync(source, { level: zlib.constants.Z_BEST_COMPRESSION }) }
+];
+
+const totals = { original: 0, br: 0, gz: 0, files: 0 };
+
+walk(buildDir)
+  .filter(file => COMPRESSIBLE.has(path.extname(file)))
+  .forEach((file) => {
+    const source = fs.readFileSync(file);
+    if (source.length < MIN_BYTES) {
+      return;
+    }
+    totals.files += 1;
+    totals.original += source.length;
+    compressors.forEach(({ extension, compress }) => {
+      const compressed = compress(source);
+      // Only keep variants that actually save bytes
+      if (compressed.length < source.length) {
+        fs.writeFileSync(file + extension, compressed);
+        totals[extension.slice(1)] += compressed.length;
+      } else {
+        totals[extension.slice(1)] += source.length;
+      }
+    });
+  });
+
+const kb = bytes => (bytes / 1024).toFixed(1);
+console.log(`Precompressed ${totals.files} files: ${kb(totals.original)} kB -> ${kb(totals.br)} kB brotli, ${kb(totals.gz)} kB gzip`);
+"""
+    create_file("client/scripts/compress-build.js", compress_build_script)
+    
+    # Keep the webpack runtime out of index.html so the server's CSP can
+    # stay free of 'unsafe-inline' scripts
+    create_file("client/.env", "INLINE_RUNTIME_CHUNK=false\n")
+    
     # CSS file
-    app_css = """/* Global Styles */
+    app_css = """/* Source stylesheet, consumed by gen2.py: it inlines the rules the initial
+   bundle renders into index.html, moves the rest into per-page stylesheets,
+   drops rules no component uses and then removes this file. */
+
+/* Global Styles */
 * {
   box-sizing: border-box;
   margin: 0;
@@ -1846,6 +6608,46 @@ body {
   background-color: #f8f9fa;
 }
 
+/* Virtualized tables: fixed-height rows inside a scrolling container */
+.virtual-table-scroll {
+  overflow-y: auto;
+  border-radius: 8px;
+  box-shadow: 0 2px 10px rgba(0, 0, 0, 0.1);
+  margin-bottom: 1rem;
+}
+
+.virtual-table {
+  table-layout: fixed;
+  border-radius: 0;
+  overflow: visible;
+  box-shadow: none;
+}
+
+.virtual-table th {
+  position: sticky;
+  top: 0;
+  z-index: 1;
+}
+
+.virtual-table td {
+  padding-top: 0;
+  padding-bottom: 0;
+  white-space: nowrap;
+  overflow: hidden;
+  text-overflow: ellipsis;
+}
+
+.virtual-table .virtual-table-spacer td {
+  padding: 0;
+  border: none;
+}
+
+.virtual-table-status {
+  padding: 0.75rem 1rem;
+  color: #7f8c8d;
+  text-align: center;
+}
+
 /* Status Badges */
 .status-badge {
   padding: 0.25rem 0.75rem;
@@ -1974,6 +6776,17 @@ export const AuthProvider = ({ children }) => {
 """
     create_file("client/public/index.html", index_html)
     
+    # Web app manifest referenced by index.html
+    web_manifest = {
+        "short_name": "Juba",
+        "name": "Juba - Odd Jobs Platform",
+        "start_url": ".",
+        "display": "standalone",
+        "theme_color": "#000000",
+        "background_color": "#ffffff"
+    }
+    create_file("client/public/manifest.json", json.dumps(web_manifest, indent=2))
+    
     # Create README
     readme = """# Juba Platform
 
@@ -2025,12 +6838,18 @@ The API endpoints are organized as follows:
 
 - `/api/users` - User authentication and management
 - `/api/jobs` - Job posting and management
+- `/api/admin` - Admin dashboard aggregates
+- `/metrics` - Prometheus metrics (request rate and latency per route, rate-limit rejections, sockets, chat throughput, email/payment in flight)
 - WebSocket connections for real-time chat
 
 ## Deployment
 
 The application is designed to be deployed as a mobile web app. The React frontend can be built with `npm run build` and served as static files.
 
+The build step also writes brotli and gzip copies of every compressible asset. With `SERVE_CLIENT=true` the Node server serves `client/build` itself and picks the best encoding each browser accepts. Content-hashed files get a one-year `immutable` cache lifetime. `index.html`, `service-worker.js` and `manifest.json` are revalidated on every load. Client routes fall back to `index.html`. JSON API responses larger than `COMPRESSION_THRESHOLD_BYTES` are gzipped on the fly.
+
+Production builds register a service worker (`client/src/service-worker.js`). It precaches the hashed build assets and serves the app shell from cache. Public job reads (`/api/jobs`, `/api/jobs/:id`) are network-first with a 3 second timeout, falling back to the last cached copy. Applications submitted while offline are queued and replayed through Background Sync, or when the browser comes back online.
+
 ## License
 
 This project is proprietary software.
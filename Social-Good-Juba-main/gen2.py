@@ -1,4 +1,5 @@
 import os
+import re
 import json
 
 def create_file(path, content):
@@ -10,53 +11,310 @@ def create_file(path, content):
     with open(path, 'w') as f:
         f.write(content)
 
+# Critical CSS: the stylesheet is split after the pages are written, using
+# the class names each module actually renders.
+CSS_COMMENT = re.compile(r'/\*.*?\*/', re.S)
+CSS_CLASS = re.compile(r'\.(-?[_a-zA-Z][\w-]*)')
+CLASSNAME_ATTR = re.compile(r'className=(?:"([^"]*)"|\{`([^`]*)`\}|\{([^}]*)\})')
+TEMPLATE_PREFIX = re.compile(r'([\w-]+-)\$\{')
+TEMPLATE_EXPR = re.compile(r'\$\{[^}]*\}')
+QUOTED = re.compile(r"'([^']*)'|\"([^\"]*)\"")
+LAZY_PAGE = re.compile(r"import\([^)]*'\./pages/(\w+)'\)")
+COMPONENT_IMPORT = re.compile(r"from '\.\./components/(\w+)'")
+
+# Modules in the initial bundle: their styles are inlined into index.html
+EAGER_MODULES = ["index.js", "App.js", "routes.js", "components/Header.js", "pages/Home.js"]
+
+
+def parse_css(css):
+    """Split a stylesheet into rules ({prelude, body}) and @media blocks ({prelude, rules})."""
+    blocks = []
+    depth = 0
+    start = 0
+    body_start = 0
+    prelude = ''
+    for index, char in enumerate(css):
+        if char == '{':
+            if depth == 0:
+                prelude = ' '.join(css[start:index].split())
+                body_start = index + 1
+            depth += 1
+        elif char == '}':
+            depth -= 1
+            if depth == 0:
+                body = css[body_start:index]
+                if prelude.startswith('@media'):
+                    blocks.append({'prelude': prelude, 'rules': parse_css(body)})
+                else:
+                    blocks.append({'prelude': prelude, 'body': body})
+                start = index + 1
+    return blocks
+
+
+def format_css(blocks, indent=''):
+    out = []
+    for block in blocks:
+        if 'rules' in block:
+            out.append('%s%s {\n%s%s}\n' % (indent, block['prelude'], format_css(block['rules'], indent + '  '), indent))
+        elif block['prelude'].startswith('@keyframes'):
+            steps = format_css(parse_css(block['body']), indent + '  ')
+            out.append('%s%s {\n%s%s}\n' % (indent, block['prelude'], steps, indent))
+        else:
+            declarations = [line.strip() for line in block['body'].strip().split(';') if line.strip()]
+            body = ''.join('%s  %s;\n' % (indent, declaration) for declaration in declarations)
+            out.append('%s%s {\n%s%s}\n' % (indent, block['prelude'], body, indent))
+    return '\n'.join(out)
+
+
+def minify_css(blocks):
+    text = format_css(blocks)
+    text = ' '.join(text.split())
+    return re.sub(r'\s*([{};:,>])\s*', r'\1', text).replace(';}', '}')
+
+
+def class_usage(source):
+    """Static class names and dynamic prefixes (status-${...}) used in className attributes."""
+    classes, prefixes = set(), set()
+    for plain, template, expression in CLASSNAME_ATTR.findall(source):
+        if template:
+            prefixes.update(TEMPLATE_PREFIX.findall(template))
+            classes.update(token for token in TEMPLATE_EXPR.sub(' ', template).split() if not token.endswith('-'))
+        elif expression:
+            for single, double in QUOTED.findall(expression):
+                classes.update((single or double).split())
+        else:
+            classes.update(plain.split())
+    return classes, prefixes
+
+
+def rule_matches(prelude, usage):
+    classes, prefixes = usage
+    for selector in prelude.split(','):
+        names = CSS_CLASS.findall(selector)
+        if all(name in classes or any(name.startswith(prefix) for prefix in prefixes) for name in names):
+            return True
+    return False
+
+
+def split_app_css(client_dir="client"):
+    """Inline the shell's CSS into index.html, give each lazy page its own
+    stylesheet with only the rules it renders, drop rules nothing renders,
+    remove the consumed App.css and print the byte savings."""
+    src = os.path.join(client_dir, "src")
+
+    def read(relative):
+        with open(os.path.join(src, relative)) as f:
+            return f.read()
+
+    def module_usage(modules):
+        classes, prefixes = set(), set()
+        for module in modules:
+            module_classes, module_prefixes = class_usage(read(module))
+            classes |= module_classes
+            prefixes |= module_prefixes
+        return classes, prefixes
+
+    # Each lazy page chunk also carries the components it imports
+    pages = LAZY_PAGE.findall(read("routes.js"))
+    page_modules = {
+        page: ["pages/%s.js" % page] + ["components/%s.js" % name for name in COMPONENT_IMPORT.findall(read("pages/%s.js" % page))]
+        for page in pages
+    }
+    critical_usage = module_usage(EAGER_MODULES)
+    page_usage = {page: module_usage(modules) for page, modules in page_modules.items()}
+
+    source_path = os.path.join(src, "App.css")
+    if not os.path.exists(source_path):
+        print("CSS split skipped: client/src/App.css not found (run gen.py first)")
+        return
+    source = read("App.css")
+    blocks = parse_css(CSS_COMMENT.sub('', source))
+    outputs = {'critical': [], **{page: [] for page in pages}}
+    keyframes = []
+    pruned = []
+
+    def destinations(prelude):
+        if rule_matches(prelude, critical_usage):
+            return ['critical']
+        return [page for page in pages if rule_matches(prelude, page_usage[page])]
+
+    for block in blocks:
+        if block['prelude'].startswith('@keyframes'):
+            keyframes.append(block)
+        elif 'rules' in block:
+            grouped = {}
+            for rule in block['rules']:
+                targets = destinations(rule['prelude'])
+                if not targets:
+                    pruned.append(rule)
+                for target in targets:
+                    grouped.setdefault(target, []).append(rule)
+            for target, rules in grouped.items():
+                outputs[target].append({'prelude': block['prelude'], 'rules': rules})
+        else:
+            targets = destinations(block['prelude'])
+            if not targets:
+                pruned.append(block)
+            for target in targets:
+                outputs[target].append(block)
+
+    # Keyframes travel with the stylesheets whose rules animate with them
+    for block in keyframes:
+        name = block['prelude'].split()[-1]
+        users = [target for target, rules in outputs.items() if re.search(r'animation[\w-]*:[^;]*\b%s\b' % re.escape(name), format_css(rules))]
+        if not users:
+            pruned.append(block)
+        for target in users:
+            outputs[target].append(block)
+
+    critical_css = minify_css(outputs['critical'])
+    index_path = os.path.join(client_dir, "public", "index.html")
+    with open(index_path) as f:
+        index_html = f.read()
+    index_html = re.sub(r'\s*<style data-critical-css>.*?</style>', '', index_html, flags=re.S)
+    index_html = index_html.replace("</head>", "  <style data-critical-css>%s</style>\n  </head>" % critical_css, 1)
+    create_file(index_path, index_html)
+
+    header = "/* Generated from App.css by gen2.py: rules used by the %s route chunk */\n\n"
+    for page in pages:
+        create_file(os.path.join(src, "pages", "%s.css" % page), header % page + format_css(outputs[page]))
+
+    # Nothing imports App.css; its rules now live in the files above
+    os.remove(source_path)
+
+    # Report: the whole stylesheet used to block first paint on every route.
+    # The inlined critical CSS still blocks it, but needs no extra request.
+    original = len(source.encode())
+    critical_bytes = len(critical_css.encode())
+    page_bytes = {page: len(format_css(outputs[page]).encode()) for page in pages}
+    print("CSS split from App.css (%d bytes, render-blocking on every route):" % original)
+    print("  %-40s %6d bytes" % ("critical, inlined into index.html", critical_bytes))
+    for page in pages:
+        print("  %-40s %6d bytes" % (page + ".css (lazy chunk)", page_bytes[page]))
+    print("  %-40s %6d bytes" % ("pruned (%d rules nothing renders)" % len(pruned), len(format_css(pruned).encode())))
+    print("  render-blocking CSS: %d bytes stylesheet -> %d bytes inlined; worst-case CSS for one route: %d bytes"
+          % (original, critical_bytes, critical_bytes + max(page_bytes.values() or [0])))
+
+
 def generate_juba_codebase():
     # AuthContext.js
     auth_context = """import React, { createContext, useContext, useState, useEffect } from 'react';
 import axios from 'axios';
+import { fetchQuery, clearQueryCache } from '../queryCache';
 
 const AuthContext = createContext();
 
+const TOKEN_KEY = 'juba_token';
+const PROFILE_KEY = 'juba_profile';
+// Bump when the stored profile's shape changes so older entries are ignored
+const PROFILE_CACHE_VERSION = 1;
+
 export const useAuth = () => {
   return useContext(AuthContext);
 };
 
+// Claims are only read for display and routing; the server verifies the token
+const decodeToken = (token) => {
+  try {
+    const payload = token.split('.')[1].replace(/-/g, '+').replace(/_/g, '/');
+    const bytes = Uint8Array.from(atob(payload), char => char.charCodeAt(0));
+    return JSON.parse(new TextDecoder().decode(bytes));
+  } catch (error) {
+    return null;
+  }
+};
+
+const readCachedProfile = (userId) => {
+  try {
+    const cached = JSON.parse(localStorage.getItem(PROFILE_KEY));
+    return cached?.version === PROFILE_CACHE_VERSION && cached.profile?.id === userId ? cached : null;
+  } catch (error) {
+    return null;
+  }
+};
+
+// etag is the server's version stamp for this profile, sent back as If-None-Match
+const writeCachedProfile = (profile, etag = null) => {
+  localStorage.setItem(PROFILE_KEY, JSON.stringify({ version: PROFILE_CACHE_VERSION, etag, profile }));
+};
+
+const clearSession = () => {
+  localStorage.removeItem(TOKEN_KEY);
+  localStorage.removeItem(PROFILE_KEY);
+  delete axios.defaults.headers.common['Authorization'];
+};
+
+// Runs before the first render so the pages' first requests carry the token.
+// The user comes from the cached profile, or from the JWT claims until the
+// profile arrives, so nothing waits on the network.
+const restoreSession = () => {
+  const token = localStorage.getItem(TOKEN_KEY);
+  const claims = token && decodeToken(token);
+  if (!claims || (claims.exp && claims.exp * 1000 <= Date.now())) {
+    if (token) {
+      clearSession();
+    }
+    return { token: null, user: null, etag: null };
+  }
+
+  axios.defaults.headers.common['Authorization'] = `Bearer ${token}`;
+  const cached = readCachedProfile(claims.id);
+  if (cached) {
+    return { token, user: cached.profile, etag: cached.etag };
+  }
+  const { id, email, role, admin_status } = claims;
+  return { token, user: { id, email, role, admin_status }, etag: null };
+};
+
 export const AuthProvider = ({ children }) => {
-  const [currentUser, setCurrentUser] = useState(null);
-  const [loading, setLoading] = useState(true);
+  const [session] = useState(restoreSession);
+  const [currentUser, setCurrentUser] = useState(session.user);
 
   useEffect(() => {
-    // Check if user is logged in on app load
-    const token = localStorage.getItem('juba_token');
-    if (token) {
-      axios.defaults.headers.common['Authorization'] = `Bearer ${token}`;
-      // Fetch user profile
-      axios.get('/api/users/profile')
-        .then(response => {
-          setCurrentUser(response.data);
-        })
-        .catch(error => {
-          console.error('Auth check failed:', error);
-          localStorage.removeItem('juba_token');
-          delete axios.defaults.headers.common['Authorization'];
-        })
-        .finally(() => {
-          setLoading(false);
-        });
-    } else {
-      setLoading(false);
+    if (!session.token) {
+      return;
     }
-  }, []);
+
+    // Revalidate in the background; 304 means the cached profile is current
+    fetchQuery('profile', async () => {
+      const response = await axios.get('/api/users/profile', {
+        headers: session.etag ? { 'If-None-Match': session.etag } : {},
+        validateStatus: status => status === 200 || status === 304
+      });
+      if (response.status === 304) {
+        return readCachedProfile(session.user.id)?.profile || session.user;
+      }
+      writeCachedProfile(response.data, response.headers.etag || null);
+      return response.data;
+    })
+      .then(profile => {
+        // Ignore a late answer after logout or a new login
+        if (localStorage.getItem(TOKEN_KEY) === session.token) {
+          setCurrentUser(profile);
+        }
+      })
+      .catch(error => {
+        console.error('Auth check failed:', error);
+        // Offline or server errors keep the cached user; a rejected token does not
+        if ([401, 403, 404].includes(error.response?.status) && localStorage.getItem(TOKEN_KEY) === session.token) {
+          clearSession();
+          clearQueryCache();
+          setCurrentUser(null);
+        }
+      });
+  }, [session]);
 
   const login = (token, user) => {
-    localStorage.setItem('juba_token', token);
+    localStorage.setItem(TOKEN_KEY, token);
+    writeCachedProfile(user);
     axios.defaults.headers.common['Authorization'] = `Bearer ${token}`;
+    clearQueryCache();
     setCurrentUser(user);
   };
 
   const logout = () => {
-    localStorage.removeItem('juba_token');
-    delete axios.defaults.headers.common['Authorization'];
+    clearSession();
+    clearQueryCache();
     setCurrentUser(null);
   };
 
@@ -68,12 +326,201 @@ export const AuthProvider = ({ children }) => {
 
   return (
     <AuthContext.Provider value={value}>
-      {!loading && children}
+      {children}
     </AuthContext.Provider>
   );
 };
 """
     create_file("client/src/context/AuthContext.js", auth_context)
+
+    # Shared query cache for page data
+    query_cache = """import { useState, useEffect, useCallback, useRef } from 'react';
+
+// Keyed in-memory cache shared by the pages. Entries are served immediately
+// and revalidated in the background once older than staleTime; concurrent
+// fetches for the same key share one request.
+const DEFAULT_STALE_TIME = 30 * 1000;
+const MAX_IDLE_ENTRIES = 50;
+
+const entries = new Map();
+
+const getEntry = (key) => {
+  let entry = entries.get(key);
+  if (!entry) {
+    // version is bumped by every local write; mutations counts pending ones
+    entry = { data: undefined, error: null, updatedAt: 0, promise: null, version: 0, mutations: 0, subscribers: new Set() };
+    entries.set(key, entry);
+  }
+  return entry;
+};
+
+const notify = (entry) => {
+  entry.subscribers.forEach(listener => listener());
+};
+
+// Keep a stable reference when a refetch returns identical data so
+// background revalidation does not re-render unchanged pages
+const sameData = (a, b) => {
+  if (a === b) return true;
+  try {
+    return JSON.stringify(a) === JSON.stringify(b);
+  } catch (error) {
+    return false;
+  }
+};
+
+// Drop the oldest entries nobody is looking at
+const pruneIdleEntries = () => {
+  const idle = [...entries].filter(([, entry]) => entry.subscribers.size === 0 && !entry.promise);
+  if (idle.length <= MAX_IDLE_ENTRIES) return;
+  idle
+    .sort((a, b) => a[1].updatedAt - b[1].updatedAt)
+    .slice(0, idle.length - MAX_IDLE_ENTRIES)
+    .forEach(([key]) => entries.delete(key));
+};
+
+export const fetchQuery = (key, fetcher, { staleTime = DEFAULT_STALE_TIME, force = false } = {}) => {
+  const entry = getEntry(key);
+  if (entry.promise) {
+    return entry.promise;
+  }
+  if (!force && entry.updatedAt && Date.now() - entry.updatedAt < staleTime) {
+    return Promise.resolve(entry.data);
+  }
+  // The server has not seen a pending mutation yet; its answer would undo it
+  if (entry.mutations > 0) {
+    return Promise.resolve(entry.data);
+  }
+
+  const version = entry.version;
+  const promise = fetcher()
+    .then(data => {
+      // Drop results that started before a local write
+      if (entry.promise !== promise || entry.version !== version) return entry.data;
+      if (!sameData(entry.data, data)) {
+        entry.data = data;
+      }
+      entry.error = null;
+      entry.updatedAt = Date.now();
+      return entry.data;
+    })
+    .catch(error => {
+      if (entry.promise === promise) {
+        entry.error = error;
+      }
+      throw error;
+    })
+    .finally(() => {
+      if (entry.promise === promise) {
+        entry.promise = null;
+        notify(entry);
+        pruneIdleEntries();
+      }
+    });
+
+  entry.promise = promise;
+  return promise;
+};
+
+export const getQueryData = (key) => entries.get(key)?.data;
+
+// Write a mutation result straight into the cache instead of refetching
+export const setQueryData = (key, updater) => {
+  const entry = getEntry(key);
+  const data = typeof updater === 'function' ? updater(entry.data) : updater;
+  entry.data = data;
+  entry.error = null;
+  entry.updatedAt = Date.now();
+  // A response already in flight would overwrite the newer local value
+  entry.version += 1;
+  entry.promise = null;
+  notify(entry);
+};
+
+// Hold off revalidation of key while an optimistic update is in flight.
+// Returns the function that ends the hold once the mutation settles.
+export const beginMutation = (key) => {
+  const entry = getEntry(key);
+  entry.mutations += 1;
+  entry.version += 1;
+  entry.promise = null;
+  let ended = false;
+  return () => {
+    if (!ended) {
+      ended = true;
+      entry.mutations -= 1;
+    }
+  };
+};
+
+// Mark every key starting with prefix as stale; mounted queries refetch,
+// the rest refetch the next time they are used
+export const invalidateQueries = (prefix) => {
+  entries.forEach((entry, key) => {
+    if (key.startsWith(prefix)) {
+      entry.updatedAt = 0;
+      entry.promise = null;
+      notify(entry);
+    }
+  });
+};
+
+// Cached responses belong to the signed-in user
+export const clearQueryCache = () => {
+  entries.forEach(entry => {
+    entry.data = undefined;
+    entry.error = null;
+    entry.updatedAt = 0;
+    entry.promise = null;
+  });
+  entries.forEach((entry, key) => {
+    if (entry.subscribers.size === 0) entries.delete(key);
+  });
+};
+
+export const useQuery = (key, fetcher, { staleTime = DEFAULT_STALE_TIME, enabled = true } = {}) => {
+  const [, forceRender] = useState(0);
+  const fetcherRef = useRef(fetcher);
+  fetcherRef.current = fetcher;
+
+  const run = useCallback((force = false) => {
+    return fetchQuery(key, () => fetcherRef.current(), { staleTime, force }).catch(() => {});
+  }, [key, staleTime]);
+
+  useEffect(() => {
+    if (!enabled) return undefined;
+    const entry = getEntry(key);
+    const listener = () => {
+      forceRender(n => n + 1);
+      // Invalidation resets updatedAt; pick it up while mounted
+      if (!entry.promise && !entry.updatedAt && !entry.error) run();
+    };
+    entry.subscribers.add(listener);
+    run();
+
+    const onFocus = () => {
+      if (document.visibilityState === 'visible') run();
+    };
+    window.addEventListener('focus', onFocus);
+    window.addEventListener('online', onFocus);
+    return () => {
+      entry.subscribers.delete(listener);
+      window.removeEventListener('focus', onFocus);
+      window.removeEventListener('online', onFocus);
+    };
+  }, [key, enabled, run]);
+
+  const entry = entries.get(key);
+  const data = enabled ? entry?.data : undefined;
+  return {
+    data,
+    error: enabled ? entry?.error || null : null,
+    loading: enabled && data === undefined && !entry?.error,
+    refetch: () => run(true)
+  };
+};
+"""
+    create_file("client/src/queryCache.js", query_cache)
     
     # Header component
     header_component = """import React from 'react';
@@ -121,6 +568,84 @@ const Header = () => {
 export default Header;
 """
     create_file("client/src/components/Header.js", header_component)
+
+    # Windowed table for long admin lists
+    virtual_table_component = """import React, { useState, useEffect, useRef } from 'react';
+
+// Renders only the rows inside the scroll viewport (plus overscan) between
+// two spacer rows, and asks for the next page when the end comes into view.
+// Rows must share one fixed height.
+const VirtualTable = ({
+  columns,
+  rows,
+  rowKey,
+  rowHeight = 48,
+  height = 480,
+  overscan = 6,
+  hasMore = false,
+  loadingMore = false,
+  onLoadMore
+}) => {
+  const [firstVisible, setFirstVisible] = useState(0);
+  const onLoadMoreRef = useRef(onLoadMore);
+  onLoadMoreRef.current = onLoadMore;
+
+  const handleScroll = (e) => {
+    const index = Math.floor(e.currentTarget.scrollTop / rowHeight);
+    if (index !== firstVisible) {
+      setFirstVisible(index);
+    }
+  };
+
+  const visibleCount = Math.ceil(height / rowHeight);
+  const start = Math.max(0, firstVisible - overscan);
+  const end = Math.min(rows.length, firstVisible + visibleCount + overscan);
+  const nearEnd = end >= rows.length - overscan;
+
+  useEffect(() => {
+    if (nearEnd && hasMore && !loadingMore && onLoadMoreRef.current) {
+      onLoadMoreRef.current();
+    }
+  }, [nearEnd, hasMore, loadingMore, rows.length]);
+
+  return (
+    <div className="virtual-table-scroll" style={{ maxHeight: height }} onScroll={handleScroll}>
+      <table className="table virtual-table">
+        <thead>
+          <tr>
+            {columns.map(column => (
+              <th key={column.key}>{column.header}</th>
+            ))}
+          </tr>
+        </thead>
+        <tbody>
+          {start > 0 && (
+            <tr className="virtual-table-spacer" style={{ height: start * rowHeight }}>
+              <td colSpan={columns.length}></td>
+            </tr>
+          )}
+          {rows.slice(start, end).map(row => (
+            <tr key={rowKey(row)} style={{ height: rowHeight }}>
+              {columns.map(column => (
+                <td key={column.key}>{column.render(row)}</td>
+              ))}
+            </tr>
+          ))}
+          {end < rows.length && (
+            <tr className="virtual-table-spacer" style={{ height: (rows.length - end) * rowHeight }}>
+              <td colSpan={columns.length}></td>
+            </tr>
+          )}
+        </tbody>
+      </table>
+      {loadingMore && <div className="virtual-table-status">Loading...</div>}
+    </div>
+  );
+};
+
+export default VirtualTable;
+"""
+    create_file("client/src/components/VirtualTable.js", virtual_table_component)
     
     # Home page
     home_page = """import React from 'react';
@@ -193,6 +718,7 @@ import { GoogleLogin } from '@react-oauth/google';
 import { useAuth } from '../context/AuthContext';
 import { useNavigate } from 'react-router-dom';
 import axios from 'axios';
+import './Login.css';
 
 const Login = () => {
   const [formData, setFormData] = useState({
@@ -291,34 +817,95 @@ export default Login;
     dashboard_page = """import React, { useState, useEffect } from 'react';
 import { Link } from 'react-router-dom';
 import { useAuth } from '../context/AuthContext';
+import { useQuery, fetchQuery, setQueryData } from '../queryCache';
 import axios from 'axios';
+import './Dashboard.css';
 
-const Dashboard = () => {
-  const { currentUser } = useAuth();
-  const [jobs, setJobs] = useState([]);
-  const [loading, setLoading] = useState(true);
+const dismissJob = (jobId) => {
+  setQueryData('jobs:mine', jobs => (jobs || []).filter(job => job.id !== jobId));
+};
+
+// Clients' own jobs, or the jobs a freelancer has applied to
+const fetchMyJobs = async () => {
+  const response = await axios.get('/api/jobs/mine');
+  return response.data.jobs;
+};
+
+const fetchAvailableJobs = async () => {
+  const response = await axios.get('/api/jobs', { params: { status: 'posted' } });
+  return response.data.jobs;
+};
+
+const SEARCH_DEBOUNCE_MS = 300;
+
+// Same rule as the server's normalizeSearch, so one logical query maps to
+// one entry in both the client and the server caches
+const SEARCH_MAX_LENGTH = 100;
+const normalizeSearch = (text) => {
+  return text.toLowerCase().split(/\\s+/).filter(Boolean).join(' ').slice(0, SEARCH_MAX_LENGTH).trim();
+};
+
+// Searches once typing pauses; a newer query aborts the request still in
+// flight, so a slow stale response can never replace fresher results
+const useJobSearch = (text) => {
+  const [results, setResults] = useState(null);
+  const [searching, setSearching] = useState(false);
 
   useEffect(() => {
-    fetchUserJobs();
-  }, []);
+    const search = normalizeSearch(text);
+    if (!search) {
+      setResults(null);
+      setSearching(false);
+      return undefined;
+    }
 
-  const fetchUserJobs = async () => {
-    try {
-      let endpoint = '/api/jobs';
-      if (currentUser.role === 'freelancer') {
-        endpoint += '?status=posted';
+    const controller = new AbortController();
+    setSearching(true);
+    const timer = setTimeout(async () => {
+      try {
+        const jobs = await fetchQuery(`jobs:search:${search}`, async () => {
+          const response = await axios.get('/api/jobs/search', {
+            params: { q: search, status: 'posted' },
+            signal: controller.signal
+          });
+          return response.data.jobs;
+        });
+        setResults(jobs);
+      } catch (error) {
+        if (!axios.isCancel(error)) {
+          console.error('Job search failed:', error);
+        }
+      } finally {
+        if (!controller.signal.aborted) {
+          setSearching(false);
+        }
       }
-      
-      const response = await axios.get(endpoint);
-      setJobs(response.data.jobs);
-    } catch (error) {
-      console.error('Error fetching jobs:', error);
-    } finally {
-      setLoading(false);
-    }
-  };
+    }, SEARCH_DEBOUNCE_MS);
+
+    return () => {
+      clearTimeout(timer);
+      controller.abort();
+    };
+  }, [text]);
+
+  return { results, searching };
+};
+
+const Dashboard = () => {
+  const { currentUser } = useAuth();
+  const isFreelancer = currentUser.role === 'freelancer';
+  const myJobsQuery = useQuery('jobs:mine', fetchMyJobs);
+  const availableQuery = useQuery('jobs:available', fetchAvailableJobs, { enabled: isFreelancer });
+  const [searchText, setSearchText] = useState('');
+  const search = useJobSearch(searchText);
+  const jobs = (isFreelancer ? search.results || availableQuery.data : myJobsQuery.data) || [];
+  const myApplications = isFreelancer ? myJobsQuery.data || [] : [];
+
+  if (myJobsQuery.error || availableQuery.error) {
+    console.error('Error fetching jobs:', myJobsQuery.error || availableQuery.error);
+  }
 
-  if (loading) {
+  if (myJobsQuery.loading || availableQuery.loading) {
     return <div className="spinner"></div>;
   }
 
@@ -350,8 +937,17 @@ const Dashboard = () => {
                       <span>Status: {job.status}</span>
                       <span>Location: {job.location}</span>
                       <span>Posted: {new Date(job.created_at).toLocaleDateString()}</span>
+                      <span>Applications: {job.application_count}</span>
                     </div>
-                    <Link to={`/job/${job.id}`} className="btn btn-secondary">View Details</Link>
+                    {job.pending && <div className="alert">Posting...</div>}
+                    {job.postError ? (
+                      <>
+                        <div className="form-error">{job.postError}</div>
+                        <button onClick={() => dismissJob(job.id)} className="btn btn-secondary">Dismiss</button>
+                      </>
+                    ) : !job.pending && (
+                      <Link to={`/job/${job.id}`} className="btn btn-secondary">View Details</Link>
+                    )}
                   </div>
                 ))}
               </div>
@@ -359,10 +955,40 @@ const Dashboard = () => {
           </>
         ) : (
           <>
+            {myApplications.length > 0 && (
+              <>
+                <h2>Your Applications</h2>
+                <div className="job-list">
+                  {myApplications.map(job => (
+                    <div key={job.application.id} className="job-item">
+                      <h3 className="job-title">{job.title}</h3>
+                      <div className="job-meta">
+                        <span>Application: {job.application.status}</span>
+                        <span>Proposed Rate: R{job.application.proposed_rate}</span>
+                        <span>Job Status: {job.status}</span>
+                        <span>Client: {job.client?.email}</span>
+                      </div>
+                      <Link to={`/job/${job.id}`} className="btn btn-secondary">View Details</Link>
+                    </div>
+                  ))}
+                </div>
+              </>
+            )}
+
             <h2>Available Jobs</h2>
+            <div className="form-group">
+              <input
+                type="search"
+                className="form-input"
+                value={searchText}
+                onChange={(e) => setSearchText(e.target.value)}
+                placeholder="Search jobs by title"
+              />
+              {search.searching && <p className="job-meta">Searching...</p>}
+            </div>
             {jobs.length === 0 ? (
               <div className="empty-state">
-                <p>No jobs available at the moment.</p>
+                <p>{search.results ? 'No jobs match your search.' : 'No jobs available at the moment.'}</p>
               </div>
             ) : (
               <div className="job-list">
@@ -396,6 +1022,10 @@ export default Dashboard;
 import { useNavigate } from 'react-router-dom';
 import axios from 'axios';
 import { useAuth } from '../context/AuthContext';
+import { getQueryData, setQueryData, invalidateQueries, beginMutation } from '../queryCache';
+import './JobPost.css';
+
+const replaceJob = (jobId, update) => (jobs) => (jobs || []).map(job => job.id === jobId ? update(job) : job);
 
 const JobPost = () => {
   const [formData, setFormData] = useState({
@@ -404,7 +1034,6 @@ const JobPost = () => {
     location: '',
     timeline: ''
   });
-  const [loading, setLoading] = useState(false);
   const [error, setError] = useState('');
   const { currentUser } = useAuth();
   const navigate = useNavigate();
@@ -418,16 +1047,44 @@ const JobPost = () => {
 
   const handleSubmit = async (e) => {
     e.preventDefault();
-    setLoading(true);
     setError('');
 
+    // Catch the one-active-job rule locally when the dashboard list is cached
+    const cachedJobs = getQueryData('jobs:mine');
+    if (cachedJobs?.some(job => !job.postError && ['posted', 'in_progress'].includes(job.status))) {
+      setError('You can only have one active job at a time');
+      return;
+    }
+
+    // Show the job on the dashboard straight away; the POST settles it there
+    const hadJobList = cachedJobs !== undefined;
+    const pendingJob = {
+      ...formData,
+      id: `pending-${Date.now()}`,
+      client_id: currentUser.id,
+      status: 'posted',
+      created_at: new Date().toISOString(),
+      application_count: 0,
+      pending: true
+    };
+    const endMutation = beginMutation('jobs:mine');
+    setQueryData('jobs:mine', jobs => [pendingJob, ...(jobs || [])]);
+    navigate('/dashboard');
+
     try {
       const response = await axios.post('/api/jobs', formData);
-      navigate('/dashboard');
+      const { job } = response.data;
+      setQueryData('jobs:mine', replaceJob(pendingJob.id, () => ({ ...job, application_count: 0 })));
+      setQueryData(`job:${job.id}`, { ...job, applications: [] });
     } catch (error) {
-      setError(error.response?.data?.error || 'Failed to post job');
+      // Roll back to a failed entry the dashboard can report and dismiss
+      const postError = error.response?.data?.error || 'Failed to post job';
+      setQueryData('jobs:mine', replaceJob(pendingJob.id, job => ({ ...job, pending: false, postError })));
     } finally {
-      setLoading(false);
+      endMutation();
+    }
+    if (!hadJobList) {
+      invalidateQueries('jobs:mine');
     }
   };
 
@@ -499,9 +1156,7 @@ const JobPost = () => {
             />
           </div>
 
-          <button type="submit" className="btn btn-primary" disabled={loading}>
-            {loading ? 'Posting...' : 'Post Job'}
-          </button>
+          <button type="submit" className="btn btn-primary">Post Job</button>
         </form>
       </div>
     </div>
@@ -513,52 +1168,78 @@ export default JobPost;
     create_file("client/src/pages/JobPost.js", jobpost_page)
     
     # JobDetails page
-    jobdetails_page = """import React, { useState, useEffect } from 'react';
+    jobdetails_page = """import React, { useState } from 'react';
 import { useParams } from 'react-router-dom';
 import axios from 'axios';
 import { useAuth } from '../context/AuthContext';
+import { useQuery, getQueryData, setQueryData, beginMutation } from '../queryCache';
+import './JobDetails.css';
 
 const JobDetails = () => {
   const { id } = useParams();
-  const [job, setJob] = useState(null);
-  const [loading, setLoading] = useState(true);
   const [error, setError] = useState('');
   const [applicationData, setApplicationData] = useState({
     proposed_rate: ''
   });
   const { currentUser } = useAuth();
+  const { data: job, error: fetchError, loading } = useQuery(`job:${id}`, async () => {
+    const response = await axios.get(`/api/jobs/${id}`);
+    return response.data;
+  });
 
-  useEffect(() => {
-    fetchJobDetails();
-  }, [id]);
-
-  const fetchJobDetails = async () => {
-    try {
-      const response = await axios.get(`/api/jobs/${id}`);
-      setJob(response.data);
-    } catch (error) {
-      setError('Failed to fetch job details');
-    } finally {
-      setLoading(false);
-    }
+  const updateApplications = (update) => {
+    setQueryData(`job:${id}`, current => current && {
+      ...current,
+      applications: update(current.applications || [])
+    });
   };
 
   const handleApply = async (e) => {
     e.preventDefault();
+    setError('');
+
+    // Show the application immediately, then swap in the stored row.
+    // Focus revalidations of the job wait until the POST settles.
+    const endMutation = beginMutation(`job:${id}`);
+    const pendingId = `pending-${Date.now()}`;
+    updateApplications(applications => [...applications, {
+      id: pendingId,
+      job_id: id,
+      freelancer_id: currentUser.id,
+      proposed_rate: applicationData.proposed_rate,
+      status: 'pending',
+      freelancer: { id: currentUser.id, email: currentUser.email }
+    }]);
+
     try {
-      await axios.post(`/api/jobs/${id}/apply`, applicationData);
-      alert('Application submitted successfully!');
-      fetchJobDetails(); // Refresh job details
+      const response = await axios.post(`/api/jobs/${id}/apply`, applicationData);
+      if (response.data.queued) {
+        // Offline: the service worker sends it once the connection is back
+        updateApplications(applications => applications.map(app => app.id === pendingId ? { ...app, queued: true } : app));
+        return;
+      }
+      const { application } = response.data;
+      updateApplications(applications => applications.map(app => app.id === pendingId ? application : app));
+
+      const { applications, ...appliedJob } = getQueryData(`job:${id}`) || {};
+      const { freelancer, ...ownApplication } = application;
+      if (getQueryData('jobs:mine')) {
+        setQueryData('jobs:mine', jobs => [{ ...appliedJob, application: ownApplication }, ...jobs]);
+      }
     } catch (error) {
+      updateApplications(applications => applications.filter(app => app.id !== pendingId));
       setError(error.response?.data?.error || 'Failed to apply');
+    } finally {
+      endMutation();
     }
   };
 
   if (loading) return <div className="spinner"></div>;
-  if (error) return <div className="error">{error}</div>;
+  if (fetchError) return <div className="error">Failed to fetch job details</div>;
   if (!job) return <div>Job not found</div>;
 
-  const hasApplied = job.applications?.some(app => app.freelancer_id === currentUser?.id);
+  const ownApplication = job.applications?.find(app => app.freelancer_id === currentUser?.id);
+  const hasApplied = Boolean(ownApplication);
   const isJobOwner = job.client_id === currentUser?.id;
 
   return (
@@ -587,6 +1268,7 @@ const JobDetails = () => {
         {currentUser?.role === 'freelancer' && job.status === 'posted' && !hasApplied && (
           <div className="job-section">
             <h3>Apply for this Job</h3>
+            {error && <div className="form-error">{error}</div>}
             <form onSubmit={handleApply} className="form">
               <div className="form-group">
                 <label className="form-label">Your Proposed Rate (R)</label>
@@ -606,7 +1288,11 @@ const JobDetails = () => {
 
         {hasApplied && (
           <div className="job-section">
-            <div className="alert alert-success">You have already applied to this job</div>
+            {ownApplication.queued ? (
+              <div className="alert">You are offline. Your application will be sent when you reconnect.</div>
+            ) : (
+              <div className="alert alert-success">You have already applied to this job</div>
+            )}
           </div>
         )}
 
@@ -641,6 +1327,7 @@ export default JobDetails;
 import { useNavigate } from 'react-router-dom';
 import axios from 'axios';
 import { useAuth } from '../context/AuthContext';
+import './FreelancerApplication.css';
 
 const FreelancerApplication = () => {
   const [formData, setFormData] = useState({
@@ -812,49 +1499,139 @@ export default FreelancerApplication;
     create_file("client/src/pages/FreelancerApplication.js", freelancer_application_page)
     
     # AdminDashboard page
-    admin_dashboard_page = """import React, { useState, useEffect } from 'react';
+    admin_dashboard_page = """import React, { useState, useRef } from 'react';
 import axios from 'axios';
 import { useAuth } from '../context/AuthContext';
+import { useQuery } from '../queryCache';
+import VirtualTable from '../components/VirtualTable';
+import './AdminDashboard.css';
+
+const ADMIN_PAGE_SIZE = 50;
+
+const userColumns = [
+  { key: 'email', header: 'Email', render: user => user.email },
+  { key: 'role', header: 'Role', render: user => user.role },
+  {
+    key: 'status',
+    header: 'Status',
+    render: user => user.role === 'freelancer' && user.freelancer_profile ? (
+      <span className={`status-badge status-${user.freelancer_profile.approval_status}`}>
+        {user.freelancer_profile.approval_status}
+      </span>
+    ) : (
+      <span className="status-badge status-approved">Active</span>
+    )
+  },
+  { key: 'joined', header: 'Joined', render: user => new Date(user.created_at).toLocaleDateString() }
+];
+
+const jobColumns = [
+  { key: 'title', header: 'Title', render: job => job.title },
+  { key: 'client', header: 'Client', render: job => job.client?.email },
+  {
+    key: 'status',
+    header: 'Status',
+    render: job => (
+      <span className={`status-badge status-${job.status}`}>
+        {job.status}
+      </span>
+    )
+  },
+  { key: 'applications', header: 'Applications', render: job => job.application_count },
+  { key: 'created', header: 'Created', render: job => new Date(job.created_at).toLocaleDateString() }
+];
+
+const fetchAdminOverview = async () => {
+  // KPIs come from the maintained stats row; lists load one page at a time
+  const [statsRes, usersRes, jobsRes] = await Promise.all([
+    axios.get('/api/admin/stats', { params: { days: 1 } }),
+    axios.get('/api/users/admin/users', { params: { limit: ADMIN_PAGE_SIZE } }),
+    axios.get('/api/jobs/admin/jobs', { params: { limit: ADMIN_PAGE_SIZE } })
+  ]);
+  
+  const { totals } = statsRes.data;
+  return {
+    stats: {
+      totalUsers: totals.total_users,
+      totalJobs: totals.total_jobs,
+      activeJobs: totals.posted_jobs,
+      pendingApplications: totals.pending_freelancer_profiles
+    },
+    users: usersRes.data.users,
+    usersCursor: usersRes.data.pagination.nextCursor,
+    jobs: jobsRes.data.jobs,
+    jobsCursor: jobsRes.data.pagination.nextCursor
+  };
+};
+
+const emptyPages = { users: [], usersCursor: undefined, jobs: [], jobsCursor: undefined };
+
+// A revalidated first page can overlap rows already loaded below it
+const appendUnique = (first, more) => {
+  const ids = new Set(first.map(row => row.id));
+  return [...first, ...more.filter(row => !ids.has(row.id))];
+};
 
 const AdminDashboard = () => {
-  const [stats, setStats] = useState({});
-  const [users, setUsers] = useState([]);
-  const [jobs, setJobs] = useState([]);
-  const [loading, setLoading] = useState(true);
   const { currentUser } = useAuth();
+  const { data: overview, error, loading, refetch } = useQuery('admin:overview', fetchAdminOverview, {
+    enabled: Boolean(currentUser?.admin_status)
+  });
+  // Pages loaded while scrolling are appended to the cached first page and
+  // survive background revalidation; only an explicit refresh drops them
+  const [morePages, setMorePages] = useState(emptyPages);
+  const [loadingMore, setLoadingMore] = useState({ users: false, jobs: false });
+  const [failedMore, setFailedMore] = useState({ users: false, jobs: false });
+  // Bumped by refresh; pages requested before it are dropped on arrival
+  const generation = useRef(0);
+
+  const refresh = () => {
+    generation.current += 1;
+    setMorePages(emptyPages);
+    setLoadingMore({ users: false, jobs: false });
+    setFailedMore({ users: false, jobs: false });
+    refetch();
+  };
 
-  useEffect(() => {
-    if (currentUser?.admin_status) {
-      fetchAdminData();
-    }
-  }, [currentUser]);
+  if (error) {
+    console.error('Error fetching admin data:', error);
+  }
 
-  const fetchAdminData = async () => {
+  const stats = overview?.stats || {};
+  const users = appendUnique(overview?.users || [], morePages.users);
+  const jobs = appendUnique(overview?.jobs || [], morePages.jobs);
+  const usersCursor = morePages.usersCursor !== undefined ? morePages.usersCursor : overview?.usersCursor;
+  const jobsCursor = morePages.jobsCursor !== undefined ? morePages.jobsCursor : overview?.jobsCursor;
+
+  // list is 'users' or 'jobs', matching the response field and cursor name
+  const loadMore = async (list, endpoint, cursor) => {
+    const requestGeneration = generation.current;
+    const isCurrent = () => requestGeneration === generation.current;
+    setLoadingMore(prev => ({ ...prev, [list]: true }));
+    setFailedMore(prev => ({ ...prev, [list]: false }));
     try {
-      const [usersRes, jobsRes] = await Promise.all([
-        axios.get('/api/users/admin/users'),
-        axios.get('/api/jobs/admin/jobs')
-      ]);
-      
-      setUsers(usersRes.data);
-      setJobs(jobsRes.data.jobs);
-      
-      // Calculate basic stats
-      setStats({
-        totalUsers: usersRes.data.length,
-        totalJobs: jobsRes.data.jobs.length,
-        activeJobs: jobsRes.data.jobs.filter(job => job.status === 'posted').length,
-        pendingApplications: usersRes.data.filter(user => 
-          user.role === 'freelancer' && user.freelancer_profile?.approval_status === 'pending'
-        ).length
-      });
+      const response = await axios.get(endpoint, { params: { cursor, limit: ADMIN_PAGE_SIZE } });
+      if (!isCurrent()) return;
+      setMorePages(prev => ({
+        ...prev,
+        [list]: [...prev[list], ...response.data[list]],
+        [`${list}Cursor`]: response.data.pagination.nextCursor
+      }));
     } catch (error) {
-      console.error('Error fetching admin data:', error);
+      if (!isCurrent()) return;
+      console.error(`Error fetching ${list}:`, error);
+      // Stop infinite scroll from retrying in a loop; the button retries
+      setFailedMore(prev => ({ ...prev, [list]: true }));
     } finally {
-      setLoading(false);
+      if (isCurrent()) {
+        setLoadingMore(prev => ({ ...prev, [list]: false }));
+      }
     }
   };
 
+  const loadMoreUsers = () => loadMore('users', '/api/users/admin/users', usersCursor);
+  const loadMoreJobs = () => loadMore('jobs', '/api/jobs/admin/jobs', jobsCursor);
+
   if (!currentUser?.admin_status) {
     return (
       <div className="form-container">
@@ -870,7 +1647,10 @@ const AdminDashboard = () => {
 
   return (
     <div className="admin-dashboard">
-      <h1>Admin Dashboard</h1>
+      <div className="dashboard-header">
+        <h1>Admin Dashboard</h1>
+        <button onClick={refresh} className="btn btn-secondary">Refresh</button>
+      </div>
       
       <div className="admin-stats">
         <div className="stat-card">
@@ -894,66 +1674,32 @@ const AdminDashboard = () => {
       <div className="admin-sections">
         <div className="admin-section">
           <h2>Users</h2>
-          <div className="table-container">
-            <table className="table">
-              <thead>
-                <tr>
-                  <th>Email</th>
-                  <th>Role</th>
-                  <th>Status</th>
-                  <th>Joined</th>
-                </tr>
-              </thead>
-              <tbody>
-                {users.map(user => (
-                  <tr key={user.id}>
-                    <td>{user.email}</td>
-                    <td>{user.role}</td>
-                    <td>
-                      {user.role === 'freelancer' && user.freelancer_profile ? (
-                        <span className={`status-badge status-${user.freelancer_profile.approval_status}`}>
-                          {user.freelancer_profile.approval_status}
-                        </span>
-                      ) : (
-                        <span className="status-badge status-approved">Active</span>
-                      )}
-                    </td>
-                    <td>{new Date(user.created_at).toLocaleDateString()}</td>
-                  </tr>
-                ))}
-              </tbody>
-            </table>
-          </div>
+          <VirtualTable
+            columns={userColumns}
+            rows={users}
+            rowKey={user => user.id}
+            hasMore={Boolean(usersCursor) && !failedMore.users}
+            loadingMore={loadingMore.users}
+            onLoadMore={loadMoreUsers}
+          />
+          {failedMore.users && (
+            <button onClick={loadMoreUsers} className="btn btn-secondary">Retry Loading Users</button>
+          )}
         </div>
 
         <div className="admin-section">
           <h2>Recent Jobs</h2>
-          <div className="table-container">
-            <table className="table">
-              <thead>
-                <tr>
-                  <th>Title</th>
-                  <th>Client</th>
-                  <th>Status</th>
-                  <th>Created</th>
-                </tr>
-              </thead>
-              <tbody>
-                {jobs.slice(0, 10).map(job => (
-                  <tr key={job.id}>
-                    <td>{job.title}</td>
-                    <td>{job.client?.email}</td>
-                    <td>
-                      <span className={`status-badge status-${job.status}`}>
-                        {job.status}
-                      </span>
-                    </td>
-                    <td>{new Date(job.created_at).toLocaleDateString()}</td>
-                  </tr>
-                ))}
-              </tbody>
-            </table>
-          </div>
+          <VirtualTable
+            columns={jobColumns}
+            rows={jobs}
+            rowKey={job => job.id}
+            hasMore={Boolean(jobsCursor) && !failedMore.jobs}
+            loadingMore={loadingMore.jobs}
+            onLoadMore={loadMoreJobs}
+          />
+          {failedMore.jobs && (
+            <button onClick={loadMoreJobs} className="btn btn-secondary">Retry Loading Jobs</button>
+          )}
         </div>
       </div>
     </div>
@@ -963,5 +1709,8 @@ const AdminDashboard = () => {
 export default AdminDashboard;
 """
     create_file("client/src/pages/AdminDashboard.js", admin_dashboard_page)
+
+    split_app_css()
+
 if __name__ == "__main__":
     generate_juba_codebase()
\ No newline at end of file
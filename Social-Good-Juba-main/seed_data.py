@@ -0,0 +1,493 @@
+import os
+import re
+import sys
+import math
+import time
+import argparse
+from multiprocessing import Pool
+
+# Synthetic data for the schema generated by gen.py (server/db/migrations).
+# Writes PostgreSQL COPY text files, one directory per table split into
+# parts, plus load.sql which loads them in foreign key order with psql:
+#
+#   python seed_data.py --out seed-output --scale 10
+#   cd seed-output && psql "$DATABASE_URL" -f load.sql
+#
+# Every value is a pure function of (seed, table, row number), so each
+# part can be generated by a separate process without sharing state, and
+# foreign keys line up without keeping earlier tables in memory. Memory
+# use per worker is bounded by the write buffer.
+
+# Rows per unit of --scale
+BASE_COUNTS = {
+    "users": 100000,
+    "jobs": 200000,
+}
+
+FREELANCER_EVERY = 5          # every 5th user is a freelancer
+MAX_APPLICATIONS = 8          # applications per job: 0..8
+MAX_MESSAGES = 200            # messages per active or completed job: 0..200
+AVERAGE_MESSAGES = 25
+WRITE_BATCH = 5000            # rows buffered before each write
+DAY = 24 * 60 * 60
+SPAN_DAYS = 730               # rows are spread over the last two years
+
+# Postgres COPY text format: \N is NULL, and backslash, tab, newline and
+# carriage return are escaped
+COPY_ESCAPES = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"})
+COPY_SPECIAL = re.compile(r"[\\\t\n\r]")
+
+# Stable per-table prefixes so generated UUIDs never collide across tables
+TABLE_CODES = {
+    "users": 1,
+    "freelancer_profiles": 2,
+    "jobs": 3,
+    "job_applications": 4,
+    "transactions": 5,
+    "messages": 6,
+    "reviews": 7,
+}
+
+COLUMNS = {
+    "users": ["id", "google_id", "email", "phone", "address", "role", "admin_status",
+              "profile_completion_status", "verification_status", "created_at", "updated_at"],
+    "freelancer_profiles": ["id", "user_id", "bio", "experience_years", "service_areas",
+                            "hourly_rate_min", "hourly_rate_max", "certifications", "documents",
+                            "approval_status", "admin_notes", "coverage_areas", "created_at", "updated_at"],
+    "jobs": ["id", "client_id", "title", "description", "location", "status", "timeline",
+             "created_at", "completion_date", "archive_date"],
+    "job_applications": ["id", "job_id", "freelancer_id", "proposed_rate", "application_timestamp", "status"],
+    "transactions": ["id", "job_id", "client_id", "freelancer_id", "amount", "payment_status",
+                     "payment_date", "payment_reference"],
+    "messages": ["id", "job_id", "sender_id", "receiver_id", "content", "timestamp", "read_status"],
+    "reviews": ["id", "job_id", "reviewer_id", "reviewed_id", "rating", "comment", "timestamp"],
+}
+
+# Load order respects the foreign keys in the migration
+LOAD_ORDER = ["users", "freelancer_profiles", "jobs", "job_applications", "transactions", "messages", "reviews"]
+
+SERVICES = ["plumbing", "electrical", "painting", "carpentry", "cleaning", "gardening",
+            "moving", "roofing", "tiling", "welding", "tutoring", "laundry"]
+AREAS = ["Juba Central", "Gudele", "Munuki", "Kator", "Hai Malakal", "Jebel", "Lologo",
+         "Nyakuron", "Thongpiny", "Kololo"]
+TIMELINES = ["Today", "This week", "Within two weeks", "This month", "Flexible"]
+CERTIFICATIONS = ["Trade Test I", "Trade Test II", "First Aid", "Safety Induction", "Apprenticeship"]
+CHAT_LINES = ["Hello, is the job still available?", "I can come tomorrow morning.",
+              "What time suits you?", "Please bring your own tools.", "I have sent the address.",
+              "The work is finished, please check.", "Thank you, see you soon.",
+              "Can you share a photo of the problem?", "The price includes materials.",
+              "I am on my way."]
+REVIEW_COMMENTS = ["Great work, very professional.", "Arrived on time and finished quickly.",
+                   "Good communication throughout.", "Fair price and tidy work.",
+                   "Would hire again.", "Some delays but good result.", None]
+
+MASK = (1 << 64) - 1
+
+
+def mix(*parts):
+    # splitmix64 over the parts: a cheap deterministic hash used instead of
+    # a seeded RNG so any row can be derived on its own
+    value = 0x9E3779B97F4A7C15
+    for part in parts:
+        value = (value ^ part) & MASK
+        value = (value + 0x9E3779B97F4A7C15) & MASK
+        value = ((value ^ (value >> 30)) * 0xBF58476D1CE4E5B9) & MASK
+        value = ((value ^ (value >> 27)) * 0x94D049BB133111EB) & MASK
+        value ^= value >> 31
+    return value
+
+
+def row_id(table, number):
+    # A valid UUID whose first group names the table and last group the row
+    return "%08x-0000-4000-8000-%012x" % (TABLE_CODES[table], number)
+
+
+def timestamp(seconds):
+    return time.strftime("%Y-%m-%d %H:%M:%S+00", time.gmtime(seconds))
+
+
+def text_array(values):
+    return "{" + ",".join('"%s"' % value for value in values) + "}"
+
+
+def copy_line(values):
+    fields = []
+    for value in values:
+        if value is None:
+            fields.append("\\N")
+        elif value is True:
+            fields.append("t")
+        elif value is False:
+            fields.append("f")
+        else:
+            text = str(value)
+            fields.append(text.translate(COPY_ESCAPES) if COPY_SPECIAL.search(text) else text)
+    return "\t".join(fields) + "\n"
+
+
+class Dataset:
+    # Row counts and the deterministic relationships between tables
+
+    def __init__(self, scale, seed, now):
+        self.seed = seed
+        self.now = now
+        self.start = now - SPAN_DAYS * DAY
+        self.users = max(10, int(BASE_COUNTS["users"] * scale))
+        self.jobs = max(10, int(BASE_COUNTS["jobs"] * scale))
+        self.freelancers = (self.users + FREELANCER_EVERY - 1) // FREELANCER_EVERY
+        self.clients = self.users - self.freelancers
+
+    def rand(self, *parts):
+        return mix(self.seed, *parts)
+
+    # Users: every FREELANCER_EVERY-th user is a freelancer, user 1 is the admin
+    def freelancer_user(self, freelancer):
+        return freelancer * FREELANCER_EVERY
+
+    def client_user(self, client):
+        per_block = FREELANCER_EVERY - 1
+        return (client // per_block) * FREELANCER_EVERY + client % per_block + 1
+
+    def user_role(self, user):
+        if user % FREELANCER_EVERY == 0:
+            return "freelancer"
+        return "admin" if user == 1 else "client"
+
+    def user_created(self, user):
+        # Sign-ups grow over time: user ids are ordered by creation
+        return self.start + int((user / self.users) ** 0.5 * SPAN_DAYS * DAY * 0.9)
+
+    # Jobs: newer jobs are more likely to still be open
+    def job(self, job):
+        r = self.rand(TABLE_CODES["jobs"], job)
+        client = self.client_user(r % self.clients)
+        created = max(self.user_created(client), self.start + int(job / self.jobs * SPAN_DAYS * DAY))
+        age = (self.now - created) / (SPAN_DAYS * DAY)
+        roll = (r >> 20) % 100
+        if age < 0.05:
+            status = "posted" if roll < 60 else "in_progress" if roll < 90 else "cancelled"
+        elif roll < 8:
+            status = "cancelled"
+        elif roll < 15:
+            status = "posted"
+        elif roll < 25:
+            status = "in_progress"
+        else:
+            status = "completed"
+
+        applications = (r >> 30) % (MAX_APPLICATIONS + 1)
+        if status in ("in_progress", "completed"):
+            applications = max(1, applications)
+        return {
+            "client": client,
+            "created": created,
+            "status": status,
+            "applications": applications,
+            "service": SERVICES[(r >> 40) % len(SERVICES)],
+            "area": AREAS[(r >> 48) % len(AREAS)],
+        }
+
+    def applicant(self, job, index):
+        # Consecutive freelancers from a per-job offset, so no one applies twice
+        base = self.rand(TABLE_CODES["job_applications"], job) % self.freelancers
+        return self.freelancer_user((base + index) % self.freelancers)
+
+    def proposed_rate(self, job, index):
+        return 50 + self.rand(TABLE_CODES["job_applications"], job, index) % 951
+
+    def message_count(self, job):
+        r = self.rand(TABLE_CODES["messages"], job)
+        # Skewed towards short chats with a long tail
+        return min(MAX_MESSAGES, int(-AVERAGE_MESSAGES * _log_uniform(r)))
+
+    def completion_time(self, job, info):
+        return min(self.now, info["created"] + DAY * (1 + self.rand(TABLE_CODES["jobs"], job, 1) % 21))
+
+
+def _log_uniform(r):
+    # ln(u) for u in (0, 1], from 53 bits of r
+    return math.log(((r >> 11) + 1) / float(1 << 53))
+
+
+# Row generators: each yields COPY lines for rows [start, end) of its
+# partition key (user number for users/profiles, job number otherwise)
+
+def users_rows(data, start, end):
+    for user in range(start, end):
+        created = data.user_created(user)
+        role = data.user_role(user)
+        r = data.rand(TABLE_CODES["users"], user)
+        yield copy_line([
+            row_id("users", user),
+            "seed-google-%d" % user,
+            "user%d@seed.juba.example" % user,
+            "+2119%08d" % (r % 100000000),
+            "%s, plot %d" % (AREAS[(r >> 32) % len(AREAS)], 1 + (r >> 40) % 900),
+            role,
+            role == "admin",
+            (r >> 8) % 10 < 8,
+            (r >> 12) % 10 < 6,
+            timestamp(created),
+            timestamp(created + (r >> 16) % (30 * DAY)),
+        ])
+
+
+def freelancer_profiles_rows(data, start, end):
+    for freelancer in range(start, end):
+        user = data.freelancer_user(freelancer)
+        r = data.rand(TABLE_CODES["freelancer_profiles"], freelancer)
+        service = SERVICES[r % len(SERVICES)]
+        second = SERVICES[(r >> 8) % len(SERVICES)]
+        rate_min = 50 + (r >> 16) % 300
+        created = data.user_created(user) + (r >> 24) % (14 * DAY)
+        approval = (r >> 40) % 100
+        yield copy_line([
+            row_id("freelancer_profiles", freelancer),
+            row_id("users", user),
+            "Experienced in %s and %s, available across Juba." % (service, second),
+            (r >> 44) % 25,
+            text_array([service, second]),
+            rate_min,
+            rate_min + 50 + (r >> 50) % 400,
+            text_array([CERTIFICATIONS[(r >> 52) % len(CERTIFICATIONS)]]),
+            None,
+            "approved" if approval < 85 else "pending" if approval < 95 else "rejected",
+            None,
+            text_array([AREAS[(r >> 56) % len(AREAS)], AREAS[(r >> 60) % len(AREAS)]]),
+            timestamp(min(created, data.now)),
+            timestamp(min(created, data.now)),
+        ])
+
+
+def jobs_rows(data, start, end):
+    for job in range(start, end):
+        info = data.job(job)
+        completed = info["status"] == "completed"
+        completion = data.completion_time(job, info) if completed else None
+        yield copy_line([
+            row_id("jobs", job),
+            row_id("users", info["client"]),
+            "%s needed in %s" % (info["service"].capitalize(), info["area"]),
+            "Looking for help with %s at my home in %s. Tools available on site." % (info["service"], info["area"]),
+            info["area"],
+            info["status"],
+            TIMELINES[job % len(TIMELINES)],
+            timestamp(info["created"]),
+            timestamp(completion) if completed else None,
+            timestamp(completion + 90 * DAY) if completed and completion + 90 * DAY < data.now else None,
+        ])
+
+
+def job_applications_rows(data, start, end):
+    for job in range(start, end):
+        info = data.job(job)
+        for index in range(info["applications"]):
+            # The first applicant is the accepted one once a job is underway
+            if info["status"] in ("in_progress", "completed"):
+                status = "accepted" if index == 0 else "rejected"
+            elif info["status"] == "cancelled":
+                status = "rejected"
+            else:
+                status = "pending"
+            applied = min(data.now, info["created"] + (index + 1) * data.rand(TABLE_CODES["job_applications"], job, index, 1) % DAY)
+            yield copy_line([
+                row_id("job_applications", job * (MAX_APPLICATIONS + 1) + index),
+                row_id("jobs", job),
+                row_id("users", data.applicant(job, index)),
+                data.proposed_rate(job, index),
+                timestamp(applied),
+                status,
+            ])
+
+
+def transactions_rows(data, start, end):
+    for job in range(start, end):
+        info = data.job(job)
+        if info["status"] not in ("in_progress", "completed"):
+            continue
+        completed = info["status"] == "completed"
+        yield copy_line([
+            row_id("transactions", job),
+            row_id("jobs", job),
+            row_id("users", info["client"]),
+            row_id("users", data.applicant(job, 0)),
+            data.proposed_rate(job, 0),
+            "completed" if completed else "pending",
+            timestamp(data.completion_time(job, info)) if completed else None,
+            "PAY-%d-%x" % (info["created"], job) if completed else None,
+        ])
+
+
+def messages_rows(data, start, end):
+    for job in range(start, end):
+        info = data.job(job)
+        if info["status"] not in ("in_progress", "completed"):
+            continue
+        client = info["client"]
+        freelancer = data.applicant(job, 0)
+        count = data.message_count(job)
+        end_time = data.completion_time(job, info) if info["status"] == "completed" else data.now
+        step = max(1, (end_time - info["created"]) // (count + 1))
+        for index in range(count):
+            r = data.rand(TABLE_CODES["messages"], job, index)
+            from_client = r % 2 == 0
+            sender, receiver = (client, freelancer) if from_client else (freelancer, client)
+            # Only the tail of an ongoing chat is still unread
+            unread = info["status"] == "in_progress" and index >= count - 3
+            yield copy_line([
+                row_id("messages", job * (MAX_MESSAGES + 1) + index),
+                row_id("jobs", job),
+                row_id("users", sender),
+                row_id("users", receiver),
+                CHAT_LINES[(r >> 8) % len(CHAT_LINES)],
+                timestamp(min(end_time, info["created"] + step * (index + 1))),
+                not unread,
+            ])
+
+
+def reviews_rows(data, start, end):
+    for job in range(start, end):
+        info = data.job(job)
+        if info["status"] != "completed":
+            continue
+        client = info["client"]
+        freelancer = data.applicant(job, 0)
+        reviewed_at = data.completion_time(job, info)
+        for index, (reviewer, reviewed) in enumerate(((client, freelancer), (freelancer, client))):
+            r = data.rand(TABLE_CODES["reviews"], job, index)
+            if r % 100 >= 70:
+                continue
+            yield copy_line([
+                row_id("reviews", job * 2 + index),
+                row_id("jobs", job),
+                row_id("users", reviewer),
+                row_id("users", reviewed),
+                5 - min(4, (r >> 8) % 16 // 3),
+                REVIEW_COMMENTS[(r >> 16) % len(REVIEW_COMMENTS)],
+                timestamp(min(data.now, reviewed_at + (r >> 24) % (3 * DAY))),
+            ])
+
+
+GENERATORS = {
+    "users": users_rows,
+    "freelancer_profiles": freelancer_profiles_rows,
+    "jobs": jobs_rows,
+    "job_applications": job_applications_rows,
+    "transactions": transactions_rows,
+    "messages": messages_rows,
+    "reviews": reviews_rows,
+}
+
+
+def partition_size(data, table):
+    if table == "users":
+        return data.users
+    if table == "freelancer_profiles":
+        return data.freelancers
+    return data.jobs
+
+
+def write_part(task):
+    # Worker entry point: generate one part file and report its row count
+    table, part, start, end, options = task
+    data = Dataset(options["scale"], options["seed"], options["now"])
+    path = os.path.join(options["out"], table, "part-%05d.copy" % part)
+    rows = 0
+    buffer = []
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        for line in GENERATORS[table](data, start, end):
+            buffer.append(line)
+            if len(buffer) >= WRITE_BATCH:
+                f.write("".join(buffer))
+                rows += len(buffer)
+                buffer = []
+        f.write("".join(buffer))
+        rows += len(buffer)
+    return table, part, rows
+
+
+def build_tasks(data, tables, chunk_size, options):
+    tasks = []
+    for table in tables:
+        os.makedirs(os.path.join(options["out"], table), exist_ok=True)
+        total = partition_size(data, table)
+        # Tables keyed by job fan out to several rows per job, so split them finer
+        step = chunk_size if table in ("users", "freelancer_profiles", "jobs") else max(1, chunk_size // 10)
+        for part, start in enumerate(range(0, total, step)):
+            tasks.append((table, part, start, min(total, start + step), options))
+    return tasks
+
+
+def write_load_script(out, tables, parts):
+    lines = [
+        "-- Generated by seed_data.py; run from this directory: psql \"$DATABASE_URL\" -f load.sql",
+        "-- Tables are loaded in foreign key order. The statistics triggers in the",
+        "-- migration see each COPY as one statement.",
+        "\\set ON_ERROR_STOP on",
+    ]
+    for table in LOAD_ORDER:
+        if table not in tables:
+            continue
+        columns = ", ".join(COLUMNS[table])
+        for part in range(parts[table]):
+            lines.append("\\copy %s (%s) FROM '%s/part-%05d.copy'" % (table, columns, table, part))
+    lines.append("ANALYZE;")
+    with open(os.path.join(out, "load.sql"), "w") as f:
+        f.write("\n".join(lines) + "\n")
+
+
+def generate_seed_data(out, scale, seed, workers, chunk_size, tables, now=None):
+    os.makedirs(out, exist_ok=True)
+    options = {"out": out, "scale": scale, "seed": seed, "now": int(time.time()) if now is None else now}
+    data = Dataset(scale, seed, options["now"])
+    tasks = build_tasks(data, tables, chunk_size, options)
+
+    print("Generating %d users and %d jobs (%d parts, %d workers) into %s"
+          % (data.users, data.jobs, len(tasks), workers, out))
+    started = time.time()
+    totals = dict((table, 0) for table in tables)
+    parts = dict((table, 0) for table in tables)
+
+    # Chunks are handed out one at a time so workers stay busy when parts
+    # differ in size; results arrive in completion order
+    with Pool(workers) as pool:
+        for table, part, rows in pool.imap_unordered(write_part, tasks, chunksize=1):
+            totals[table] += rows
+            parts[table] += 1
+
+    write_load_script(out, tables, parts)
+
+    elapsed = time.time() - started
+    total_rows = sum(totals.values())
+    for table in LOAD_ORDER:
+        if table in totals:
+            print("  %-20s %12d rows" % (table, totals[table]))
+    print("%d rows in %.1fs (%d rows/s). Load with: cd %s && psql \"$DATABASE_URL\" -f load.sql"
+          % (total_rows, elapsed, total_rows / max(elapsed, 0.001), out))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate large COPY-format seed data for the Juba schema.")
+    parser.add_argument("--out", default="seed-output", help="output directory (default: seed-output)")
+    parser.add_argument("--scale", type=float, default=1.0,
+                        help="1.0 = %d users and %d jobs; messages and applications scale with jobs"
+                        % (BASE_COUNTS["users"], BASE_COUNTS["jobs"]))
+    parser.add_argument("--seed", type=int, default=42, help="same seed and --now, same data")
+    parser.add_argument("--now", type=int, default=None,
+                        help="end of the generated time span as a Unix timestamp (default: current time)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--chunk-size", type=int, default=100000, help="rows of the partition key per part file")
+    parser.add_argument("--tables", default=",".join(LOAD_ORDER), help="comma separated subset of tables")
+    args = parser.parse_args(argv)
+
+    tables = [table.strip() for table in args.tables.split(",") if table.strip()]
+    unknown = [table for table in tables if table not in GENERATORS]
+    if unknown:
+        parser.error("unknown tables: %s" % ", ".join(unknown))
+
+    generate_seed_data(args.out, args.scale, args.seed, max(1, args.workers), max(1, args.chunk_size), tables, args.now)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())